@@ -41,6 +41,8 @@ if [[ -z $ANSIBLE_LIBRARY ]]; then COLON=""; else COLON=":"; fi
 export ANSIBLE_LIBRARY="$ANSIBLE_SOLACE_HOME/lib/ansible/modules$COLON$ANSIBLE_LIBRARY"
 if [[ -z $ANSIBLE_DOC_FRAGMENT_PLUGINS ]]; then COLON=""; else COLON=":"; fi
 export ANSIBLE_DOC_FRAGMENT_PLUGINS="$ANSIBLE_SOLACE_HOME/lib/ansible/plugins/doc_fragments$COLON$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+if [[ -z $ANSIBLE_HTTPAPI_PLUGINS ]]; then COLON=""; else COLON=":"; fi
+export ANSIBLE_HTTPAPI_PLUGINS="$ANSIBLE_SOLACE_HOME/lib/ansible/plugins/httpapi$COLON$ANSIBLE_HTTPAPI_PLUGINS"
 
 
 clear
@@ -51,6 +53,7 @@ echo " - ANSIBLE_SOLACE_HOME=$ANSIBLE_SOLACE_HOME"
 echo " - ANSIBLE_MODULE_UTILS=$ANSIBLE_MODULE_UTILS"
 echo " - ANSIBLE_LIBRARY=$ANSIBLE_LIBRARY"
 echo " - ANSIBLE_DOC_FRAGMENT_PLUGINS=$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+echo " - ANSIBLE_HTTPAPI_PLUGINS=$ANSIBLE_HTTPAPI_PLUGINS"
 echo " - ANSIBLE_SOLACE_ENABLE_LOGGING=$ANSIBLE_SOLACE_ENABLE_LOGGING"
 echo
 
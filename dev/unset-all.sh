@@ -33,6 +33,7 @@ unset ANSIBLE_PYTHON_INTERPRETER
 unset ANSIBLE_MODULE_UTILS
 unset ANSIBLE_LIBRARY
 unset ANSIBLE_DOC_FRAGMENT_PLUGINS
+unset ANSIBLE_HTTPAPI_PLUGINS
 unset ANSIBLE_SOLACE_HOME
 unset ANSIBLE_SOLACE_ENABLE_LOGGING
 
@@ -44,5 +45,6 @@ echo " - ANSIBLE_SOLACE_HOME=$ANSIBLE_SOLACE_HOME"
 echo " - ANSIBLE_MODULE_UTILS=$ANSIBLE_MODULE_UTILS"
 echo " - ANSIBLE_LIBRARY=$ANSIBLE_LIBRARY"
 echo " - ANSIBLE_DOC_FRAGMENT_PLUGINS=$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+echo " - ANSIBLE_HTTPAPI_PLUGINS=$ANSIBLE_HTTPAPI_PLUGINS"
 echo " - ANSIBLE_SOLACE_ENABLE_LOGGING=$ANSIBLE_SOLACE_ENABLE_LOGGING"
 echo
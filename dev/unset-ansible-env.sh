@@ -46,6 +46,10 @@ REMOVE_PATH="$ANSIBLE_SOLACE_HOME/lib/ansible/plugins/doc_fragments:"
 export ANSIBLE_DOC_FRAGMENT_PLUGINS=${ANSIBLE_DOC_FRAGMENT_PLUGINS#$REMOVE_PATH}
 if [[ -z $ANSIBLE_DOC_FRAGMENT_PLUGINS ]]; then unset ANSIBLE_DOC_FRAGMENT_PLUGINS; fi
 
+REMOVE_PATH="$ANSIBLE_SOLACE_HOME/lib/ansible/plugins/httpapi:"
+export ANSIBLE_HTTPAPI_PLUGINS=${ANSIBLE_HTTPAPI_PLUGINS#$REMOVE_PATH}
+if [[ -z $ANSIBLE_HTTPAPI_PLUGINS ]]; then unset ANSIBLE_HTTPAPI_PLUGINS; fi
+
 unset ANSIBLE_SOLACE_HOME
 unset ANSIBLE_PYTHON_INTERPRETER
 unset ANSIBLE_SOLACE_ENABLE_LOGGING
@@ -58,5 +62,6 @@ echo " - ANSIBLE_SOLACE_HOME=$ANSIBLE_SOLACE_HOME"
 echo " - ANSIBLE_MODULE_UTILS=$ANSIBLE_MODULE_UTILS"
 echo " - ANSIBLE_LIBRARY=$ANSIBLE_LIBRARY"
 echo " - ANSIBLE_DOC_FRAGMENT_PLUGINS=$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+echo " - ANSIBLE_HTTPAPI_PLUGINS=$ANSIBLE_HTTPAPI_PLUGINS"
 echo " - ANSIBLE_SOLACE_ENABLE_LOGGING=$ANSIBLE_SOLACE_ENABLE_LOGGING"
 echo
@@ -0,0 +1,174 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Bulk SEMP v2 actions, e.g. disconnect clients or clear stats, on the objects matching a where filter.
+
+The targets are listed from the monitor API with a select projection of their keys only, page by page.
+The actions of a page are started while the next page is listed: the listing never waits for the actions.
+Requests in flight are bounded by the session's concurrency, the request rate by a shared rate limiter.
+"""
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_async as sa
+import asyncio
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_WORKERS = 20
+
+# max page size of SEMP v2 monitor lists
+LIST_PAGE_SIZE = 100
+
+
+class SolaceActionResource(object):
+
+    def __init__(self, name, collection, keys, actions):
+        self.name = name
+        # collection: path below the msg vpn
+        self.collection = collection
+        # keys: attributes identifying an object, joined with ',' into its name
+        self.keys = keys
+        self.actions = actions
+
+    def list_path(self, msg_vpn):
+        return [su.SEMP_V2_MONITOR, su.MSG_VPNS, msg_vpn, self.collection]
+
+    def action_path(self, msg_vpn, object_name, action):
+        return [su.SEMP_V2_ACTION, su.MSG_VPNS, msg_vpn, self.collection, object_name, action]
+
+    def object_name(self, item):
+        return ','.join(str(item.get(key)) for key in self.keys)
+
+
+ACTION_RESOURCES = OrderedDict((r.name, r) for r in [
+    SolaceActionResource('clients', su.CLIENTS, ['clientName'], ['disconnect', 'clearStats', 'clearEvent']),
+    SolaceActionResource('mqtt_sessions', su.MQTT_SESSIONS, ['mqttSessionClientId', 'mqttSessionVirtualRouter'], ['clearStats']),
+    SolaceActionResource('queues', su.QUEUES, ['queueName'], ['clearStats', 'deleteMsgs']),
+    SolaceActionResource('topic_endpoints', su.TOPIC_ENDPOINTS, ['topicEndpointName'], ['clearStats', 'deleteMsgs']),
+    SolaceActionResource('bridges', su.BRIDGES, ['bridgeName', 'bridgeVirtualRouter'], ['disconnect', 'clearStats', 'clearEvent'])
+])
+
+
+def _is_system_object(name):
+    # e.g. '#client' or '#rest-...': created by the broker
+    return name.startswith('#')
+
+
+class SolaceRateLimiter(object):
+    """Spaces requests 1 / rate seconds apart. rate None or <= 0: no limit."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0
+        self._next = 0
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        # reserve the next slot before sleeping: concurrent callers get consecutive slots
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class SolaceBulkAction(object):
+    """Executes an action on all objects of a resource matching the where conditions.
+
+    Usage:
+        bulk_action = SolaceBulkAction(solace_config, msg_vpn, ACTION_RESOURCES['clients'], 'disconnect', where=['clientUsername==app1'])
+        summary, results = bulk_action.run()
+    """
+
+    def __init__(self, solace_config, msg_vpn, resource, action, where=None, max_workers=DEFAULT_MAX_WORKERS,
+                 rate=None, include_system_objects=False, dry_run=False):
+        if action not in resource.actions:
+            raise ValueError("action '{}' not supported for resource '{}', supported: {}".format(action, resource.name, resource.actions))
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be > 0, got: {}".format(rate))
+        self.solace_config = solace_config
+        self.msg_vpn = msg_vpn
+        self.resource = resource
+        self.action = action
+        self.where = where or []
+        self.max_workers = max(1, int(max_workers))
+        self.rate = rate
+        self.include_system_objects = include_system_objects
+        self.dry_run = dry_run
+        self.summary = OrderedDict([('targets', 0), ('succeeded', 0), ('failed', 0), ('skipped', 0)])
+        self.results = []
+        self.failures = []
+
+    def compose_query(self):
+        query = "count={}&select={}".format(LIST_PAGE_SIZE, ','.join(self.resource.keys))
+        if self.where:
+            query += "&where=" + ','.join(where.replace('/', '%2F') for where in self.where)
+        return query
+
+    async def _execute(self, session, limiter, name, result):
+        await limiter.acquire()
+        # action requests have an empty body
+        ok, resp = await session.make_put_request(self.resource.action_path(self.msg_vpn, name, self.action), {})
+        result['ok'] = ok
+        if ok:
+            self.summary['succeeded'] += 1
+        else:
+            result['error'] = resp
+            self.summary['failed'] += 1
+
+    async def _run(self):
+        limiter = SolaceRateLimiter(self.rate)
+        pending = []
+        async with sa.SolaceAsyncSession(self.solace_config, self.max_workers) as session:
+            async for ok, data in session.iter_get_list_pages(self.resource.list_path(self.msg_vpn), self.compose_query()):
+                if not ok:
+                    self.failures.append(dict(list=self.resource.name, error=data))
+                    break
+                for item in data:
+                    name = self.resource.object_name(item)
+                    if _is_system_object(name) and not self.include_system_objects:
+                        self.summary['skipped'] += 1
+                        continue
+                    self.summary['targets'] += 1
+                    result = OrderedDict(name=name)
+                    self.results.append(result)
+                    if not self.dry_run:
+                        pending.append(asyncio.ensure_future(self._execute(session, limiter, name, result)))
+            if pending:
+                await asyncio.gather(*pending)
+
+    def run(self):
+        """Lists the targets & executes the action on them. returns (summary, results).
+
+        results: per target: name, ok & the error if failed. not executed in dry_run.
+        self.failures: the listing failure, if any. the actions started before the failure are completed.
+        """
+        sa.run(self._run())
+        return self.summary, self.results
+
+###
+# The End.
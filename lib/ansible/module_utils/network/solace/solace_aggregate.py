@@ -0,0 +1,212 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Aggregation of list results page by page: only the aggregate is kept, not the list.
+
+top_n: the n objects with the highest (desc) or lowest (asc) value of an attribute, kept in a bounded heap.
+group_by: count & sums of attributes per distinct value of one or more attributes.
+both: the groups are ranked by top_n.by, i.e. 'count' or one of the summed attributes.
+count: the number of objects, optionally per value of one attribute.
+Attributes of nested objects are addressed with dots, e.g. 'eventMsgSpoolUsageThreshold.setPercent'.
+"""
+
+import heapq
+from collections import OrderedDict
+
+ORDER_DESC = 'desc'
+ORDER_ASC = 'asc'
+
+GROUP_COUNT_KEY = 'count'
+GROUP_SUM_KEY = 'sum'
+
+
+def get_attribute(item, path):
+    # None if the attribute or one of its parents is missing
+    value = item
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class _Ranked(object):
+    # heap entry: the heap root is the entry ranked lowest, i.e. the first to drop
+
+    __slots__ = ('value', 'seq', 'item', 'desc')
+
+    def __init__(self, value, seq, item, desc):
+        self.value = value
+        self.seq = seq
+        self.item = item
+        self.desc = desc
+
+    def __lt__(self, other):
+        if self.value != other.value:
+            return (self.value < other.value) if self.desc else (self.value > other.value)
+        # equal values: the earlier object ranks higher
+        return self.seq > other.seq
+
+
+class SolaceTopN(object):
+    """The n objects ranked highest by an attribute, memory bounded by n."""
+
+    def __init__(self, n, by, order=ORDER_DESC):
+        if n < 1:
+            raise ValueError("top_n.n must be >= 1, got: {}".format(n))
+        self.n = n
+        self.by = by
+        self.desc = (order != ORDER_ASC)
+        self._heap = []
+        self._seq = 0
+
+    def add(self, item, value=None):
+        if value is None:
+            value = get_attribute(item, self.by)
+        # objects without a comparable value are not ranked
+        if value is None or isinstance(value, (dict, list)):
+            return
+        self._seq += 1
+        entry = _Ranked(value, self._seq, item, self.desc)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+
+    def result(self):
+        return [entry.item for entry in sorted(self._heap, reverse=True)]
+
+
+class SolaceGroupBy(object):
+    """Count & sums per group, memory bounded by the number of groups."""
+
+    def __init__(self, by, sum_attributes=None):
+        if not by:
+            raise ValueError("group_by.by: at least one attribute required")
+        self.by = by
+        self.sum_attributes = sum_attributes or []
+        # group values tuple -> group
+        self._groups = OrderedDict()
+
+    def add(self, item):
+        values = tuple(get_attribute(item, attribute) for attribute in self.by)
+        # unhashable values, e.g. lists, group by their string
+        values = tuple(value if not isinstance(value, (dict, list)) else str(value) for value in values)
+        group = self._groups.get(values)
+        if group is None:
+            group = OrderedDict(zip(self.by, values))
+            group[GROUP_COUNT_KEY] = 0
+            if self.sum_attributes:
+                group[GROUP_SUM_KEY] = OrderedDict((attribute, 0) for attribute in self.sum_attributes)
+            self._groups[values] = group
+        group[GROUP_COUNT_KEY] += 1
+        for attribute in self.sum_attributes:
+            value = get_attribute(item, attribute)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                group[GROUP_SUM_KEY][attribute] += value
+
+    def groups(self):
+        return list(self._groups.values())
+
+    def result(self):
+        return sorted(self.groups(), key=lambda group: group[GROUP_COUNT_KEY], reverse=True)
+
+
+class SolaceListAggregation(object):
+    """Aggregates the pages of a list as they arrive.
+
+    top_n: dict(n, by, order) or None. group_by: dict(by, sum) or None.
+    """
+
+    def __init__(self, top_n=None, group_by=None):
+        self.top_n = SolaceTopN(top_n['n'], top_n['by'], top_n.get('order') or ORDER_DESC) if top_n else None
+        self.group_by = None
+        if group_by:
+            by = group_by['by']
+            self.group_by = SolaceGroupBy([by] if isinstance(by, str) else by, group_by.get('sum'))
+            if self.top_n and self.top_n.by != GROUP_COUNT_KEY and self.top_n.by not in self.group_by.sum_attributes:
+                raise ValueError("with group_by, top_n.by must be '{}' or one of group_by.sum: {}".format(
+                    GROUP_COUNT_KEY, self.group_by.sum_attributes))
+        # number of objects aggregated
+        self.count = 0
+
+    def add_page(self, items):
+        for item in items:
+            self.count += 1
+            if self.group_by:
+                self.group_by.add(item)
+            else:
+                self.top_n.add(item)
+
+    def result(self):
+        if not self.group_by:
+            return self.top_n.result()
+        if not self.top_n:
+            return self.group_by.result()
+        for group in self.group_by.groups():
+            if self.top_n.by == GROUP_COUNT_KEY:
+                self.top_n.add(group, group[GROUP_COUNT_KEY])
+            else:
+                self.top_n.add(group, group[GROUP_SUM_KEY][self.top_n.by])
+        return self.top_n.result()
+
+
+class SolaceCount(object):
+    """Counts the objects of a list, optionally per value of one attribute. The objects are discarded."""
+
+    def __init__(self, by=None):
+        self.by = by
+        self.count = 0
+        self._group_by = SolaceGroupBy([by]) if by else None
+
+    def add_page(self, items):
+        self.count += len(items)
+        if self._group_by:
+            for item in items:
+                self._group_by.add(item)
+
+    def result(self):
+        if self._group_by:
+            return self._group_by.result()
+        return [OrderedDict([(GROUP_COUNT_KEY, self.count)])]
+
+
+def create_list_aggregation(top_n=None, group_by=None, count_only=False, count_by=None):
+    """Returns a SolaceListAggregation, a SolaceCount or None if no aggregation is set.
+
+    count_by implies count_only. count_only excludes top_n & group_by.
+    """
+    if count_only or count_by:
+        if top_n or group_by:
+            raise ValueError("count_only / count_by cannot be combined with top_n or group_by")
+        return SolaceCount(count_by)
+    if not top_n and not group_by:
+        return None
+    return SolaceListAggregation(top_n, group_by)
+
+###
+# The End.
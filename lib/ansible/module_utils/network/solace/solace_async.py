@@ -0,0 +1,300 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+"""Asyncio transport for the solace_* modules.
+
+Uses aiohttp if installed. Without aiohttp, the blocking requests calls run in a thread pool
+so callers can use the same coroutines either way.
+"""
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_utils as su
+import traceback
+import logging
+import json
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+HAS_IMPORT_ERROR = False
+IMPORT_ERR_TRACEBACK = None
+try:
+    import requests
+except ImportError:
+    HAS_IMPORT_ERROR = True
+    IMPORT_ERR_TRACEBACK = traceback.format_exc()
+
+HAS_AIOHTTP = True
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    HAS_AIOHTTP = False
+
+# max number of requests in flight per session
+DEFAULT_CONCURRENCY = 50
+
+_TRANSPORT_ERRORS = (asyncio.TimeoutError,)
+if not HAS_IMPORT_ERROR:
+    _TRANSPORT_ERRORS += (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+if HAS_AIOHTTP:
+    _TRANSPORT_ERRORS += (aiohttp.ClientError,)
+
+
+class SolaceAsyncSession(object):
+    """Async counterpart of su.make_*_request() & SolaceTask.execute_get_list().
+
+    Usage:
+        async with SolaceAsyncSession(solace_config) as session:
+            ok, resp = await session.make_get_request(path_array)
+    """
+
+    def __init__(self, solace_config, concurrency=DEFAULT_CONCURRENCY):
+        self.solace_config = solace_config
+        self.concurrency = max(1, int(concurrency))
+        # the httpapi connection is only reachable through the (blocking) session
+        self.use_aiohttp = HAS_AIOHTTP and not isinstance(sc.get_http_session(), sc.SolaceHttpApiSession)
+        self._session = None
+        self._executor = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self.use_aiohttp:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.solace_config.vmr_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _compose_url(self, path_array, query=None):
+        path = su.compose_path(path_array)
+        if query:
+            path += '?' + query
+        if su.is_broker_solace_cloud(self.solace_config):
+            return path
+        return self.solace_config.vmr_url + path
+
+    def _send_blocking(self, method, url, json_body):
+        if su.is_broker_solace_cloud(self.solace_config):
+            auth = su.BearerAuth(self.solace_config.solace_cloud_config['api_token'])
+        else:
+            auth = self.solace_config.vmr_auth
+        return sc.get_http_session().request(
+            method,
+            url,
+            json=json_body,
+            auth=auth,
+            timeout=self.solace_config.vmr_timeout,
+            headers={'x-broker-name': self.solace_config.x_broker},
+            params=None
+        )
+
+    async def _send_aiohttp(self, method, url, json_body):
+        headers = {'x-broker-name': self.solace_config.x_broker}
+        auth = None
+        if su.is_broker_solace_cloud(self.solace_config):
+            headers['authorization'] = "Bearer " + self.solace_config.solace_cloud_config['api_token']
+        else:
+            auth = aiohttp.BasicAuth(*self.solace_config.vmr_auth)
+        # urls are already encoded by compose_path() or come from the broker (nextPageUri)
+        async with self._session.request(method, URL(url, encoded=True), json=json_body, auth=auth, headers=headers) as resp:
+            text = await resp.text()
+            body = json.dumps(json_body).encode() if json_body is not None else None
+            request = sc.SolaceHttpRequest(method, url, dict(resp.request_info.headers), body)
+            return sc.SolaceHttpResponse(request, resp.status, resp.reason, str(resp.url), dict(resp.headers), text)
+
+    async def _send(self, method, url, json_body=None):
+        async with self._semaphore:
+            if self.use_aiohttp:
+                return await self._send_aiohttp(method, url, json_body)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(self._send_blocking, method, url, json_body))
+
+    async def _parse_response(self, resp):
+        if resp.status_code == 202 and su.is_broker_solace_cloud(self.solace_config):
+            # long running Solace Cloud request: the wait polls & sleeps, keep it off the loop
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, su._parse_response, self.solace_config, resp)
+        return su._parse_response(self.solace_config, resp)
+
+    async def make_request(self, method, path_array, json=None, query=None):
+        url = self._compose_url(path_array, query)
+        try:
+            resp = await self._send(method, url, json)
+        except _TRANSPORT_ERRORS as e:
+            logging.debug("Request Error: %s", str(e))
+            return False, str(e)
+        return await self._parse_response(resp)
+
+    async def make_get_request(self, path_array, query=None):
+        return await self.make_request('GET', path_array, query=query)
+
+    async def make_post_request(self, path_array, json=None):
+        return await self.make_request('POST', path_array, json)
+
+    async def make_delete_request(self, path_array, json=None):
+        return await self.make_request('DELETE', path_array, json)
+
+    async def make_patch_request(self, path_array, json=None):
+        return await self.make_request('PATCH', path_array, json)
+
+    async def make_put_request(self, path_array, json=None):
+        return await self.make_request('PUT', path_array, json)
+
+    async def submit_solace_cloud_request(self, path_array, json=None):
+        """POSTs a long running Solace Cloud request without waiting for its completion.
+
+        returns (ok, request id or the error). the request id is None if Solace Cloud completed the request right away.
+        await the request ids with await_solace_cloud_requests().
+        """
+        url = self._compose_url(path_array)
+        try:
+            resp = await self._send('POST', url, json)
+        except _TRANSPORT_ERRORS as e:
+            logging.debug("Request Error: %s", str(e))
+            return False, str(e)
+        if sc.ENABLE_LOGGING:
+            sc.log_http_roundtrip(resp)
+        if resp.status_code == 202:
+            return True, su.get_solace_cloud_request_id(resp)
+        if resp.status_code != 200:
+            return False, su.parse_bad_response(resp)
+        return True, None
+
+    async def _poll_solace_cloud_request(self, service_id, request_id):
+        # returns (completed, ok, the request's body or the error)
+        url = su.compose_path(su.get_solace_cloud_request_status_path(service_id, request_id))
+        try:
+            resp = await self._send('GET', url)
+        except _TRANSPORT_ERRORS as e:
+            return True, False, "Solace Cloud: GET request status error: {}".format(str(e))
+        if sc.ENABLE_LOGGING:
+            sc.log_http_roundtrip(resp)
+        if resp.status_code != 200:
+            return True, False, su.parse_bad_response(resp)
+        if not resp.text:
+            return True, False, "Solace Cloud: GET request status error: no body found in response"
+        return su.parse_solace_cloud_request_status(resp.json())
+
+    async def await_solace_cloud_requests(self, service_requests,
+                                          retries=su.SOLACE_CLOUD_REQUEST_POLL_RETRIES, delay=su.SOLACE_CLOUD_REQUEST_POLL_DELAY):
+        """Awaits the completion of many long running Solace Cloud requests with one shared poller.
+
+        service_requests: list of (service id, request id).
+        each round polls all pending requests concurrently, then sleeps once for all of them.
+        returns a dict: (service id, request id) -> (ok, the request's body or the error).
+        """
+        outcomes = dict()
+        pending = list(dict.fromkeys(service_requests))
+        for try_count in range(retries):
+            if try_count > 0:
+                await asyncio.sleep(delay)
+            polls = await asyncio.gather(*[self._poll_solace_cloud_request(*key) for key in pending])
+            still_pending = []
+            for key, (completed, ok, resp) in zip(pending, polls):
+                if completed:
+                    outcomes[key] = (ok, resp)
+                else:
+                    still_pending.append(key)
+            pending = still_pending
+            if not pending:
+                break
+        for key in pending:
+            outcomes[key] = (False, "Solace Cloud: request '{}' not completed after {} polls".format(key[1], retries))
+        return outcomes
+
+    async def execute_get_list(self, path_array, query=None):
+        # path_array must start with the api: su.SEMP_V2_CONFIG or su.SEMP_V2_MONITOR
+        result_list = []
+        async for ok, data in self.iter_get_list_pages(path_array, query):
+            if not ok:
+                return False, data
+            result_list.extend(data)
+        return True, result_list
+
+    async def iter_get_list_pages(self, path_array, query=None):
+        # yields (ok, data) per page: data is the page's list of objects or the error
+        url = self.solace_config.vmr_url + su.compose_path(path_array) + ("?" + query if query else '')
+        while url is not None:
+            try:
+                resp = await self._send('GET', url)
+            except _TRANSPORT_ERRORS as e:
+                yield False, str(e)
+                return
+            if sc.ENABLE_LOGGING:
+                sc.log_http_roundtrip(resp)
+            if resp.status_code != 200:
+                yield False, su.parse_bad_response(resp)
+                return
+            body = resp.json()
+            yield True, body.get('data', [])
+            url = body.get('meta', {}).get('paging', {}).get('nextPageUri', None)
+
+
+async def execute_task_get_list(session, solace_task, path_array):
+    """Coroutine variant of SolaceTask.execute_get_list(): same query_params & api handling."""
+    return await session.execute_get_list([solace_task.get_list_api_path()] + path_array, solace_task.compose_get_list_query())
+
+
+async def get_queue_names(session, msg_vpn, queue_names):
+    """The queue names as given, all queues of the msg vpn if they contain '*'. returns (ok, names or the error)."""
+    if '*' not in queue_names:
+        return True, queue_names
+    path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, msg_vpn, su.QUEUES]
+    ok, items = await session.execute_get_list(path_array, 'count=100&select=queueName')
+    if not ok:
+        return False, items
+    return True, [item['queueName'] for item in items]
+
+
+async def get_queue_subscriptions(session, msg_vpn, queue_name):
+    """The subscription topics of a queue. returns (ok, (queue_name, topics) or dict(queue, error))."""
+    path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, msg_vpn, su.QUEUES, queue_name, su.SUBSCRIPTIONS]
+    ok, items = await session.execute_get_list(path_array, 'count=100&select=subscriptionTopic')
+    if not ok:
+        return False, dict(queue=queue_name, error=items)
+    return True, (queue_name, [item['subscriptionTopic'] for item in items])
+
+
+def run(coro):
+    # asyncio.run() requires python >= 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+###
+# The End.
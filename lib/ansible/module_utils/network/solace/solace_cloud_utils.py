@@ -320,19 +320,19 @@ def _make_request(func, solace_config, path_array, json=None):
 
 
 def make_get_request(solace_config, path_array):
-    return _make_request(requests.get, solace_config, path_array)
+    return _make_request(sc.get_http_session().get, solace_config, path_array)
 
 
 def make_post_request(solace_config, path_array, json=None):
-    return _make_request(requests.post, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().post, solace_config, path_array, json)
 
 
 def make_delete_request(solace_config, path_array, json=None):
-    return _make_request(requests.delete, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().delete, solace_config, path_array, json)
 
 
 def make_patch_request(solace_config, path_array, json=None):
-    return _make_request(requests.patch, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().patch, solace_config, path_array, json)
 
 ###
 # The End.
@@ -36,6 +36,9 @@ import os
 import sys
 from distutils.util import strtobool
 import copy
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
 
 HAS_IMPORT_ERROR = False
 try:
@@ -44,6 +47,7 @@ try:
     import xmltodict
     import urllib.parse
     from ansible.errors import AnsibleError
+    from ansible.module_utils.connection import Connection, ConnectionError as AnsibleConnectionError
 except ImportError:
     HAS_IMPORT_ERROR = True
     IMPORT_ERR_TRACEBACK = traceback.format_exc()
@@ -92,6 +96,152 @@ if ENABLE_LOGGING:
     logging.info('Module start #############################################################################################')
 
 ################################################################################################
+# pooled http session
+#
+# all requests of a module process share one keep-alive session,
+# connection & TLS setup happen once per broker instead of once per request.
+# ANSIBLE_SOLACE_HTTP_POOL_MAXSIZE: max connections kept open per broker. default: 50.
+
+HTTP_POOL_MAXSIZE = 50
+poolMaxsizeEnvVal = os.getenv('ANSIBLE_SOLACE_HTTP_POOL_MAXSIZE')
+if poolMaxsizeEnvVal is not None and poolMaxsizeEnvVal != '':
+    try:
+        HTTP_POOL_MAXSIZE = int(poolMaxsizeEnvVal)
+    except ValueError:
+        raise ValueError("failed: invalid value for env var: 'ANSIBLE_SOLACE_HTTP_POOL_MAXSIZE={}'. use an integer instead.".format(poolMaxsizeEnvVal))
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def get_http_session():
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
+################################################################################################
+# httpapi persistent connection
+#
+# with ansible_connection=httpapi & ansible_network_os=solace, SEMP requests go through the
+# connection's session (plugins/httpapi/solace.py), which lives for the whole play.
+# all other requests, e.g. to the Solace Cloud API, still use the pooled session.
+
+class SolaceHttpRequest(object):
+    # mimics requests.PreparedRequest for log_http_roundtrip()
+    def __init__(self, method, url, headers, body):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+class SolaceHttpResponse(object):
+    # mimics requests.Response for su.parse_good_response(), su.parse_bad_response() & log_http_roundtrip()
+    def __init__(self, request, status_code, reason, url, headers, text):
+        self.request = request
+        self.status_code = status_code
+        self.reason = reason
+        self.url = url
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        content = self.text.encode('utf-8')
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    def close(self):
+        return
+
+
+class SolaceHttpApiSession(object):
+    """Drop-in for the pooled requests.Session, sends SEMP requests through the httpapi connection.
+
+    auth is ignored for SEMP requests, the connection's credentials are used.
+    """
+
+    def __init__(self, socket_path, http_session):
+        self._connection = Connection(socket_path)
+        self._http_session = http_session
+        self._broker_url = None
+
+    def get_broker_url(self):
+        if self._broker_url is None:
+            self._broker_url = self._connection.get_broker_url()
+        return self._broker_url
+
+    def request(self, method, url, params=None, data=None, headers=None, auth=None, timeout=None, **kwargs):
+        # requests' 'json' argument, under another name so it doesn't shadow the json module
+        json_body = kwargs.pop('json', None)
+        url_parts = urllib.parse.urlsplit(url)
+        if not url_parts.path.startswith('/SEMP'):
+            return self._http_session.request(method, url, params=params, data=data, headers=headers, auth=auth, timeout=timeout, json=json_body, **kwargs)
+        path = url_parts.path
+        query = url_parts.query
+        if params:
+            query = (query + '&' if query else '') + urllib.parse.urlencode(params)
+        if query:
+            path += '?' + query
+        headers = dict(headers or {})
+        if json_body is not None:
+            data = json.dumps(json_body)
+            headers['Content-Type'] = 'application/json'
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        try:
+            resp = self._connection.send_request(data, method=method, path=path, headers=headers, timeout=timeout)
+        except AnsibleConnectionError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        req = resp['request']
+        return SolaceHttpResponse(
+            SolaceHttpRequest(req['method'], req['url'], req['headers'], req['body']),
+            resp['status_code'],
+            resp['reason'],
+            resp['url'],
+            resp['headers'],
+            resp['text']
+        )
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+def use_persistent_connection(socket_path):
+    """Routes all SEMP requests of this process through the httpapi connection at socket_path.
+
+    returns the broker url of the connection.
+    """
+    global _HTTP_SESSION
+    http_session = get_http_session()
+    if not isinstance(http_session, SolaceHttpApiSession):
+        http_session = SolaceHttpApiSession(socket_path, http_session)
+        with _HTTP_SESSION_LOCK:
+            _HTTP_SESSION = http_session
+    return http_session.get_broker_url()
+
+################################################################################################
 
 
 def log_http_roundtrip(resp):
@@ -218,7 +368,7 @@ def make_sempv1_post_request(solace_config, xml_data):
         'Content-Type': 'application/xml',
         'x-broker-name': solace_config.x_broker
     }
-    resp = requests.post(
+    resp = get_http_session().post(
                 solace_config.vmr_url + "/SEMP",
                 data=xml_data,
                 auth=solace_config.vmr_auth,
@@ -243,58 +393,186 @@ def make_sempv1_post_request(solace_config, xml_data):
     return True, resp_body
 
 
-def execute_sempv1_get_list(solace_config, xml_dict, list_path_array):
+class SempV1ListError(Exception):
+    # raised by iter_sempv1_get_list(), resp: the request & response for the module's result
+
+    def __init__(self, resp):
+        Exception.__init__(self, str(resp))
+        self.resp = resp
+
+
+def _xml_element_to_dict(elem):
+    # same structure as xmltodict.parse(): attributes as '@name', repeated tags as lists,
+    # text only elements as str, empty elements as None
+    d = OrderedDict(('@' + k, v) for k, v in elem.attrib.items())
+    for child in elem:
+        value = _xml_element_to_dict(child)
+        if child.tag in d:
+            if not isinstance(d[child.tag], list):
+                d[child.tag] = [d[child.tag]]
+            d[child.tag].append(value)
+        else:
+            d[child.tag] = value
+    text = (elem.text or '').strip()
+    if text:
+        if not d:
+            return text
+        d['#text'] = text
+    return d if d else None
 
+
+def _stream_sempv1_page(solace_config, xml_data, list_path_array):
+    """Generator: POSTs one SEMP v1 request and parses the response incrementally.
+
+    yields ('record', dict) per list element, then ('end', (execute-result code, more-cookie xml, reply dict)).
+    list elements are dropped from the tree once yielded, so a page is never held in memory in full.
+    """
+    headers = {
+        'Content-Type': 'application/xml',
+        'x-broker-name': solace_config.x_broker
+    }
+    resp = get_http_session().post(
+                solace_config.vmr_url + "/SEMP",
+                data=xml_data,
+                auth=solace_config.vmr_auth,
+                timeout=solace_config.vmr_timeout,
+                headers=headers,
+                params=None,
+                stream=True
+            )
+    try:
+        if ENABLE_LOGGING:
+            # note: reads the full body
+            log_http_roundtrip(resp)
+        if resp.status_code != 200:
+            raise AnsibleError("SEMP v1 call not successful. Pls check the log and raise an issue.")
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        path = []
+        parents = []
+        root = None
+        for chunk in resp.iter_content(chunk_size=65536):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    path.append(elem.tag)
+                    parents.append(elem)
+                    continue
+                if path == list_path_array:
+                    yield 'record', _xml_element_to_dict(elem)
+                    parents[-2].remove(elem)
+                path.pop()
+                parents.pop()
+        parser.close()
+    finally:
+        resp.close()
+    if root is None:
+        raise AnsibleError("SEMP v1 call returned no body. Pls check the log and raise an issue.")
+    reply = {root.tag: _xml_element_to_dict(root)}
+    execute_result = root.find('execute-result')
+    code = execute_result.get('code') if execute_result is not None else None
+    more_cookie = root.find('more-cookie')
+    more_cookie_xml = None
+    if more_cookie is not None and len(more_cookie):
+        more_cookie_xml = ET.tostring(more_cookie[0], encoding='unicode')
+    yield 'end', (code, more_cookie_xml, reply)
+
+
+def iter_sempv1_get_list(solace_config, xml_dict, list_path_array, limit=None, stop_when=None):
+    """Generator: yields the elements of a SEMP v1 list, following the more-cookie page by page.
+
+    limit: max number of elements to yield.
+    stop_when: function(element): stops after the first element it returns True for.
+    no further pages are requested once stopped.
+    raises SempV1ListError if the broker returns an error.
+    """
     if not isinstance(xml_dict, dict):
         raise TypeError("argument 'xml_dict' is not a dict, but {}".format(type(xml_dict)))
     if not isinstance(list_path_array, list):
         raise TypeError("argument 'list_path_array' is not a list, but {}".format(type(list_path_array)))
 
     xml_data = xmltodict.unparse(xml_dict)
-
-    result_list = []
-
-    hasNextPage = True
-
-    while hasNextPage:
-
+    count = 0
+    while xml_data is not None:
+        if limit is not None and count >= limit:
+            return
+        page = _stream_sempv1_page(solace_config, xml_data, list_path_array)
         try:
-            ok, semp_resp = make_sempv1_post_request(solace_config, xml_data)
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-            return False, str(e)
-
-        if not ok:
-            resp = dict(request=xml_data, response=semp_resp)
-            return False, resp
-
-        # get the list
-        _d = semp_resp
-        for path in list_path_array:
-            if _d and path in _d:
-                _d = _d[path]
-            else:
-                # empty list / not found
-                return True, []
-        if isinstance(_d, dict):
-            resp = [_d]
-        elif isinstance(_d, list):
-            resp = _d
-        else:
-            raise ValueError("unknown SEMP v1 return type: {}".format(type(_d)))
-
-        result_list.extend(resp)
+            for kind, value in page:
+                if kind == 'record':
+                    count += 1
+                    yield value
+                    if (limit is not None and count >= limit) or (stop_when is not None and stop_when(value)):
+                        return
+                    continue
+                code, more_cookie_xml, reply = value
+                if code != "ok":
+                    raise SempV1ListError(dict(request=xml_data, response=reply))
+                xml_data = more_cookie_xml
+        finally:
+            page.close()
+
+
+def execute_sempv1_get_list(solace_config, xml_dict, list_path_array, limit=None, stop_when=None):
+    try:
+        return True, list(iter_sempv1_get_list(solace_config, xml_dict, list_path_array, limit, stop_when))
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        return False, str(e)
+    except SempV1ListError as e:
+        return False, e.resp
 
-        # see if there is more
-        more_cookie = None
-        if 'more-cookie' in semp_resp['rpc-reply']:
-            more_cookie = semp_resp['rpc-reply']['more-cookie']
-        if more_cookie:
-            xml_data = xmltodict.unparse(more_cookie)
-            hasNextPage = True
-        else:
-            hasNextPage = False
 
-    return True, result_list
+################################################################################################
+# MQTT magic queues
+#
+# QoS 1 subscriptions of an MQTT session are served by the session's 'magic queue': '#mqtt/{client_id}/{number}'.
+# depending on the broker version, the queue is created with ingress / egress OFF.
+# see also: solace_utils.get_mqtt_magic_queue()
+
+def search_sempv1_mqtt_magic_queue(solace_config, vpn, client_id):
+    # returns (ok, name of the session's magic queue or the error)
+    request = {
+        'rpc': {
+            'show': {
+                'queue': {
+                    'name': "#mqtt/" + client_id + "/*",
+                    'vpn-name': vpn,
+                }
+            }
+        }
+    }
+    list_path_array = ['rpc-reply', 'rpc', 'show', 'queue', 'queues', 'queue']
+    # exactly one match expected: a 2nd one is enough to tell, no need to page through the rest
+    ok, resp = execute_sempv1_get_list(solace_config, request, list_path_array, limit=2)
+    if not ok:
+        return False, dict(msg="error retrieving magic queue: {}".format(request['rpc']['show']['queue']['name']), details=resp)
+    if len(resp) != 1:
+        return False, dict(msg="could not find magic queue: {}".format(request['rpc']['show']['queue']['name']))
+    return True, resp[0]['name']
+
+
+def execute_sempv1_queue_no_shutdown(solace_config, vpn, queue_name):
+    request = {
+        'rpc': {
+            'message-spool': {
+                'vpn-name': vpn,
+                'queue': {
+                    'name': queue_name,
+                    'no': {
+                        'shutdown': {
+                            'full': None
+                        }
+                    }
+                }
+            }
+        }
+    }
+    xml_data = xmltodict.unparse(request)
+    ok, semp_resp = make_sempv1_post_request(solace_config, xml_data)
+    if not ok:
+        return False, dict(request=xml_data, response=semp_resp)
+    return True, semp_resp
 
 
 ###
@@ -0,0 +1,352 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Drift detection between a msg vpn and a reference: another broker's vpn or a vpn spec.
+
+Both sides are read into trees: vpn -> object types -> objects -> child types -> objects. Each node
+carries a content digest of its own attributes and of its subtrees (a merkle tree). The trees are
+compared top-down, equal subtrees are skipped by their digest and only mismatching ones are walked.
+
+Objects are read with bulk list calls. Child collections, e.g. queue subscriptions, are only read for
+parents which exist on both sides: a parent missing on one side is reported once, its children are not read.
+"""
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_plan as sp
+import ansible.module_utils.network.solace.solace_async as sa
+import hashlib
+import json
+import asyncio
+from collections import OrderedDict
+
+DEFAULT_MAX_WORKERS = 10
+
+# max page size of SEMP v2 lists
+LIST_PAGE_SIZE = 100
+
+# compared by default: the objects directly below the vpn and these children
+DEFAULT_CHILD_TYPES = ['queue_subscription', 'acl_client_connect_exception', 'rdp_rest_consumer', 'rdp_queue_binding',
+                       'bridge_remote_vpn', 'bridge_remote_subscription', 'mqtt_session_subscription']
+DEFAULT_OBJECT_TYPES = [t.name for t in so.get_object_type('vpn').get_children()] + DEFAULT_CHILD_TYPES
+
+DRIFT_MISSING = 'missing'
+DRIFT_EXTRA = 'extra'
+DRIFT_CHANGED = 'changed'
+
+
+def _digest(value):
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SolaceDriftNode(object):
+    """An object of the tree with its attributes and its children, grouped by object type."""
+
+    def __init__(self, object_type, args, name, attributes):
+        self.object_type = object_type
+        self.args = args
+        self.name = name
+        self.attributes = attributes
+        # object type name -> OrderedDict identity -> node
+        self.children = OrderedDict()
+        self._digest = None
+        self._group_digests = dict()
+
+    @property
+    def identity(self):
+        # unique within the parent, e.g. 'bridge-1,primary' for bridges
+        return self.object_type.item_path(self.args, self.name)[-1]
+
+    def add_child(self, node):
+        self.children.setdefault(node.object_type.name, OrderedDict())[node.identity] = node
+        self._digest = None
+        self._group_digests.pop(node.object_type.name, None)
+
+    def get_group_digest(self, type_name):
+        if type_name not in self._group_digests:
+            group = self.children.get(type_name, {})
+            self._group_digests[type_name] = _digest(sorted((identity, node.get_digest()) for identity, node in group.items()))
+        return self._group_digests[type_name]
+
+    def get_digest(self):
+        if self._digest is None:
+            self._group_digests = dict()
+            self._digest = _digest([self.attributes, sorted((type_name, self.get_group_digest(type_name)) for type_name in self.children)])
+        return self._digest
+
+    def count(self):
+        return 1 + sum(node.count() for group in self.children.values() for node in group.values())
+
+    def describe(self):
+        d = OrderedDict(type=self.object_type.name, name=self.name)
+        d.update((arg, self.args[arg]) for arg in self.object_type.args)
+        return d
+
+
+def _ignored_keys(object_type, ignore_keys=None):
+    # keys which identify the object or hold write-only values: not compared
+    keys = object_type.get_identity_keys()
+    keys.update(object_type.whitelist_keys)
+    keys.update(su.DEFAULT_WHITELIST_KEYS)
+    keys.update(ignore_keys or [])
+    return keys
+
+
+def _all_args(object_type):
+    args = set(object_type.args) | set(object_type.item_args)
+    for template in object_type.body.values():
+        if template.startswith('{') and template.endswith('}'):
+            args.add(template[1:-1])
+    return args
+
+
+class SolaceDriftTree(object):
+
+    def __init__(self, msg_vpn, ignore_keys=None):
+        self.msg_vpn = msg_vpn
+        self.ignore_keys = ignore_keys or []
+        self.root = SolaceDriftNode(so.get_object_type('vpn'), {}, msg_vpn, {})
+
+    def normalize(self, object_type, attributes):
+        ignored = _ignored_keys(object_type, self.ignore_keys)
+        return {key: value for key, value in (attributes or {}).items() if key not in ignored}
+
+    def add(self, parent, object_type, args, name, attributes):
+        node = SolaceDriftNode(object_type, args, name, self.normalize(object_type, attributes))
+        parent.add_child(node)
+        return node
+
+
+def build_spec_tree(msg_vpn, spec, ignore_keys=None):
+    """Returns (tree, object types in the spec) of a vpn spec, same format as solace_vpn_apply's spec."""
+    plan = sp.build_vpn_plan(msg_vpn, spec)
+    tree = SolaceDriftTree(msg_vpn, ignore_keys)
+    # converted as solace_vpn_apply does, e.g. templated numbers: '5000' -> 5000
+    tree.root.attributes = tree.normalize(tree.root.object_type, sc.type_conversion(dict((spec or {}).get('settings') or {}), False))
+    nodes = dict()
+    for key, plan_node in plan.nodes.items():
+        # the parent is always the first requirement, references come after it
+        if plan_node.object_type.parent == 'vpn':
+            parent = tree.root
+        else:
+            parent = nodes[plan_node.requires[0]]
+        settings = sc.type_conversion(dict(plan_node.settings or {}), False)
+        nodes[key] = tree.add(parent, plan_node.object_type, plan_node.args, plan_node.name, settings)
+    return tree, list(OrderedDict.fromkeys(node.object_type.name for node in plan.nodes.values()))
+
+
+class SolaceBrokerTreeReader(object):
+    """Reads the tree of a broker's msg vpn with bulk list calls."""
+
+    def __init__(self, session, msg_vpn, object_types, ignore_keys=None):
+        self.session = session
+        self.tree = SolaceDriftTree(msg_vpn, ignore_keys)
+        self.object_types = object_types
+
+    async def read_root(self, with_attributes=True):
+        if not with_attributes:
+            return True, None
+        ok, resp = await self.session.make_get_request([su.SEMP_V2_CONFIG, su.MSG_VPNS, self.tree.msg_vpn])
+        if ok:
+            self.tree.root.attributes = self.tree.normalize(self.tree.root.object_type, resp)
+        return ok, resp
+
+    async def read_children(self, parent, object_type):
+        # returns (ok, the error)
+        if parent is self.tree.root:
+            args = dict(msg_vpn=self.tree.msg_vpn)
+        else:
+            args = parent.object_type.derive_child_args(parent.args, parent.name)
+        ok, items = await self.session.execute_get_list(object_type.collection_path(args), "count={}".format(LIST_PAGE_SIZE))
+        if not ok:
+            return False, dict(parent=parent.describe(), type=object_type.name, error=items)
+        # item args, e.g. a bridge's virtual router, differ per item: not a filter
+        parent_values = object_type.get_parent_values(dict({arg: None for arg in _all_args(object_type)}, **args))
+        for item in items:
+            # list results may include other members, e.g. topic exceptions with another syntax
+            if any(item.get(key) != value for key, value in parent_values.items() if value is not None):
+                continue
+            self.tree.add(parent, object_type, object_type.get_item_args(args, item), item[object_type.lookup_key], item)
+        # the group exists, even if empty
+        parent.children.setdefault(object_type.name, OrderedDict())
+        return True, None
+
+
+def _diff_attributes(actual, expected):
+    diff = OrderedDict()
+    for key in list(expected) + [key for key in actual if key not in expected]:
+        if actual.get(key) != expected.get(key):
+            diff[key] = dict(actual=actual.get(key), expected=expected.get(key))
+    return diff
+
+
+def project_node(actual, expected):
+    """Returns a copy of the actual subtree reduced to the objects & attributes of the expected subtree.
+
+    used for references which list only some objects & some settings, e.g. a spec.
+    """
+    projected = SolaceDriftNode(actual.object_type, actual.args, actual.name,
+                                {key: actual.attributes.get(key) for key in expected.attributes})
+    for type_name, expected_group in expected.children.items():
+        actual_group = actual.children.get(type_name)
+        if actual_group is None:
+            continue
+        group = projected.children.setdefault(type_name, OrderedDict())
+        for identity, expected_node in expected_group.items():
+            if identity in actual_group:
+                group[identity] = project_node(actual_group[identity], expected_node)
+    return projected
+
+
+class SolaceDriftComparison(object):
+    """Compares the tree of a msg vpn (actual) with a reference tree (expected) top-down.
+
+    subtrees with equal digests are skipped, only mismatching ones are walked.
+    object_types: the compared types, groups of other types are ignored.
+    """
+
+    def __init__(self, object_types):
+        self.object_types = object_types
+        self.differences = []
+        self.compared = 0
+
+    def compare_nodes(self, actual, expected):
+        self.compared += 1
+        if actual.get_digest() == expected.get_digest():
+            return
+        diff = _diff_attributes(actual.attributes, expected.attributes)
+        if diff:
+            self.differences.append(dict(actual.describe(), status=DRIFT_CHANGED, attributes=diff))
+        type_names = list(expected.children) + [type_name for type_name in actual.children if type_name not in expected.children]
+        for type_name in type_names:
+            if type_name not in self.object_types:
+                continue
+            if type_name in actual.children and type_name in expected.children \
+                    and actual.get_group_digest(type_name) == expected.get_group_digest(type_name):
+                continue
+            self.compare_groups(actual.children.get(type_name, {}), expected.children.get(type_name, {}))
+
+    def compare_groups(self, actual_group, expected_group):
+        for identity, expected_node in expected_group.items():
+            if identity not in actual_group:
+                self.differences.append(dict(expected_node.describe(), status=DRIFT_MISSING))
+            else:
+                self.compare_nodes(actual_group[identity], expected_node)
+        for identity, actual_node in actual_group.items():
+            if identity not in expected_group:
+                self.differences.append(dict(actual_node.describe(), status=DRIFT_EXTRA))
+
+    def compare(self, actual_tree, expected_tree, exact=True):
+        """Returns the differences. exact=False: only the expected objects & attributes are compared, see project_node()."""
+        actual_root = actual_tree.root if exact else project_node(actual_tree.root, expected_tree.root)
+        self.compare_nodes(actual_root, expected_tree.root)
+        for difference in self.differences:
+            # missing objects are described by the reference, which may be another vpn
+            if 'msg_vpn' in difference:
+                difference['msg_vpn'] = actual_tree.msg_vpn
+        return self.differences
+
+
+async def _read_levels(readers, object_types, with_root_attributes):
+    """Reads the trees of all readers level by level: children only for parents present in all trees."""
+    failures = []
+    outcomes = await asyncio.gather(*[reader.read_root(with_root_attributes) for reader in readers])
+    for ok, resp in outcomes:
+        if not ok:
+            failures.append(dict(type='vpn', error=resp))
+    if failures:
+        return failures
+    # (parent node per reader, object type) pairs of the current level
+    level = [([reader.tree.root for reader in readers], so.get_object_type(type_name))
+             for type_name in object_types if so.get_object_type(type_name).parent == 'vpn']
+    while level:
+        coros = [reader.read_children(parents[i], object_type) for parents, object_type in level for i, reader in enumerate(readers)]
+        for ok, resp in await asyncio.gather(*coros):
+            if not ok:
+                failures.append(resp)
+        next_level = []
+        for parents, object_type in level:
+            child_types = [t for t in object_type.get_children() if t.name in object_types]
+            if not child_types:
+                continue
+            groups = [parent.children.get(object_type.name, {}) for parent in parents]
+            for identity in groups[0]:
+                if all(identity in group for group in groups[1:]):
+                    for child_type in child_types:
+                        next_level.append(([group[identity] for group in groups], child_type))
+        level = next_level
+    return failures
+
+
+def read_broker_trees(sides, object_types, ignore_keys=None, max_workers=DEFAULT_MAX_WORKERS, with_root_attributes=True):
+    """Reads the trees of the msg vpns of one or more brokers concurrently.
+
+    sides: list of (su.SolaceConfig, msg vpn).
+    returns (trees, failures).
+    """
+    async def _read():
+        sessions = [sa.SolaceAsyncSession(solace_config, max_workers) for solace_config, _msg_vpn in sides]
+        for session in sessions:
+            await session.__aenter__()
+        try:
+            readers = [SolaceBrokerTreeReader(session, msg_vpn, object_types, ignore_keys) for session, (_config, msg_vpn) in zip(sessions, sides)]
+            failures = await _read_levels(readers, object_types, with_root_attributes)
+            return [reader.tree for reader in readers], failures
+        finally:
+            for session in sessions:
+                await session.__aexit__(None, None, None)
+    return sa.run(_read())
+
+
+def read_broker_tree_for_spec(solace_config, msg_vpn, spec_tree, object_types, ignore_keys=None, max_workers=DEFAULT_MAX_WORKERS):
+    """Reads the broker's tree, children only for parents in the spec tree. returns (tree, failures)."""
+    async def _read():
+        async with sa.SolaceAsyncSession(solace_config, max_workers) as session:
+            reader = SolaceBrokerTreeReader(session, msg_vpn, object_types, ignore_keys)
+            # the spec stands in for the 2nd reader: only its tree is used to select the parents
+            spec_reader = _SpecTreeReader(spec_tree)
+            failures = await _read_levels([reader, spec_reader], object_types, bool(spec_tree.root.attributes))
+            return reader.tree, failures
+    return sa.run(_read())
+
+
+class _SpecTreeReader(object):
+    # reads nothing: the spec tree is complete
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    async def read_root(self, with_attributes=True):
+        return True, None
+
+    async def read_children(self, parent, object_type):
+        return True, None
+
+###
+# The End.
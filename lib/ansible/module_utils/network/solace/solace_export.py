@@ -0,0 +1,301 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Export of a msg vpn's configuration into a gzip compressed JSON-lines file.
+
+The vpn's object tree is walked level by level with paged list calls, the collections of a level
+concurrently, at most max_workers ahead of the writer. Objects are written page by page as they arrive,
+in dependency order: an object's parent and the objects it references, e.g. a client username's
+client profile, are always on an earlier line.
+
+File format, one JSON document per line:
+    header: {"format": "solace-config-export", "version": 1, "msg_vpn": ..., "semp_version": ..., "object_types": [...], "exported_at": ...}
+    object: {"level": 2, "type": "queue_subscription", "args": {"msg_vpn": ..., "queue": ...}, "name": ..., "settings": {...}}
+level: the object's dependency level, objects of the same level do not depend on each other.
+settings: the object's attributes without the keys identifying it or its parents.
+"""
+
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_plan as sp
+import ansible.module_utils.network.solace.solace_async as sa
+import asyncio
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict, deque
+
+EXPORT_FORMAT = 'solace-config-export'
+EXPORT_FORMAT_VERSION = 1
+
+DEFAULT_MAX_WORKERS = 10
+
+# max page size of SEMP v2 lists
+LIST_PAGE_SIZE = 100
+
+# max pages read ahead of the writer per collection: memory is bounded by max_workers x PAGES_AHEAD pages
+PAGES_AHEAD = 2
+
+# acl topic exceptions change their resource names with the SEMP version, see so.get_acl_topic_exception_type()
+ACL_TOPIC_EXCEPTION_TYPES = OrderedDict([
+    ('acl_publish_topic_exception', 'publish'),
+    ('acl_subscribe_topic_exception', 'subscribe')
+])
+
+# all objects of the msg vpn, in registry order
+DEFAULT_OBJECT_TYPES = [t.name for t in so.OBJECT_TYPES.values() if t.vpn_scoped and t.name != 'vpn'] + list(ACL_TOPIC_EXCEPTION_TYPES)
+
+
+def get_export_object_type(name, semp_version=None):
+    """Returns the object type of an export's type name, the acl topic exceptions for the broker's SEMP version."""
+    if name in ACL_TOPIC_EXCEPTION_TYPES:
+        return so.get_acl_topic_exception_type(ACL_TOPIC_EXCEPTION_TYPES[name], semp_version)
+    return so.get_object_type(name)
+
+
+def get_type_levels(object_types):
+    """Returns OrderedDict type name -> dependency level, in level & registry order.
+
+    object_types: OrderedDict name -> type. a type's level is above its parent's and above the levels of the types it references.
+    """
+    references = dict()
+    for type_name, _settings_key, ref_type_name in sp.OBJECT_REFERENCES:
+        if ref_type_name != type_name:
+            references.setdefault(type_name, set()).add(ref_type_name)
+    levels = dict(vpn=0)
+
+    def _level(name):
+        if name not in levels:
+            object_type = object_types.get(name) or so.get_object_type(name)
+            requires = [object_type.parent] + sorted(references.get(name, []))
+            levels[name] = 1 + max(_level(required) for required in requires)
+        return levels[name]
+
+    ordered = sorted(object_types, key=lambda name: _level(name))
+    return OrderedDict((name, levels[name]) for name in ordered)
+
+
+def _is_system_object(name):
+    # e.g. '#acl-profile' or '#P2P/...': created by the broker, cannot be created by a client
+    return isinstance(name, str) and name.startswith('#')
+
+
+class SolaceConfigExporter(object):
+    """Exports the objects of a msg vpn into a gzip compressed JSON-lines file.
+
+    Usage:
+        exporter = SolaceConfigExporter(solace_config, msg_vpn, object_types, semp_version)
+        summary, failures = exporter.export(path)
+    """
+
+    def __init__(self, solace_config, msg_vpn, object_types=None, semp_version=None, max_workers=DEFAULT_MAX_WORKERS,
+                 include_system_objects=False):
+        self.solace_config = solace_config
+        self.msg_vpn = msg_vpn
+        self.semp_version = semp_version
+        self.max_workers = max_workers
+        self.include_system_objects = include_system_objects
+        types = OrderedDict((name, get_export_object_type(name, semp_version)) for name in (object_types or DEFAULT_OBJECT_TYPES))
+        for object_type in types.values():
+            if object_type.parent != 'vpn' and object_type.parent not in types:
+                raise ValueError("object type '{}' requires its parent type '{}' in object_types".format(object_type.name, object_type.parent))
+        self.object_types = types
+        self.levels = get_type_levels(types)
+        self.summary = OrderedDict(objects=0, levels=0, types=OrderedDict((name, 0) for name in self.levels))
+        self.failures = []
+
+    def _compose_line(self, level, object_type, args, name, attributes):
+        identity_keys = object_type.get_identity_keys()
+        settings = OrderedDict((key, value) for key, value in sorted(attributes.items()) if key not in identity_keys)
+        # the object's own args, without the ones only its parents need
+        args = OrderedDict((arg, args[arg]) for arg in object_type.args)
+        return OrderedDict([('level', level), ('type', object_type.name), ('args', args), ('name', name), ('settings', settings)])
+
+    async def _read_pages(self, session, object_type, args, pages):
+        # puts (ok, list of (args, name, attributes) or the error) per page, then None.
+        # pages is bounded: the read waits while the writer has not taken the previous pages
+        try:
+            async for ok, items in session.iter_get_list_pages(object_type.collection_path(args), "count={}".format(LIST_PAGE_SIZE)):
+                if not ok:
+                    await pages.put((False, items))
+                    break
+                objects = []
+                for item in items:
+                    name = item[object_type.lookup_key]
+                    if _is_system_object(name) and not self.include_system_objects:
+                        continue
+                    objects.append((object_type.get_item_args(args, item), name, item))
+                await pages.put((True, objects))
+        finally:
+            await pages.put(None)
+
+    async def _export_level(self, session, level, collections, parents, write):
+        # reads the collections of the level concurrently, at most max_workers ahead of the writer,
+        # and writes their pages in collection order as they arrive
+        collections = iter(collections)
+        window = deque()
+
+        def start_next():
+            for object_type, args in collections:
+                pages = asyncio.Queue(maxsize=PAGES_AHEAD)
+                window.append((object_type, args, pages, asyncio.ensure_future(self._read_pages(session, object_type, args, pages))))
+                return
+
+        for _i in range(self.max_workers):
+            start_next()
+        while window:
+            object_type, args, pages, read = window.popleft()
+            keep = any(t.parent == object_type.name for t in self.object_types.values())
+            while True:
+                page = await pages.get()
+                if page is None:
+                    break
+                ok, objects = page
+                if not ok:
+                    self.failures.append(dict(type=object_type.name, args=args, error=objects))
+                    continue
+                for object_args, name, attributes in objects:
+                    write(self._compose_line(level, object_type, object_args, name, attributes))
+                    if keep:
+                        parents.setdefault(object_type.name, []).append((object_args, name))
+                self.summary['types'][object_type.name] += len(objects)
+                self.summary['objects'] += len(objects)
+            # raises the read's exception, if any
+            await read
+            start_next()
+
+    async def _export(self, write):
+        async with sa.SolaceAsyncSession(self.solace_config, self.max_workers) as session:
+            vpn_type = so.get_object_type('vpn')
+            ok, resp = await session.make_get_request(vpn_type.item_path({}, self.msg_vpn))
+            if not ok:
+                self.failures.append(dict(type='vpn', name=self.msg_vpn, error=resp))
+                return
+            write(self._compose_line(0, vpn_type, {}, self.msg_vpn, resp))
+            self.summary['objects'] += 1
+            # type name -> the (args, name) of its objects, kept for the types with children only
+            parents = dict(vpn=[(dict(msg_vpn=self.msg_vpn), self.msg_vpn)])
+            for level in sorted(set(self.levels.values())):
+                collections = []
+                for type_name in [name for name, type_level in self.levels.items() if type_level == level]:
+                    object_type = self.object_types[type_name]
+                    parent_type = vpn_type if object_type.parent == 'vpn' else self.object_types[object_type.parent]
+                    for parent_args, parent_name in parents.get(object_type.parent, []):
+                        args = parent_args if object_type.parent == 'vpn' else parent_type.derive_child_args(parent_args, parent_name)
+                        collections.append((object_type, args))
+                await self._export_level(session, level, collections, parents, write)
+                self.summary['levels'] = level + 1
+
+    def _compose_header(self):
+        return OrderedDict([
+            ('format', EXPORT_FORMAT),
+            ('version', EXPORT_FORMAT_VERSION),
+            ('msg_vpn', self.msg_vpn),
+            ('semp_version', self.semp_version),
+            ('object_types', list(self.levels)),
+            ('exported_at', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+        ])
+
+    def export(self, path=None):
+        """Writes the export to path, replacing the file only if all reads succeeded. path None: counts only.
+
+        returns (summary, failures).
+        """
+        if path is None:
+            sa.run(self._export(lambda line: None))
+            return self.summary, self.failures
+        export_dir = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(export_dir):
+            os.makedirs(export_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                def write(line):
+                    f.write(json.dumps(line, separators=(',', ':'), default=str))
+                    f.write('\n')
+                write(self._compose_header())
+                sa.run(self._export(write))
+            if not self.failures:
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return self.summary, self.failures
+
+
+class SolaceExportReader(object):
+    """Streams an export file, line by line.
+
+    Usage:
+        with SolaceExportReader(path) as reader:
+            msg_vpn = reader.header['msg_vpn']
+            for line_number, line in reader:
+                ...
+    raises ValueError if the file is not an export of a supported version or its objects are not in dependency order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self._file = None
+
+    def __enter__(self):
+        self._file = gzip.open(self.path, 'rt', encoding='utf-8')
+        try:
+            self.header = json.loads(self._file.readline() or 'null')
+        except ValueError:
+            self.header = None
+        if not isinstance(self.header, dict) or self.header.get('format') != EXPORT_FORMAT:
+            self.close()
+            raise ValueError("not a solace config export file: '{}'".format(self.path))
+        if self.header.get('version') != EXPORT_FORMAT_VERSION:
+            self.close()
+            raise ValueError("unsupported export format version: '{}', supported: {}".format(self.header.get('version'), EXPORT_FORMAT_VERSION))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __iter__(self):
+        # yields (line number, object), the header is line 1
+        level = 0
+        for line_number, text in enumerate(self._file, 2):
+            if not text.strip():
+                continue
+            line = json.loads(text)
+            if line['level'] < level:
+                raise ValueError("export file not in dependency order: line {}: level {} after level {}".format(line_number, line['level'], level))
+            level = line['level']
+            yield line_number, line
+
+###
+# The End.
@@ -0,0 +1,227 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Import of an export file of solace_export into a msg vpn.
+
+The file is streamed: objects are read in batches of one dependency level, each batch is applied
+concurrently with the do_task() of the objects' types, i.e. GET, then POST or PATCH of the delta.
+Objects whose parent failed are skipped.
+
+Checkpoint: optional json file with the line to resume from. Written after each batch, removed once
+the whole file has been applied. A re-run with the same checkpoint starts at the first batch with a
+failure instead of the start of the file.
+"""
+
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_export as se
+import ansible.module_utils.network.solace.solace_state as ss
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_WORKERS = 10
+
+# max number of objects read ahead & applied concurrently
+DEFAULT_BATCH_SIZE = 1000
+
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+
+def _describe(object_type, args, name):
+    d = OrderedDict(type=object_type.name, name=name)
+    d.update((arg, args[arg]) for arg in object_type.args)
+    return d
+
+
+class SolaceImportCheckpoint(object):
+    """The line of an export file to resume its import from, for one export & target vpn."""
+
+    def __init__(self, path, export_header, broker, msg_vpn):
+        self.path = path
+        self.identity = OrderedDict([
+            ('export_msg_vpn', export_header['msg_vpn']),
+            ('exported_at', export_header['exported_at']),
+            ('broker', broker),
+            ('msg_vpn', msg_vpn)
+        ])
+
+    def load(self):
+        # returns the line to resume from, 0 without checkpoint
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('identity') != self.identity:
+            raise ValueError("checkpoint '{}' belongs to another import: {}".format(self.path, checkpoint.get('identity')))
+        return checkpoint['line']
+
+    def save(self, line):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(identity=self.identity, line=line), f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SolaceConfigImporter(object):
+    """Imports an export file into a msg vpn, level by level.
+
+    module: the calling module, provides the broker params, see so.create_object_task().
+    solace_config: the module's broker config, identifies the broker in the checkpoint.
+    msg_vpn: the target vpn, may differ from the exported one.
+    object_types: imported type names, None: all types of the file.
+    manage_vpn: import the vpn object itself, i.e. create / update the vpn with the exported settings.
+    journal: optional solace_journal.SolaceJournal: objects completed by an earlier run are skipped without a request.
+    """
+
+    def __init__(self, module, solace_config, msg_vpn, object_types=None, manage_vpn=False, semp_version=None,
+                 max_workers=DEFAULT_MAX_WORKERS, batch_size=DEFAULT_BATCH_SIZE, journal=None):
+        self.module = module
+        self.solace_config = solace_config
+        self.msg_vpn = msg_vpn
+        self.object_types = object_types
+        self.manage_vpn = manage_vpn
+        self.semp_version = semp_version
+        self.max_workers = max(1, int(max_workers))
+        self.batch_size = max(1, int(batch_size))
+        self.journal = journal
+        self.summary = OrderedDict(objects=0, levels=0, created=0, updated=0, unchanged=0, failed=0, skipped=0)
+        self.failures = []
+        self._types = dict()
+        # item paths of the failed & skipped objects: their children are skipped
+        self._failed_paths = set()
+
+    def _get_type(self, name):
+        if name not in self._types:
+            self._types[name] = se.get_export_object_type(name, self.semp_version)
+        return self._types[name]
+
+    def _is_imported(self, line):
+        if line['type'] == 'vpn':
+            return self.manage_vpn
+        return self.object_types is None or line['type'] in self.object_types
+
+    def _compose_item(self, line):
+        object_type = self._get_type(line['type'])
+        args = dict(line['args'])
+        name = line['name']
+        if object_type.name == 'vpn':
+            name = self.msg_vpn
+        else:
+            args['msg_vpn'] = self.msg_vpn
+        return object_type, args, name, line['settings']
+
+    def _has_failed_parent(self, object_type, args):
+        path = tuple(object_type.collection_path(args))
+        return any(path[:i] in self._failed_paths for i in range(1, len(path)))
+
+    def _apply(self, item):
+        object_type, args, name, settings = item
+        task = so.create_object_task(self.module, object_type, args, name, settings, journal=self.journal)
+        try:
+            return True, task.do_task()
+        except so.SolaceTaskError as e:
+            logging.debug("import: object failed: %s: %s", str(object_type.get_key(args, name)), e.msg)
+            return False, dict(msg=e.msg, **e.result)
+
+    def _fail(self, status, item, error):
+        object_type, args, name, _settings = item
+        self.summary[status] += 1
+        self._failed_paths.add(tuple(object_type.item_path(args, name)))
+        failure = _describe(object_type, args, name)
+        failure.update(status=status, error=error)
+        self.failures.append(failure)
+
+    def _apply_batch(self, executor, batch):
+        # returns True if all objects of the batch were applied
+        failure_count = len(self.failures)
+        items = []
+        for item in batch:
+            if self._has_failed_parent(item[0], item[1]):
+                self._fail(STATUS_SKIPPED, item, dict(msg="skipped: parent failed"))
+            else:
+                items.append(item)
+        for item, (ok, result) in zip(items, executor.map(self._apply, items)):
+            if not ok:
+                self._fail(STATUS_FAILED, item, result)
+            elif not result['changed']:
+                self.summary['unchanged'] += 1
+            elif 'delta' in result:
+                self.summary['updated'] += 1
+            else:
+                self.summary['created'] += 1
+        self.summary['objects'] += len(batch)
+        return len(self.failures) == failure_count
+
+    def import_file(self, path, checkpoint_path=None):
+        """Applies the export file at path. returns (summary, failures)."""
+        with se.SolaceExportReader(path) as reader:
+            checkpoint = None
+            start_line = 0
+            if checkpoint_path:
+                checkpoint = SolaceImportCheckpoint(checkpoint_path, reader.header, ss.get_broker_id(self.solace_config), self.msg_vpn)
+                start_line = checkpoint.load()
+            self.summary['resumed_from_line'] = start_line
+            # the line to resume from: the first line of the first batch with a failure
+            resume_line = None
+            levels = set()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                batch = []
+                batch_start = None
+                batch_level = None
+                for line_number, line in reader:
+                    if line_number < start_line or not self._is_imported(line):
+                        continue
+                    if batch and (line['level'] != batch_level or len(batch) >= self.batch_size):
+                        if not self._apply_batch(executor, batch) and resume_line is None:
+                            resume_line = batch_start
+                        if checkpoint:
+                            checkpoint.save(resume_line or line_number)
+                        batch = []
+                    if not batch:
+                        batch_start = line_number
+                        batch_level = line['level']
+                    batch.append(self._compose_item(line))
+                    levels.add(line['level'])
+                if batch and not self._apply_batch(executor, batch) and resume_line is None:
+                    resume_line = batch_start
+            self.summary['levels'] = len(levels)
+            if checkpoint:
+                if resume_line is None:
+                    checkpoint.remove()
+                else:
+                    checkpoint.save(resume_line)
+        return self.summary, self.failures
+
+###
+# The End.
@@ -0,0 +1,275 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Local configuration index of a broker fleet.
+
+Harvests the list endpoints of many brokers concurrently into a sqlite file, so fleet-wide questions
+(which brokers have queue X, which client usernames use client profile Y) are answered locally.
+A msg vpn is only harvested again if its config-sync key (configSyncLocalKey) has changed.
+"""
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_async as sa
+import traceback
+import logging
+import json
+import os
+import time
+import asyncio
+HAS_IMPORT_ERROR = False
+IMPORT_ERR_TRACEBACK = None
+try:
+    import sqlite3
+except ImportError:
+    HAS_IMPORT_ERROR = True
+    IMPORT_ERR_TRACEBACK = traceback.format_exc()
+
+# ANSIBLE_SOLACE_INDEX: default path of the index file
+INDEX_PATH = os.getenv('ANSIBLE_SOLACE_INDEX')
+
+DEFAULT_MAX_WORKERS = 10
+
+# max page size of SEMP v2 lists
+LIST_PAGE_SIZE = 100
+
+# the vpn itself & the object types directly below it
+INDEX_OBJECT_TYPES = ['vpn'] + [t.name for t in so.get_object_type('vpn').get_children()]
+
+_SQLITE_TIMEOUT = 30
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS objects (
+        broker TEXT NOT NULL,
+        msg_vpn TEXT NOT NULL,
+        object_type TEXT NOT NULL,
+        name TEXT NOT NULL,
+        attributes TEXT NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS objects_type_name ON objects (object_type, name)''',
+    '''CREATE INDEX IF NOT EXISTS objects_vpn_type ON objects (msg_vpn, object_type, name)''',
+    '''CREATE INDEX IF NOT EXISTS objects_broker ON objects (broker, msg_vpn, object_type)''',
+    '''CREATE TABLE IF NOT EXISTS harvests (
+        broker TEXT NOT NULL,
+        msg_vpn TEXT NOT NULL,
+        object_type TEXT NOT NULL,
+        marker TEXT,
+        count INTEGER NOT NULL,
+        harvested_at REAL NOT NULL,
+        PRIMARY KEY (broker, msg_vpn, object_type))'''
+]
+
+HARVEST_STATUS_HARVESTED = 'harvested'
+HARVEST_STATUS_UNCHANGED = 'unchanged'
+HARVEST_STATUS_FAILED = 'failed'
+
+
+class SolaceConfigIndex(object):
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            index_dir = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(index_dir):
+                os.makedirs(index_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=_SQLITE_TIMEOUT, isolation_level=None)
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_markers(self, broker, msg_vpn):
+        # returns dict: object type -> config marker of its last harvest
+        rows = self._connect().execute(
+            'SELECT object_type, marker FROM harvests WHERE broker=? AND msg_vpn=?', (broker, msg_vpn)).fetchall()
+        return dict(rows)
+
+    def replace(self, broker, msg_vpn, object_type, marker, objects):
+        """Replaces the objects of one broker, vpn & type in one transaction.
+
+        objects: list of (name, attributes dict).
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM objects WHERE broker=? AND msg_vpn=? AND object_type=?', (broker, msg_vpn, object_type))
+            conn.executemany(
+                'INSERT INTO objects (broker, msg_vpn, object_type, name, attributes) VALUES (?, ?, ?, ?, ?)',
+                [(broker, msg_vpn, object_type, name, json.dumps(attributes, sort_keys=True)) for name, attributes in objects])
+            conn.execute(
+                'INSERT OR REPLACE INTO harvests (broker, msg_vpn, object_type, marker, count, harvested_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (broker, msg_vpn, object_type, marker, len(objects), time.time()))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def remove_vpns(self, broker, keep_msg_vpns):
+        # vpns deleted on the broker since the last harvest
+        conn = self._connect()
+        rows = conn.execute('SELECT DISTINCT msg_vpn FROM harvests WHERE broker=?', (broker,)).fetchall()
+        removed = [row[0] for row in rows if row[0] not in keep_msg_vpns]
+        for msg_vpn in removed:
+            conn.execute('DELETE FROM objects WHERE broker=? AND msg_vpn=?', (broker, msg_vpn))
+            conn.execute('DELETE FROM harvests WHERE broker=? AND msg_vpn=?', (broker, msg_vpn))
+        return removed
+
+    def query(self, object_type=None, name=None, msg_vpn=None, broker=None, where=None, limit=None):
+        """Returns the matching objects: list of dicts with broker, msg_vpn, object_type, name & attributes.
+
+        name, msg_vpn, broker: exact values or glob patterns ('*', '?').
+        where: dict attribute -> value, values compared as is, e.g. {'clientProfileName': 'cp_orders'}.
+        """
+        clauses = []
+        values = []
+        for column, value in [('object_type', object_type), ('name', name), ('msg_vpn', msg_vpn), ('broker', broker)]:
+            if value is None:
+                continue
+            if any(c in value for c in '*?['):
+                clauses.append('{} GLOB ?'.format(column))
+            else:
+                clauses.append('{} = ?'.format(column))
+            values.append(value)
+        for attribute, value in (where or {}).items():
+            clauses.append("json_extract(attributes, ?) = ?")
+            values += ['$.' + attribute, value]
+        sql = 'SELECT broker, msg_vpn, object_type, name, attributes FROM objects'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY broker, msg_vpn, object_type, name'
+        if limit:
+            sql += ' LIMIT {}'.format(int(limit))
+        rows = self._connect().execute(sql, values).fetchall()
+        return [dict(broker=row[0], msg_vpn=row[1], object_type=row[2], name=row[3], attributes=json.loads(row[4])) for row in rows]
+
+    def get_harvests(self, broker=None):
+        sql = 'SELECT broker, msg_vpn, object_type, count, harvested_at FROM harvests'
+        values = []
+        if broker is not None:
+            sql += ' WHERE broker = ?'
+            values.append(broker)
+        rows = self._connect().execute(sql + ' ORDER BY broker, msg_vpn, object_type', values).fetchall()
+        return [dict(broker=row[0], msg_vpn=row[1], object_type=row[2], count=row[3], harvested_at=row[4]) for row in rows]
+
+
+class SolaceIndexHarvester(object):
+    """Harvests the config objects of many brokers into a SolaceConfigIndex.
+
+    brokers: list of (broker id, su.SolaceConfig, msg vpns or None for all).
+    """
+
+    def __init__(self, index, brokers, object_types=None, max_workers=DEFAULT_MAX_WORKERS, full_refresh=False):
+        self.index = index
+        self.brokers = brokers
+        self.object_types = object_types or INDEX_OBJECT_TYPES
+        self.max_workers = max_workers
+        self.full_refresh = full_refresh
+
+    async def _get_msg_vpns(self, session):
+        query = "count={}&select=msgVpnName".format(LIST_PAGE_SIZE)
+        ok, resp = await session.execute_get_list([su.SEMP_V2_CONFIG, su.MSG_VPNS], query)
+        if not ok:
+            return False, resp
+        return True, [item['msgVpnName'] for item in resp]
+
+    async def _get_marker(self, session, msg_vpn):
+        # GET /SEMP/v2/monitor/msgVpns/{msgVpnName}?select=configSyncLocalKey
+        ok, resp = await session.make_get_request([su.SEMP_V2_MONITOR, su.MSG_VPNS, msg_vpn], query='select=configSyncLocalKey')
+        if not ok or not isinstance(resp, dict):
+            logging.debug("index: unable to retrieve config marker for msg_vpn='%s': %s", msg_vpn, str(resp))
+            return None
+        return resp.get('configSyncLocalKey', None)
+
+    async def _harvest_type(self, session, broker_id, msg_vpn, object_type, marker):
+        t = so.get_object_type(object_type)
+        if object_type == 'vpn':
+            path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, msg_vpn]
+            ok, resp = await session.make_get_request(path_array)
+            items = [resp] if ok else None
+        else:
+            query = "count={}".format(LIST_PAGE_SIZE)
+            ok, resp = await session.execute_get_list(t.collection_path(dict(msg_vpn=msg_vpn)), query)
+            items = resp if ok else None
+        if not ok:
+            return object_type, HARVEST_STATUS_FAILED, resp
+        self.index.replace(broker_id, msg_vpn, object_type, marker, [(item[t.lookup_key], item) for item in items])
+        return object_type, HARVEST_STATUS_HARVESTED, len(items)
+
+    async def _harvest_vpn(self, session, broker_id, msg_vpn):
+        marker = await self._get_marker(session, msg_vpn)
+        markers = self.index.get_markers(broker_id, msg_vpn)
+        harvests = []
+        unchanged = []
+        for object_type in self.object_types:
+            if not self.full_refresh and marker is not None and markers.get(object_type) == marker:
+                unchanged.append(object_type)
+            else:
+                harvests.append(self._harvest_type(session, broker_id, msg_vpn, object_type, marker))
+        outcomes = await asyncio.gather(*harvests)
+        outcomes += [(object_type, HARVEST_STATUS_UNCHANGED, None) for object_type in unchanged]
+        return msg_vpn, outcomes
+
+    async def _harvest_broker(self, broker_id, solace_config, msg_vpns):
+        result = dict(broker=broker_id, msg_vpns=dict(), failures=[])
+        async with sa.SolaceAsyncSession(solace_config, self.max_workers) as session:
+            all_vpns = msg_vpns is None
+            if all_vpns:
+                ok, msg_vpns = await self._get_msg_vpns(session)
+                if not ok:
+                    result['failures'].append(dict(error=msg_vpns))
+                    return result
+            vpn_outcomes = await asyncio.gather(*[self._harvest_vpn(session, broker_id, msg_vpn) for msg_vpn in msg_vpns])
+        if all_vpns:
+            result['removed_msg_vpns'] = self.index.remove_vpns(broker_id, msg_vpns)
+        for msg_vpn, outcomes in vpn_outcomes:
+            counts = dict()
+            for object_type, status, resp in outcomes:
+                counts[status] = counts.get(status, 0) + 1
+                if status == HARVEST_STATUS_FAILED:
+                    result['failures'].append(dict(msg_vpn=msg_vpn, object_type=object_type, error=resp))
+            result['msg_vpns'][msg_vpn] = counts
+        return result
+
+    async def _harvest(self):
+        return await asyncio.gather(*[self._harvest_broker(*broker) for broker in self.brokers])
+
+    def harvest(self):
+        """Returns a list of results per broker: broker, msg_vpns (counts of object types per status) & failures."""
+        return sa.run(self._harvest())
+
+
+def get_index(path=None):
+    return SolaceConfigIndex(path or INDEX_PATH)
+
+###
+# The End.
@@ -0,0 +1,121 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Append-only journal of the objects a bulk operation has completed, to resume it after a failure.
+
+One JSON document per line: {"broker": ..., "uri": ..., "operation": ..., "digest": ..., "at": ...}.
+uri & digest are the ones of the state store: the object's module, args & name and the digest of
+the applied state & settings. An object whose uri & digest are in the journal is skipped without a
+request to the broker. A changed spec changes the digest, i.e. the object is applied again.
+
+The journal belongs to one operation: the modules remove it once the operation has completed, so the
+next run checks all objects against the broker again.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+OPERATION_CREATED = 'created'
+OPERATION_UPDATED = 'updated'
+OPERATION_DELETED = 'deleted'
+OPERATION_UNCHANGED = 'unchanged'
+
+
+class SolaceJournal(object):
+    """Usage:
+        journal = SolaceJournal(path)
+        if not journal.is_completed(broker, uri, digest):
+            ... apply the object ...
+            journal.record(broker, uri, operation, digest)
+        journal.remove()
+    thread safe: one journal may be shared by the workers of an operation.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._completed = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        # (broker, uri) -> digest of the last completed operation
+        completed = dict()
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, 'r') as f:
+            for line_number, text in enumerate(f, 1):
+                try:
+                    entry = json.loads(text)
+                    completed[(entry['broker'], entry['uri'])] = entry['digest']
+                except (ValueError, KeyError, TypeError):
+                    # e.g. the last line of an interrupted run
+                    logging.debug("journal: ignoring invalid line %d of '%s'", line_number, self.path)
+        return completed
+
+    def is_completed(self, broker, uri, digest):
+        with self._lock:
+            if self._completed is None:
+                self._completed = self._load()
+            return self._completed.get((broker, uri)) == digest
+
+    def record(self, broker, uri, operation, digest):
+        entry = dict(broker=broker, uri=uri, operation=operation, digest=digest, at=time.time())
+        with self._lock:
+            if self._file is None:
+                journal_dir = os.path.dirname(os.path.abspath(self.path))
+                if not os.path.isdir(journal_dir):
+                    os.makedirs(journal_dir, exist_ok=True)
+                self._file = open(self.path, 'a')
+            # one write per line: an interrupted run leaves at most one partial line
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            self._file.flush()
+            if self._completed is not None:
+                self._completed[(broker, uri)] = digest
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._completed = None
+
+
+def get_journal(path):
+    if not path:
+        return None
+    return SolaceJournal(path)
+
+###
+# The End.
@@ -0,0 +1,418 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Sampling of monitor API lists over time.
+
+Polls a monitor list at a fixed interval for a fixed duration with a select projection of the
+object keys & the sampled attributes. Per object & attribute:
+    gauges, e.g. msgSpoolUsage: the sampled values.
+    counters, e.g. spooledByteCount: the rate per second between two samples. counter resets are skipped.
+min, avg & max cover all samples. p95, slope & the history cover the last history_size samples only,
+kept in a ring buffer: memory is bounded by objects x attributes x history_size.
+
+Convergence waits: polls monitor objects until they have the expected attribute values, see SolaceMonitorWaiter.
+"""
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_async as sa
+import ansible.module_utils.network.solace.solace_aggregate as sg
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_INTERVAL = 5
+DEFAULT_HISTORY_SIZE = 60
+
+# max page size of SEMP v2 monitor lists
+LIST_PAGE_SIZE = 100
+
+
+class SolaceMonitorResource(object):
+
+    def __init__(self, name, collection, keys, gauges=None, counters=None):
+        self.name = name
+        # collection: path below the msg vpn, None: the msg vpn itself
+        self.collection = collection
+        # keys: attributes identifying an object, joined with ',' into its name
+        self.keys = keys
+        self.gauges = gauges or []
+        self.counters = counters or []
+
+    def path(self, msg_vpn):
+        path_array = [su.SEMP_V2_MONITOR, su.MSG_VPNS, msg_vpn]
+        if self.collection is not None:
+            path_array.append(self.collection)
+        return path_array
+
+    def object_name(self, item):
+        return ','.join(str(item.get(key)) for key in self.keys)
+
+
+MONITOR_RESOURCES = OrderedDict((r.name, r) for r in [
+    SolaceMonitorResource(
+        'vpn', None, ['msgVpnName'],
+        gauges=['msgSpoolUsage', 'msgSpoolMsgCount'],
+        counters=['dataRxMsgCount', 'dataTxMsgCount', 'dataRxByteCount', 'dataTxByteCount']),
+    SolaceMonitorResource(
+        'queues', su.QUEUES, ['queueName'],
+        gauges=['msgSpoolUsage', 'bindCount'],
+        counters=['spooledMsgCount', 'spooledByteCount']),
+    SolaceMonitorResource(
+        'topic_endpoints', su.TOPIC_ENDPOINTS, ['topicEndpointName'],
+        gauges=['msgSpoolUsage', 'bindCount'],
+        counters=['spooledMsgCount', 'spooledByteCount']),
+    SolaceMonitorResource(
+        'clients', su.CLIENTS, ['clientName'],
+        counters=['dataRxMsgCount', 'dataTxMsgCount', 'dataRxByteCount', 'dataTxByteCount']),
+    SolaceMonitorResource(
+        'bridges', su.BRIDGES, ['bridgeName', 'bridgeVirtualRouter'],
+        counters=['dataRxMsgCount', 'dataTxMsgCount'])
+])
+
+
+def _percentile(sorted_values, percent):
+    # nearest rank
+    if not sorted_values:
+        return None
+    rank = int(math.ceil(percent / 100.0 * len(sorted_values)))
+    return sorted_values[max(0, rank - 1)]
+
+
+def _slope(points):
+    # least squares slope per second of (time, value) points
+    n = len(points)
+    if n < 2:
+        return None
+    mean_t = sum(t for t, _v in points) / n
+    mean_v = sum(v for _t, v in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _v in points)
+    if var_t == 0:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var_t
+
+
+class SolaceMetricSeries(object):
+    """Values of one attribute of one object: running min / avg / max and a ring buffer of the last values."""
+
+    def __init__(self, history_size=DEFAULT_HISTORY_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.history = deque(maxlen=max(1, int(history_size)))
+
+    def add(self, t, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.history.append((t, value))
+
+    def summarize(self, start_time, with_history=False):
+        if self.count == 0:
+            return None
+        values = sorted(v for _t, v in self.history)
+        summary = OrderedDict([
+            ('min', self.min),
+            ('avg', round(self.total / self.count, 3)),
+            ('max', self.max),
+            ('p95', _percentile(values, 95)),
+            ('last', self.history[-1][1]),
+            ('slope', _slope(list(self.history)))
+        ])
+        if summary['slope'] is not None:
+            summary['slope'] = round(summary['slope'], 3)
+        if with_history:
+            summary['history'] = [[round(t - start_time, 3), v] for t, v in self.history]
+        return summary
+
+
+class SolaceMonitorSampler(object):
+    """Samples a monitor resource of a msg vpn.
+
+    Usage:
+        sampler = SolaceMonitorSampler(solace_config, msg_vpn, MONITOR_RESOURCES['queues'], interval=5, duration=60)
+        result, failures = sampler.run()
+    """
+
+    def __init__(self, solace_config, msg_vpn, resource, gauges=None, counters=None, where=None,
+                 interval=DEFAULT_INTERVAL, duration=0, history_size=DEFAULT_HISTORY_SIZE):
+        if interval <= 0:
+            raise ValueError("interval must be > 0, got: {}".format(interval))
+        if duration < 0:
+            raise ValueError("duration must be >= 0, got: {}".format(duration))
+        self.solace_config = solace_config
+        self.msg_vpn = msg_vpn
+        self.resource = resource
+        self.gauges = resource.gauges if gauges is None else gauges
+        self.counters = resource.counters if counters is None else counters
+        if not self.gauges and not self.counters:
+            raise ValueError("no gauges or counters to sample for resource '{}'".format(resource.name))
+        self.where = where or []
+        self.interval = float(interval)
+        self.duration = float(duration)
+        self.history_size = history_size
+        # object name -> OrderedDict attribute -> series
+        self.gauge_series = OrderedDict()
+        self.rate_series = OrderedDict()
+        # object name -> attribute -> (time, value) of the previous sample
+        self._last_counters = dict()
+        self.samples = 0
+        self.start_time = None
+        self.failures = []
+
+    def compose_query(self):
+        select = list(dict.fromkeys(self.resource.keys + self.gauges + self.counters))
+        query = "select=" + ','.join(select)
+        if self.resource.collection is not None:
+            query = "count={}&".format(LIST_PAGE_SIZE) + query
+        if self.where:
+            query += "&where=" + ','.join(where.replace('/', '%2F') for where in self.where)
+        return query
+
+    async def _get_items(self, session):
+        path_array = self.resource.path(self.msg_vpn)
+        if self.resource.collection is None:
+            ok, resp = await session.make_get_request(path_array, self.compose_query())
+            return ok, [resp] if ok else resp
+        return await session.execute_get_list(path_array, self.compose_query())
+
+    def _series(self, series_map, name, attribute):
+        object_series = series_map.setdefault(name, OrderedDict())
+        if attribute not in object_series:
+            object_series[attribute] = SolaceMetricSeries(self.history_size)
+        return object_series[attribute]
+
+    def add_sample(self, t, items):
+        for item in items:
+            name = self.resource.object_name(item)
+            for attribute in self.gauges:
+                value = item.get(attribute)
+                if isinstance(value, (int, float)):
+                    self._series(self.gauge_series, name, attribute).add(t, value)
+            last = self._last_counters.setdefault(name, dict())
+            for attribute in self.counters:
+                value = item.get(attribute)
+                if not isinstance(value, (int, float)):
+                    continue
+                if attribute in last:
+                    last_t, last_value = last[attribute]
+                    # a lower value: the counter was cleared
+                    if t > last_t and value >= last_value:
+                        self._series(self.rate_series, name, attribute).add(t, round((value - last_value) / (t - last_t), 3))
+                last[attribute] = (t, value)
+        self.samples += 1
+
+    async def _run(self):
+        count = int(self.duration // self.interval) + 1
+        async with sa.SolaceAsyncSession(self.solace_config) as session:
+            self.start_time = time.monotonic()
+            for i in range(count):
+                # fixed schedule: a slow sample does not shift the following ones
+                delay = self.start_time + i * self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                requested_at = time.monotonic()
+                ok, items = await self._get_items(session)
+                if not ok:
+                    self.failures.append(dict(sample=i, error=items))
+                    continue
+                # the broker's values are from somewhere during the request
+                self.add_sample((requested_at + time.monotonic()) / 2, items)
+
+    def run(self):
+        """Samples for duration seconds. returns (samples, failures)."""
+        sa.run(self._run())
+        return self.samples, self.failures
+
+    def summarize(self, with_history=False):
+        """Returns the list of objects with the summaries of their gauges & rates."""
+        objects = []
+        for name in list(OrderedDict.fromkeys(list(self.gauge_series) + list(self.rate_series))):
+            obj = OrderedDict(name=name)
+            for key, series_map in [('gauges', self.gauge_series), ('rates', self.rate_series)]:
+                summaries = OrderedDict()
+                for attribute, series in series_map.get(name, {}).items():
+                    summaries[attribute] = series.summarize(self.start_time, with_history)
+                if summaries:
+                    obj[key] = summaries
+            objects.append(obj)
+        return objects
+
+
+# convergence waits: adaptive poll interval, starts over on progress
+WAIT_MIN_INTERVAL = 0.1  # seconds
+WAIT_MAX_INTERVAL = 5.0  # seconds
+WAIT_BACKOFF = 1.5
+
+
+def get_monitor_path(object_type, args, name):
+    """Returns the monitor API path of an object of a solace_objects type, e.g. a bridge."""
+    return [su.SEMP_V2_MONITOR] + object_type.item_path(args, name)[1:]
+
+
+def _is_not_found(resp):
+    # SEMP v2: responseCode=400 & error.code=6
+    return isinstance(resp, dict) and resp.get('responseCode') == 400 and (resp.get('error') or {}).get('code') == 6
+
+
+def _matches(actual, expected):
+    if actual == expected:
+        return True
+    # e.g. 'true' or '5' given as a string, the broker returns a bool or a number
+    return isinstance(expected, str) and not isinstance(actual, str) and json.dumps(actual) == expected
+
+
+class SolaceMonitorTarget(object):
+    """A monitor object awaited by SolaceMonitorWaiter: the attribute values expected or its absence."""
+
+    def __init__(self, path_array, label):
+        self.path_array = path_array
+        self.label = label
+        # attribute -> expected value, nested attributes with dots
+        self.expected = OrderedDict()
+        self.absent = False
+        self.converged = False
+        self.converged_after = None
+        # the expected attributes' values of the last poll, None: not found
+        self.last = None
+        self.error = None
+
+    def compose_query(self):
+        if not self.expected:
+            return None
+        return "select=" + ','.join(OrderedDict.fromkeys(attribute.split('.')[0] for attribute in self.expected))
+
+    def evaluate(self, ok, resp):
+        # returns True if converged
+        self.error = None
+        if not ok:
+            if _is_not_found(resp):
+                self.last = None
+                return self.absent
+            self.error = resp
+            return False
+        if self.absent:
+            self.last = OrderedDict()
+            return False
+        self.last = OrderedDict((attribute, sg.get_attribute(resp, attribute)) for attribute in self.expected)
+        return all(_matches(self.last[attribute], expected) for attribute, expected in self.expected.items())
+
+    def describe(self):
+        d = OrderedDict([('object', self.label), ('converged', self.converged), ('converged_after', self.converged_after)])
+        if self.absent:
+            d['expected'] = 'absent'
+        else:
+            d['expected'] = self.expected
+        d['last'] = self.last
+        if self.error is not None:
+            d['error'] = self.error
+        return d
+
+
+class SolaceMonitorWaiter(object):
+    """Polls monitor objects until they all have the expected attribute values or the timeout has passed.
+
+    Conditions on the same object are merged into one request per poll, with a select of their attributes.
+    Each round polls the objects not converged yet concurrently. The interval between rounds starts at
+    WAIT_MIN_INTERVAL, backs off to WAIT_MAX_INTERVAL and starts over each time an object converges.
+
+    Usage:
+        waiter = SolaceMonitorWaiter(solace_config, timeout=120)
+        waiter.add(get_monitor_path(bridge_type, args, name), {'inboundOperationalState': 'ready'}, label='bridge b1')
+        converged = waiter.run()
+    """
+
+    def __init__(self, solace_config, timeout, max_interval=WAIT_MAX_INTERVAL):
+        if timeout < 0:
+            raise ValueError("timeout must be >= 0, got: {}".format(timeout))
+        self.solace_config = solace_config
+        self.timeout = float(timeout)
+        self.max_interval = max(float(max_interval), WAIT_MIN_INTERVAL)
+        # path tuple -> target
+        self.targets = OrderedDict()
+        self.rounds = 0
+        self.requests = 0
+        self.elapsed = None
+
+    def add(self, path_array, attributes=None, absent=False, label=None):
+        target = self.targets.get(tuple(path_array))
+        if target is None:
+            target = SolaceMonitorTarget(path_array, label or '/'.join(path_array[1:]))
+            self.targets[tuple(path_array)] = target
+        if absent:
+            target.absent = True
+        for attribute, value in (attributes or {}).items():
+            if attribute in target.expected and target.expected[attribute] != value:
+                raise ValueError("conflicting values expected of '{}': {}: {} and {}".format(
+                    target.label, attribute, target.expected[attribute], value))
+            target.expected[attribute] = value
+        if target.absent and target.expected:
+            raise ValueError("'{}' is expected absent and to have attribute values".format(target.label))
+        return target
+
+    async def _poll(self, session, target):
+        ok, resp = await session.make_get_request(target.path_array, target.compose_query())
+        return target.evaluate(ok, resp)
+
+    async def _run(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        interval = WAIT_MIN_INTERVAL
+        async with sa.SolaceAsyncSession(self.solace_config) as session:
+            while True:
+                pending = [target for target in self.targets.values() if not target.converged]
+                self.rounds += 1
+                self.requests += len(pending)
+                results = await asyncio.gather(*[self._poll(session, target) for target in pending])
+                now = time.monotonic()
+                progress = False
+                for target, converged in zip(pending, results):
+                    if converged:
+                        target.converged = True
+                        target.converged_after = round(now - start, 2)
+                        progress = True
+                if all(target.converged for target in self.targets.values()) or now >= deadline:
+                    break
+                if progress:
+                    interval = WAIT_MIN_INTERVAL
+                await asyncio.sleep(min(interval, max(deadline - now, 0)))
+                interval = min(interval * WAIT_BACKOFF, self.max_interval)
+        self.elapsed = round(time.monotonic() - start, 2)
+
+    def run(self):
+        """Polls until all objects converged or the timeout has passed. returns True if all converged."""
+        sa.run(self._run())
+        return all(target.converged for target in self.targets.values())
+
+    def describe(self):
+        return [target.describe() for target in self.targets.values()]
+
+###
+# The End.
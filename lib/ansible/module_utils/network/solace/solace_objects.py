@@ -0,0 +1,411 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Registry of the SEMPv2 config object types managed by the solace_* modules.
+
+Each type mirrors its module's task class: the same get_args() parent keys (same order),
+lookup key, paths and mandatory POST keys. SolaceObjectTask is the generic SolaceTask driven
+by a type, so planners can run the do_task() logic of many objects in one module.
+"""
+
+import ansible.module_utils.network.solace.solace_utils as su
+from collections import OrderedDict
+
+# marks an item arg the spec must provide
+REQUIRED = object()
+
+
+def _render(template, values):
+    # '{arg}' keeps the value as is (e.g. None), anything else is formatted as a string with None as ''
+    if template.startswith('{') and template.endswith('}') and template.count('{') == 1:
+        return values[template[1:-1]]
+    return template.format(**{k: ('' if v is None else v) for k, v in values.items()})
+
+
+class SolaceObjectType(object):
+
+    def __init__(self, name, lookup_key, collection, args=None, uri='{name}', body=None, defaults=None,
+                 parent=None, spec_key=None, item_args=None, child_args=None,
+                 whitelist_keys=None, required_together_keys=None, vpn_scoped=True):
+        # name: module name without the 'solace_' prefix
+        self.name = name
+        self.module = 'solace_' + name
+        self.lookup_key = lookup_key
+        # collection: path below SEMP_V2_CONFIG, templates use the args
+        self.collection = collection
+        # args: names of the module's get_args(), same order
+        self.args = args or []
+        self.uri = uri
+        self.body = body or {}
+        self.defaults = defaults or {}
+        self.parent = parent
+        # spec_key: key of the list of these objects in the parent's spec item
+        self.spec_key = spec_key
+        # item_args: args read from the spec item: name -> default or REQUIRED
+        self.item_args = item_args or {}
+        # child_args: args passed on to the children, templates use the args & name
+        self.child_args = child_args or {}
+        self.whitelist_keys = whitelist_keys or []
+        self.required_together_keys = required_together_keys or []
+        # vpn_scoped: the object is covered by the msg vpn's config-sync key
+        self.vpn_scoped = vpn_scoped
+
+    def _values(self, args, name):
+        values = dict(args)
+        values['name'] = name
+        return values
+
+    def get_args(self, args):
+        return [args[arg] for arg in self.args]
+
+    def get_key(self, args, name):
+        return (self.name,) + tuple(self.get_args(args)) + (name,)
+
+    def collection_path(self, args):
+        return [su.SEMP_V2_CONFIG] + [_render(elem, args) for elem in self.collection]
+
+    def item_path(self, args, name):
+        return self.collection_path(args) + [_render(self.uri, self._values(args, name))]
+
+    def create_body(self, args, name, settings=None):
+        values = self._values(args, name)
+        mandatory = {}
+        for key, template in self.body.items():
+            value = _render(template, values)
+            if value is not None:
+                mandatory[key] = value
+        mandatory[self.lookup_key] = name
+        return su.merge_dicts(self.defaults, mandatory, settings)
+
+    def get_parent_values(self, args):
+        # the mandatory POST keys taken from the parents, e.g. {'msgVpnName': 'vpn-1'}
+        values = self._values(args, None)
+        parent_values = {}
+        for key, template in self.body.items():
+            value = _render(template, values)
+            if value is not None:
+                parent_values[key] = value
+        return parent_values
+
+    def get_item_args(self, parent_args, attributes):
+        # the args of an object read from the broker: the parent's args & the item args taken from the
+        # attributes, e.g. a bridge's virtual router from bridgeVirtualRouter
+        args = dict(parent_args)
+        for key, template in self.body.items():
+            if not (template.startswith('{') and template.endswith('}')):
+                continue
+            arg = template[1:-1]
+            if arg in self.item_args or arg not in parent_args:
+                args[arg] = attributes.get(key)
+        return args
+
+    def get_identity_keys(self):
+        # attributes identifying the object rather than configuring it: the lookup keys & the parent keys of the
+        # POST body of the object & its ancestors, which the broker returns with every object
+        keys = set()
+        object_type = self
+        while object_type is not None:
+            keys.add(object_type.lookup_key)
+            keys.update(object_type.body.keys())
+            object_type = OBJECT_TYPES[object_type.parent] if object_type.parent else None
+        return keys
+
+    def derive_child_args(self, args, name):
+        values = self._values(args, name)
+        child_args = dict(args)
+        for arg, template in self.child_args.items():
+            child_args[arg] = _render(template, values)
+        return child_args
+
+    def get_children(self):
+        return [t for t in OBJECT_TYPES.values() if t.parent == self.name]
+
+
+OBJECT_TYPES = OrderedDict((t.name, t) for t in [
+    SolaceObjectType(
+        'vpn', 'msgVpnName', [su.MSG_VPNS],
+        defaults={'enabled': True},
+        child_args={'msg_vpn': '{name}'}),
+    SolaceObjectType(
+        'client_profile', 'clientProfileName', [su.MSG_VPNS, '{msg_vpn}', su.CLIENT_PROFILES],
+        args=['msg_vpn'], parent='vpn', spec_key='client_profiles'),
+    SolaceObjectType(
+        'acl_profile', 'aclProfileName', [su.MSG_VPNS, '{msg_vpn}', su.ACL_PROFILES],
+        args=['msg_vpn'], body={'msgVpnName': '{msg_vpn}'},
+        parent='vpn', spec_key='acl_profiles',
+        child_args={'acl_profile_name': '{name}'}),
+    SolaceObjectType(
+        'acl_client_connect_exception', 'clientConnectExceptionAddress',
+        [su.MSG_VPNS, '{msg_vpn}', su.ACL_PROFILES, '{acl_profile_name}', su.ACL_PROFILES_CLIENT_CONNECT_EXCEPTIONS],
+        args=['msg_vpn', 'acl_profile_name'], body={'msgVpnName': '{msg_vpn}', 'aclProfileName': '{acl_profile_name}'},
+        parent='acl_profile', spec_key='client_connect_exceptions'),
+    SolaceObjectType(
+        'client_username', 'clientUsername', [su.MSG_VPNS, '{msg_vpn}', su.CLIENT_USERNAMES],
+        args=['msg_vpn'], defaults={'enabled': True},
+        parent='vpn', spec_key='client_usernames'),
+    SolaceObjectType(
+        'queue', 'queueName', [su.MSG_VPNS, '{msg_vpn}', su.QUEUES],
+        args=['msg_vpn'], body={'msgVpnName': '{msg_vpn}'},
+        parent='vpn', spec_key='queues',
+        child_args={'queue': '{name}'}),
+    SolaceObjectType(
+        'queue_subscription', 'subscriptionTopic', [su.MSG_VPNS, '{msg_vpn}', su.QUEUES, '{queue}', su.SUBSCRIPTIONS],
+        args=['msg_vpn', 'queue'],
+        parent='queue', spec_key='subscriptions'),
+    SolaceObjectType(
+        'topic_endpoint', 'topicEndpointName', [su.MSG_VPNS, '{msg_vpn}', su.TOPIC_ENDPOINTS],
+        args=['msg_vpn'], body={'msgVpnName': '{msg_vpn}'},
+        parent='vpn', spec_key='topic_endpoints'),
+    SolaceObjectType(
+        'rdp', 'restDeliveryPointName', [su.MSG_VPNS, '{msg_vpn}', su.RDP_REST_DELIVERY_POINTS],
+        args=['msg_vpn'], body={'msgVpnName': '{msg_vpn}'},
+        parent='vpn', spec_key='rest_delivery_points',
+        child_args={'rdp_name': '{name}'}),
+    SolaceObjectType(
+        'rdp_rest_consumer', 'restConsumerName',
+        [su.MSG_VPNS, '{msg_vpn}', su.RDP_REST_DELIVERY_POINTS, '{rdp_name}', su.RDP_REST_CONSUMERS],
+        args=['msg_vpn', 'rdp_name'], body={'msgVpnName': '{msg_vpn}', 'restDeliveryPointName': '{rdp_name}'},
+        parent='rdp', spec_key='rest_consumers',
+        child_args={'rest_consumer_name': '{name}'},
+        whitelist_keys=['authenticationHttpBasicPassword', 'authenticationClientCertContent', 'authenticationClientCertPassword']),
+    SolaceObjectType(
+        'rdp_rest_consumer_trusted_cn', 'tlsTrustedCommonName',
+        [su.MSG_VPNS, '{msg_vpn}', su.RDP_REST_DELIVERY_POINTS, '{rdp_name}', su.RDP_REST_CONSUMERS, '{rest_consumer_name}', su.RDP_TLS_TRUSTED_COMMON_NAMES],
+        args=['msg_vpn', 'rdp_name', 'rest_consumer_name'],
+        body={'msgVpnName': '{msg_vpn}', 'restDeliveryPointName': '{rdp_name}', 'restConsumerName': '{rest_consumer_name}'},
+        parent='rdp_rest_consumer', spec_key='tls_trusted_common_names'),
+    SolaceObjectType(
+        'rdp_queue_binding', 'queueBindingName',
+        [su.MSG_VPNS, '{msg_vpn}', su.RDP_REST_DELIVERY_POINTS, '{rdp_name}', su.RDP_QUEUE_BINDINGS],
+        args=['msg_vpn', 'rdp_name'], body={'msgVpnName': '{msg_vpn}', 'restDeliveryPointName': '{rdp_name}'},
+        parent='rdp', spec_key='queue_bindings'),
+    SolaceObjectType(
+        'bridge', 'bridgeName', [su.MSG_VPNS, '{msg_vpn}', su.BRIDGES],
+        args=['msg_vpn', 'virtual_router'], uri='{name},{virtual_router}',
+        body={'msgVpnName': '{msg_vpn}', 'bridgeVirtualRouter': '{virtual_router}'},
+        parent='vpn', spec_key='bridges',
+        item_args={'virtual_router': 'auto'},
+        child_args={'bridge_name': '{name}', 'bridge_virtual_router': '{virtual_router}'},
+        whitelist_keys=['remoteAuthenticationBasicPassword', 'remoteAuthenticationClientCertPassword'],
+        required_together_keys=[
+            ['remoteAuthenticationBasicClientUsername', 'remoteAuthenticationBasicPassword'],
+            ['remoteAuthenticationClientCertPassword', 'remoteAuthenticationClientCertContent']
+        ]),
+    SolaceObjectType(
+        'bridge_remote_vpn', 'remoteMsgVpnName',
+        [su.MSG_VPNS, '{msg_vpn}', su.BRIDGES, '{bridge_name},{bridge_virtual_router}', su.BRIDGES_REMOTE_MSG_VPNS],
+        args=['msg_vpn', 'bridge_virtual_router', 'bridge_name', 'remote_vpn_location', 'remote_vpn_interface'],
+        uri='{name},{remote_vpn_location},{remote_vpn_interface}',
+        body={'msgVpnName': '{msg_vpn}', 'bridgeName': '{bridge_name}',
+              'remoteMsgVpnLocation': '{remote_vpn_location}', 'remoteMsgVpnInterface': '{remote_vpn_interface}'},
+        parent='bridge', spec_key='remote_vpns',
+        item_args={'remote_vpn_location': REQUIRED, 'remote_vpn_interface': None}),
+    SolaceObjectType(
+        'bridge_remote_subscription', 'remoteSubscriptionTopic',
+        [su.MSG_VPNS, '{msg_vpn}', su.BRIDGES, '{bridge_name},{bridge_virtual_router}', su.BRIDGES_REMOTE_SUBSCRIPTIONS],
+        args=['msg_vpn', 'bridge_virtual_router', 'bridge_name'],
+        body={'msgVpnName': '{msg_vpn}', 'bridgeName': '{bridge_name}', 'bridgeVirtualRouter': '{bridge_virtual_router}'},
+        parent='bridge', spec_key='remote_subscriptions'),
+    SolaceObjectType(
+        'bridge_tls_cn', 'tlsTrustedCommonName',
+        [su.MSG_VPNS, '{msg_vpn}', su.BRIDGES, '{bridge_name},{bridge_virtual_router}', su.BRIDGES_TRUSTED_COMMON_NAMES],
+        args=['msg_vpn', 'bridge_virtual_router', 'bridge_name'],
+        body={'msgVpnName': '{msg_vpn}', 'bridgeName': '{bridge_name}', 'bridgeVirtualRouter': '{bridge_virtual_router}'},
+        parent='bridge', spec_key='tls_trusted_common_names'),
+    SolaceObjectType(
+        'mqtt_session', 'mqttSessionClientId', [su.MSG_VPNS, '{msg_vpn}', su.MQTT_SESSIONS],
+        args=['msg_vpn', 'virtual_router'], uri='{name},{virtual_router}',
+        body={'msgVpnName': '{msg_vpn}', 'mqttSessionVirtualRouter': '{virtual_router}'},
+        parent='vpn', spec_key='mqtt_sessions',
+        item_args={'virtual_router': 'primary'},
+        child_args={'mqtt_session_client_id': '{name}'}),
+    # no spec_key: QoS 1 subscriptions need the magic queue handling of solace_mqtt_session_subscription
+    SolaceObjectType(
+        'mqtt_session_subscription', 'subscriptionTopic',
+        [su.MSG_VPNS, '{msg_vpn}', su.MQTT_SESSIONS, '{mqtt_session_client_id},{virtual_router}', su.MQTT_SESSION_SUBSCRIPTIONS],
+        args=['msg_vpn', 'mqtt_session_client_id', 'virtual_router'],
+        body={'msgVpnName': '{msg_vpn}', 'mqttSessionClientId': '{mqtt_session_client_id}', 'mqttSessionVirtualRouter': '{virtual_router}'},
+        parent='mqtt_session'),
+    SolaceObjectType(
+        'dmr_bridge', 'remoteNodeName', [su.MSG_VPNS, '{msg_vpn}', su.DMR_BRIDGES],
+        args=['msg_vpn'], body={'msgVpnName': '{msg_vpn}'}, defaults={'remoteMsgVpnName': 'default'},
+        parent='vpn', spec_key='dmr_bridges'),
+    SolaceObjectType(
+        'dmr_cluster', 'dmrClusterName', [su.DMR_CLUSTERS],
+        defaults={'enabled': True},
+        child_args={'dmr': '{name}'},
+        whitelist_keys=['authenticationBasicPassword', 'authenticationClientCertPassword'],
+        required_together_keys=[
+            ['authenticationClientCertPassword', 'authenticationClientCertContent']
+        ],
+        vpn_scoped=False),
+    SolaceObjectType(
+        'dmr_cluster_link', 'remoteNodeName', [su.DMR_CLUSTERS, '{dmr}', su.LINKS],
+        args=['dmr'], body={'dmrClusterName': '{dmr}'},
+        parent='dmr_cluster', spec_key='links',
+        child_args={'remote_node_name': '{name}'},
+        whitelist_keys=['authenticationBasicPassword'],
+        vpn_scoped=False),
+    SolaceObjectType(
+        'dmr_cluster_link_remote_address', 'remoteAddress',
+        [su.DMR_CLUSTERS, '{dmr}', su.LINKS, '{remote_node_name}', su.REMOTE_ADDRESSES],
+        args=['dmr', 'remote_node_name'], body={'dmrClusterName': '{dmr}', 'remoteNodeName': '{remote_node_name}'},
+        parent='dmr_cluster_link', spec_key='remote_addresses',
+        vpn_scoped=False),
+    SolaceObjectType(
+        'dmr_cluster_link_trusted_cn', 'tlsTrustedCommonName',
+        [su.DMR_CLUSTERS, '{dmr}', su.LINKS, '{remote_node_name}', su.TLS_TRUSTED_COMMON_NAMES],
+        args=['dmr', 'remote_node_name'], body={'dmrClusterName': '{dmr}', 'remoteNodeName': '{remote_node_name}'},
+        parent='dmr_cluster_link', spec_key='tls_trusted_common_names',
+        vpn_scoped=False)
+])
+
+
+# acl topic exceptions: resource & key names changed with SEMP 2.14.
+# not in OBJECT_TYPES, see get_acl_topic_exception_type().
+_ACL_TOPIC_EXCEPTION_NAMES = {
+    'publish': {
+        # lookup key, collection, topic syntax key
+        '2.13': ('publishExceptionTopic', 'publishExceptions', 'topicSyntax'),
+        '2.14': ('publishTopicException', 'publishTopicExceptions', 'publishTopicExceptionSyntax')
+    },
+    'subscribe': {
+        '2.13': ('subscribeExceptionTopic', 'subscribeExceptions', 'topicSyntax'),
+        '2.14': ('subscribeTopicException', 'subscribeTopicExceptions', 'subscribeTopicExceptionSyntax')
+    }
+}
+
+
+def get_acl_topic_exception_type(direction, semp_version):
+    """Returns the type of solace_acl_publish_topic_exception / solace_acl_subscribe_topic_exception for the broker's SEMP version.
+
+    direction: 'publish' or 'subscribe'.
+    """
+    try:
+        version_key = '2.13' if float(semp_version) <= 2.13 else '2.14'
+    except ValueError:
+        raise ValueError("semp_version: '{}' cannot be converted to a float.".format(semp_version))
+    lookup_key, collection, syntax_key = _ACL_TOPIC_EXCEPTION_NAMES[direction][version_key]
+    return SolaceObjectType(
+        'acl_{}_topic_exception'.format(direction), lookup_key,
+        [su.MSG_VPNS, '{msg_vpn}', su.ACL_PROFILES, '{acl_profile_name}', collection],
+        args=['msg_vpn', 'acl_profile_name', 'topic_syntax'], uri='{topic_syntax},{name}',
+        body={'msgVpnName': '{msg_vpn}', 'aclProfileName': '{acl_profile_name}', syntax_key: '{topic_syntax}'},
+        parent='acl_profile')
+
+
+def get_object_type(name):
+    if name not in OBJECT_TYPES:
+        raise ValueError("unknown object type: '{}'. valid types: {}".format(name, ', '.join(OBJECT_TYPES)))
+    return OBJECT_TYPES[name]
+
+
+class SolaceTaskError(Exception):
+
+    def __init__(self, msg, result=None):
+        Exception.__init__(self, msg)
+        self.msg = msg
+        self.result = result or {}
+
+
+class SolaceTaskModule(object):
+    # stands in for AnsibleModule when a SolaceTask runs inside another module.
+    # fail_json() raises instead of exiting, so one failed object doesn't end the module.
+
+    def __init__(self, name, params, check_mode=False):
+        self._name = name
+        self.params = params
+        self.check_mode = check_mode
+
+    def fail_json(self, msg=None, **kwargs):
+        raise SolaceTaskError(msg, kwargs)
+
+
+# module params a SolaceObjectTask takes over from the calling module
+_BROKER_PARAM_KEYS = list(su.arg_spec_broker().keys()) + ['semp_version']
+
+
+class SolaceObjectTask(su.SolaceTask):
+
+    def __init__(self, module, object_type, args):
+        self.object_type = object_type
+        self.object_args = args
+        self.LOOKUP_ITEM_KEY = object_type.lookup_key
+        self.WHITELIST_KEYS = object_type.whitelist_keys
+        self.REQUIRED_TOGETHER_KEYS = object_type.required_together_keys
+        su.SolaceTask.__init__(self, module)
+
+    def lookup_item(self):
+        return self.module.params['name']
+
+    def get_args(self):
+        return self.object_type.get_args(self.object_args)
+
+    def get_config_marker_scope(self):
+        if not self.object_type.vpn_scoped:
+            return None
+        return su.SolaceTask.get_config_marker_scope(self)
+
+    def _split_crud_args(self, args):
+        # args: get_args() + [lookup_item] + optional [settings]
+        n = len(self.object_type.args)
+        return args[n], (args[n + 1] if len(args) > n + 1 else None)
+
+    def get_func(self, solace_config, *args):
+        name, _ = self._split_crud_args(args)
+        path_array = self.object_type.item_path(self.object_args, name)
+        return su.get_configuration(solace_config, path_array, self.LOOKUP_ITEM_KEY)
+
+    def create_func(self, solace_config, *args):
+        name, settings = self._split_crud_args(args)
+        data = self.object_type.create_body(self.object_args, name, settings)
+        return su.make_post_request(solace_config, self.object_type.collection_path(self.object_args), data)
+
+    def update_func(self, solace_config, *args):
+        name, settings = self._split_crud_args(args)
+        return su.make_patch_request(solace_config, self.object_type.item_path(self.object_args, name), settings)
+
+    def delete_func(self, solace_config, *args):
+        name, _ = self._split_crud_args(args)
+        return su.make_delete_request(solace_config, self.object_type.item_path(self.object_args, name))
+
+
+def create_object_task(module, object_type, args, name, settings=None, state='present', journal=None):
+    """Returns a SolaceObjectTask for one object, using the broker params of module.
+
+    journal: optional solace_journal.SolaceJournal of the calling module's bulk operation.
+    """
+    params = {key: module.params.get(key) for key in _BROKER_PARAM_KEYS}
+    params.update(args)
+    params.update(dict(name=name, settings=settings, state=state))
+    task_module = SolaceTaskModule(object_type.module, params, module.check_mode)
+    task = SolaceObjectTask(task_module, object_type, args)
+    task.journal = journal
+    return task
+
+###
+# The End.
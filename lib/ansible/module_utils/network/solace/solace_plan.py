@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Dependency-aware apply of many config objects.
+
+A plan is a DAG of objects: children depend on their parent, objects depend on the objects
+they reference (e.g. a client username on its client & acl profile). Independent branches are
+applied concurrently; state=absent runs the plan in reverse order.
+"""
+
+import ansible.module_utils.network.solace.solace_objects as so
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DEFAULT_MAX_WORKERS = 10
+
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+# references between objects of the same vpn, besides parent/child:
+# (object type, settings key or None for the object's name, referenced object type)
+OBJECT_REFERENCES = [
+    ('client_username', 'clientProfileName', 'client_profile'),
+    ('client_username', 'aclProfileName', 'acl_profile'),
+    ('queue', 'deadMsgQueue', 'queue'),
+    ('topic_endpoint', 'deadMsgQueue', 'queue'),
+    ('rdp_queue_binding', None, 'queue')
+]
+
+
+class SolacePlanNode(object):
+
+    def __init__(self, object_type, args, name, settings=None):
+        self.object_type = object_type
+        self.args = args
+        self.name = name
+        self.settings = settings
+        self.key = object_type.get_key(args, name)
+        # keys of the nodes which must be applied before this one
+        self.requires = []
+
+    def describe(self):
+        d = OrderedDict(type=self.object_type.name, name=self.name)
+        d.update((arg, self.args[arg]) for arg in self.object_type.args)
+        return d
+
+
+class SolacePlan(object):
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+
+    def add_node(self, node, parent=None):
+        if node.key in self.nodes:
+            raise ValueError("duplicate object in spec: {}".format(dict(node.describe())))
+        self.nodes[node.key] = node
+        if parent is not None:
+            node.requires.append(parent.key)
+        return node
+
+    def add_references(self, references=None):
+        for node in self.nodes.values():
+            for type_name, settings_key, ref_type_name in (references or OBJECT_REFERENCES):
+                if node.object_type.name != type_name:
+                    continue
+                if settings_key is None:
+                    ref_name = node.name
+                else:
+                    ref_name = (node.settings or {}).get(settings_key)
+                if not ref_name:
+                    continue
+                ref_type = so.get_object_type(ref_type_name)
+                ref_key = ref_type.get_key(node.args, ref_name)
+                # references to objects outside of the plan must already exist
+                if ref_key in self.nodes and ref_key != node.key and ref_key not in node.requires:
+                    node.requires.append(ref_key)
+
+    def get_levels(self):
+        # topological levels: level n only depends on levels < n. len(levels) is the critical path.
+        levels = []
+        level_of = {}
+        remaining = OrderedDict((key, set(node.requires)) for key, node in self.nodes.items())
+        while remaining:
+            level = [key for key, requires in remaining.items() if not requires - set(level_of)]
+            if not level:
+                raise ValueError("circular dependencies in spec between: {}".format(
+                    [dict(self.nodes[key].describe()) for key in remaining]))
+            for key in level:
+                level_of[key] = len(levels)
+                del remaining[key]
+            levels.append(level)
+        return levels
+
+    def execute(self, apply_func, max_workers=DEFAULT_MAX_WORKERS, reverse=False):
+        """Runs apply_func(node) for all nodes, each as soon as the nodes it waits for are done.
+
+        forward: a node waits for the nodes it requires. reverse: for the nodes requiring it.
+        a failed node skips all nodes waiting for it, directly or indirectly.
+        apply_func() raises so.SolaceTaskError on failure.
+        returns: OrderedDict key -> (status, result) in plan order.
+        """
+        waits_for = OrderedDict((key, set()) for key in self.nodes)
+        for key, node in self.nodes.items():
+            for required in node.requires:
+                if reverse:
+                    waits_for[required].add(key)
+                else:
+                    waits_for[key].add(required)
+        waited_for_by = dict((key, set()) for key in self.nodes)
+        for key, keys in waits_for.items():
+            for waited_for in keys:
+                waited_for_by[waited_for].add(key)
+
+        results = dict()
+
+        def skip(key, cause):
+            for dependent in waited_for_by[key]:
+                if dependent not in results:
+                    results[dependent] = (STATUS_SKIPPED, dict(msg="skipped: depends on failed object", cause=cause))
+                    skip(dependent, cause)
+
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+            pending = dict()
+
+            def submit_ready(keys):
+                for key in keys:
+                    if key not in results and not waits_for[key]:
+                        pending[executor.submit(apply_func, self.nodes[key])] = key
+
+            submit_ready(list(waits_for))
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        results[key] = (STATUS_OK, future.result())
+                    except so.SolaceTaskError as e:
+                        logging.debug("plan: object failed: %s: %s", str(key), e.msg)
+                        results[key] = (STATUS_FAILED, dict(msg=e.msg, **e.result))
+                        skip(key, dict(self.nodes[key].describe()))
+                        continue
+                    for dependent in waited_for_by[key]:
+                        waits_for[dependent].discard(key)
+                    submit_ready(waited_for_by[key])
+
+        return OrderedDict((key, results[key]) for key in self.nodes if key in results)
+
+
+def _normalize_spec_item(object_type, item):
+    # plain strings are names, e.g. queue subscriptions
+    if not isinstance(item, dict):
+        item = dict(name=item)
+    if 'name' not in item or item['name'] is None or item['name'] == '':
+        raise ValueError("missing 'name' in {} spec item: {}".format(object_type.name, item))
+    valid_keys = ['name', 'settings'] + list(object_type.item_args) + [t.spec_key for t in object_type.get_children() if t.spec_key]
+    invalid_keys = [key for key in item if key not in valid_keys]
+    if invalid_keys:
+        raise ValueError("invalid key(s) in {} spec item '{}': {}. valid keys: {}".format(
+            object_type.name, item['name'], ', '.join(invalid_keys), ', '.join(valid_keys)))
+    return item
+
+
+def _add_spec_items(plan, object_type, parent_args, items, parent_node):
+    for item in (items or []):
+        item = _normalize_spec_item(object_type, item)
+        args = dict(parent_args)
+        for arg, default in object_type.item_args.items():
+            value = item.get(arg, default)
+            if value is so.REQUIRED:
+                raise ValueError("missing '{}' in {} spec item '{}'".format(arg, object_type.name, item['name']))
+            args[arg] = value
+        node = plan.add_node(SolacePlanNode(object_type, args, item['name'], item.get('settings')), parent_node)
+        _add_spec_children(plan, object_type, object_type.derive_child_args(args, item['name']), item, node)
+
+
+def _add_spec_children(plan, object_type, child_args, spec, node):
+    for child_type in object_type.get_children():
+        if child_type.spec_key is None:
+            continue
+        _add_spec_items(plan, child_type, child_args, spec.get(child_type.spec_key), node)
+
+
+def build_vpn_plan(msg_vpn, spec, manage_vpn=False):
+    """Builds the plan of a vpn spec: {'settings': vpn settings, 'queues': [...], ...}.
+
+    manage_vpn: the vpn itself is part of the plan, first to apply & last to remove.
+    """
+    vpn_type = so.get_object_type('vpn')
+    spec = spec or {}
+    valid_keys = ['settings'] + [t.spec_key for t in vpn_type.get_children() if t.spec_key]
+    invalid_keys = [key for key in spec if key not in valid_keys]
+    if invalid_keys:
+        raise ValueError("invalid key(s) in spec: {}. valid keys: {}".format(', '.join(invalid_keys), ', '.join(valid_keys)))
+    plan = SolacePlan()
+    vpn_node = None
+    if manage_vpn:
+        vpn_node = plan.add_node(SolacePlanNode(vpn_type, {}, msg_vpn, spec.get('settings')))
+    _add_spec_children(plan, vpn_type, vpn_type.derive_child_args({}, msg_vpn), spec, vpn_node)
+    plan.add_references()
+    return plan
+
+###
+# The End.
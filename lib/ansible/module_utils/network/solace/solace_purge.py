@@ -0,0 +1,198 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Bulk delete of the objects of a msg vpn selected by type & name pattern.
+
+The objects are listed with server-side where filters on their names & a select projection of their identity keys.
+Objects whose parent is deleted too are pruned: their collections are not even listed, the broker deletes them with
+their parent. The remaining deletes run level by level in reverse dependency order, e.g. client usernames before the
+client profiles they reference, each level concurrently with at most max_workers requests in flight.
+"""
+
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_export as se
+import ansible.module_utils.network.solace.solace_async as sa
+import asyncio
+from collections import OrderedDict
+
+DEFAULT_MAX_WORKERS = 20
+
+# max page size of SEMP v2 lists
+LIST_PAGE_SIZE = 100
+
+# created with the msg vpn, the broker rejects their deletion
+_DEFAULT_OBJECT_TYPES = ['client_profile', 'acl_profile', 'client_username']
+_DEFAULT_OBJECT_NAME = 'default'
+
+
+def _is_system_object(name):
+    return isinstance(name, str) and name.startswith('#')
+
+
+class SolacePurgeSelector(object):
+
+    def __init__(self, object_type, names=None, where=None):
+        self.object_type = object_type
+        self.names = names or ['*']
+        self.where = where or []
+
+    def compose_queries(self):
+        # one list query per name pattern: where conditions are and-ed
+        select = ','.join(sorted(self.object_type.get_identity_keys()))
+        for name in self.names:
+            where = ["{}=={}".format(self.object_type.lookup_key, name)] + self.where
+            yield "count={}&select={}&where={}".format(LIST_PAGE_SIZE, select, ','.join(w.replace('/', '%2F') for w in where))
+
+
+class SolaceVpnPurger(object):
+    """Deletes the objects of a msg vpn matching the selectors.
+
+    Usage:
+        purger = SolaceVpnPurger(solace_config, msg_vpn, [dict(type='queue', names=['test-*'])])
+        summary, failures = purger.purge()
+    """
+
+    def __init__(self, solace_config, msg_vpn, selectors, semp_version=None, max_workers=DEFAULT_MAX_WORKERS,
+                 include_system_objects=False, dry_run=False):
+        self.solace_config = solace_config
+        self.msg_vpn = msg_vpn
+        self.max_workers = max(1, int(max_workers))
+        self.include_system_objects = include_system_objects
+        self.dry_run = dry_run
+        self.selectors = OrderedDict()
+        for selector in selectors:
+            if selector['type'] == 'vpn' or selector['type'] not in se.DEFAULT_OBJECT_TYPES:
+                raise ValueError("invalid object type: '{}'. valid types: {}".format(selector['type'], ', '.join(se.DEFAULT_OBJECT_TYPES)))
+            object_type = se.get_export_object_type(selector['type'], semp_version)
+            self.selectors.setdefault(object_type.name, []).append(
+                SolacePurgeSelector(object_type, selector.get('names'), selector.get('where')))
+        # the selected types & their ancestors, listed parent before child
+        self.object_types = OrderedDict()
+        for type_name in self.selectors:
+            object_type = self.selectors[type_name][0].object_type
+            chain = []
+            while object_type.name != 'vpn':
+                chain.insert(0, object_type)
+                object_type = so.get_object_type(object_type.parent)
+            for object_type in chain:
+                self.object_types.setdefault(object_type.name, object_type)
+        self.object_types = OrderedDict(sorted(self.object_types.items(), key=lambda item: self._depth(item[1])))
+        # type name -> OrderedDict key -> (args, name), in deletion order
+        self.deletes = OrderedDict((name, OrderedDict()) for name in reversed(list(se.get_type_levels(
+            OrderedDict((name, self.object_types[name]) for name in self.selectors)))))
+        self.summary = OrderedDict([('selected', 0), ('deleted', 0), ('failed', 0), ('pruned_collections', 0),
+                                    ('types', OrderedDict((name, 0) for name in self.deletes))])
+        self.failures = []
+
+    @staticmethod
+    def _depth(object_type):
+        depth = 0
+        while object_type.parent and object_type.parent != 'vpn':
+            depth += 1
+            object_type = so.get_object_type(object_type.parent)
+        return depth
+
+    def _is_purgeable(self, object_type, name):
+        if _is_system_object(name) and not self.include_system_objects:
+            return False
+        return not (object_type.name in _DEFAULT_OBJECT_TYPES and name == _DEFAULT_OBJECT_NAME)
+
+    async def _list(self, session, object_type, args, query):
+        ok, items = await session.execute_get_list(object_type.collection_path(args), query)
+        if not ok:
+            self.failures.append(dict(type=object_type.name, args=args, error=items))
+            return []
+        return [(object_type.get_item_args(args, item), item[object_type.lookup_key]) for item in items]
+
+    async def _select(self, session):
+        vpn_type = so.get_object_type('vpn')
+        # type name -> the (args, name) of its objects which are not deleted, i.e. whose children are listed
+        parents = dict(vpn=[(dict(msg_vpn=self.msg_vpn), self.msg_vpn)])
+        for object_type in self.object_types.values():
+            parent_type = vpn_type if object_type.parent == 'vpn' else self.object_types[object_type.parent]
+            parent_instances = parents.get(object_type.parent, [])
+            if object_type.parent in self.selectors:
+                # the rest of the parent's children are deleted with it
+                self.summary['pruned_collections'] += len(self.deletes[object_type.parent])
+            child_args = [parent_args if object_type.parent == 'vpn' else parent_type.derive_child_args(parent_args, parent_name)
+                          for parent_args, parent_name in parent_instances]
+            selected = self.deletes.get(object_type.name)
+            if selected is not None:
+                reads = [self._list(session, object_type, args, query)
+                         for args in child_args for selector in self.selectors[object_type.name] for query in selector.compose_queries()]
+                for objects in await asyncio.gather(*reads):
+                    for args, name in objects:
+                        if self._is_purgeable(object_type, name):
+                            selected.setdefault(object_type.get_key(args, name), (args, name))
+            if any(t.parent == object_type.name for t in self.object_types.values()):
+                # all objects of the type: the children of the ones not deleted are listed next
+                query = "count={}&select={}".format(LIST_PAGE_SIZE, ','.join(sorted(object_type.get_identity_keys())))
+                reads = [self._list(session, object_type, args, query) for args in child_args]
+                kept = []
+                for objects in await asyncio.gather(*reads):
+                    kept.extend((args, name) for args, name in objects if object_type.get_key(args, name) not in (selected or {}))
+                parents[object_type.name] = kept
+
+    async def _delete(self, session, object_type, args, name):
+        ok, resp = await session.make_delete_request(object_type.item_path(args, name))
+        if ok:
+            self.summary['deleted'] += 1
+        else:
+            self.summary['failed'] += 1
+            self.failures.append(dict(type=object_type.name, args=OrderedDict((arg, args[arg]) for arg in object_type.args),
+                                      name=name, error=resp))
+
+    async def _purge(self):
+        async with sa.SolaceAsyncSession(self.solace_config, self.max_workers) as session:
+            await self._select(session)
+            for type_name, selected in self.deletes.items():
+                self.summary['types'][type_name] = len(selected)
+                self.summary['selected'] += len(selected)
+            if self.failures or self.dry_run:
+                # an incomplete listing could prune wrongly: nothing is deleted
+                return
+            for type_name, selected in self.deletes.items():
+                object_type = self.object_types[type_name]
+                await asyncio.gather(*[self._delete(session, object_type, args, name) for args, name in selected.values()])
+
+    def purge(self):
+        """Lists the selected objects & deletes them unless dry_run. returns (summary, failures)."""
+        sa.run(self._purge())
+        return self.summary, self.failures
+
+    def get_selected(self):
+        """Returns the selected objects: list of type, args & name, in deletion order."""
+        objects = []
+        for type_name, selected in self.deletes.items():
+            object_type = self.object_types[type_name]
+            for args, name in selected.values():
+                objects.append(OrderedDict([('type', type_name), ('args', OrderedDict((arg, args[arg]) for arg in object_type.args)),
+                                            ('name', name)]))
+        return objects
+
+###
+# The End.
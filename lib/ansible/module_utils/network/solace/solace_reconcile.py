@@ -0,0 +1,155 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+"""Reconciles the members of a child collection with a desired set.
+
+E.g. the subscriptions of a queue or the topic exceptions of an acl profile: the current members
+are read with one paged list call, the missing ones are added and the extra ones removed concurrently.
+"""
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_async as sa
+import asyncio
+from collections import OrderedDict
+
+DEFAULT_MAX_WORKERS = 10
+
+# max page size of SEMP v2 lists
+LIST_PAGE_SIZE = 100
+
+OPERATION_ADD = 'add'
+OPERATION_REMOVE = 'remove'
+
+
+def normalize_members(members, settings=None, is_solace_cloud=False):
+    """Returns an OrderedDict: member name -> settings.
+
+    members: list of names or dicts with 'name' and optional 'settings'.
+    settings: default settings of members without their own.
+    is_solace_cloud: settings are converted for the Solace Cloud API instead of SEMP, see solace_common.type_conversion().
+    """
+    normalized = OrderedDict()
+    for member in members:
+        if isinstance(member, dict):
+            if 'name' not in member:
+                raise ValueError("member without 'name': {}".format(member))
+            name = member['name']
+            member_settings = member.get('settings', settings)
+        else:
+            name = member
+            member_settings = settings
+        if not isinstance(name, str) or name == '':
+            raise ValueError("invalid member name: '{}'".format(name))
+        if name in normalized:
+            raise ValueError("duplicate member: '{}'".format(name))
+        if member_settings:
+            # jinja treats everything as a string, so cast ints and floats.
+            # copy: the default settings are shared by many members
+            member_settings = sc.type_conversion(dict(member_settings), is_solace_cloud)
+        normalized[name] = member_settings
+    return normalized
+
+
+class SolaceCollectionReconciler(object):
+    """Reconciles the members of one parent's collection, e.g. the subscriptions of a queue.
+
+    object_type: the members' solace_objects.SolaceObjectType.
+    args: the parent keys of the object type, e.g. dict(msg_vpn='vpn-1', queue='q-1').
+    """
+
+    def __init__(self, solace_config, object_type, args, max_workers=DEFAULT_MAX_WORKERS):
+        self.solace_config = solace_config
+        self.object_type = object_type
+        self.args = args
+        self.max_workers = max_workers
+        self._parent_values = object_type.get_parent_values(args)
+
+    def _is_member(self, item):
+        # list results may include other members of the collection, e.g. topic exceptions with another syntax
+        return all(item.get(key) == value for key, value in self._parent_values.items())
+
+    async def get_members(self, session):
+        # returns (ok, list of member names or the error)
+        select = [self.object_type.lookup_key] + list(self._parent_values.keys())
+        query = "count={}&select={}".format(LIST_PAGE_SIZE, ','.join(select))
+        ok, items = await session.execute_get_list(self.object_type.collection_path(self.args), query)
+        if not ok:
+            return False, items
+        return True, [item[self.object_type.lookup_key] for item in items if self._is_member(item)]
+
+    async def _add(self, session, name, settings):
+        body = self.object_type.create_body(self.args, name, settings)
+        ok, resp = await session.make_post_request(self.object_type.collection_path(self.args), body)
+        return OPERATION_ADD, name, ok, resp
+
+    async def _remove(self, session, name):
+        ok, resp = await session.make_delete_request(self.object_type.item_path(self.args, name))
+        return OPERATION_REMOVE, name, ok, resp
+
+    async def _reconcile(self, members, state, exact, check_mode):
+        result = dict(added=[], removed=[], failures=[])
+        async with sa.SolaceAsyncSession(self.solace_config, self.max_workers) as session:
+            ok, current = await self.get_members(session)
+            if not ok:
+                return False, dict(result, error=current)
+            if state == 'present':
+                current_set = set(current)
+                to_add = [name for name in members if name not in current_set]
+                to_remove = [name for name in current if name not in members] if exact else []
+            else:
+                to_add = []
+                to_remove = [name for name in current if name in members]
+            result['summary'] = dict(current=len(current), desired=len(members) if state == 'present' else 0,
+                                     added=len(to_add), removed=len(to_remove), failed=0)
+            if check_mode:
+                result['added'] = to_add
+                result['removed'] = to_remove
+                return True, result
+            coros = [self._add(session, name, members[name]) for name in to_add]
+            coros += [self._remove(session, name) for name in to_remove]
+            outcomes = await asyncio.gather(*coros)
+
+        for operation, name, ok, resp in outcomes:
+            if not ok:
+                result['failures'].append(dict(name=name, operation=operation, error=resp))
+            elif operation == OPERATION_ADD:
+                result['added'].append(name)
+            else:
+                result['removed'].append(name)
+        result['summary'].update(added=len(result['added']), removed=len(result['removed']), failed=len(result['failures']))
+        return len(result['failures']) == 0, result
+
+    def reconcile(self, members, state='present', exact=True, check_mode=False):
+        """Returns (ok, result): result with summary, added, removed & failures.
+
+        members: OrderedDict member name -> settings, see normalize_members().
+        state=present: adds the missing members, exact=True also removes all others.
+        state=absent: removes the given members.
+        """
+        return sa.run(self._reconcile(members, state, exact, check_mode))
+
+###
+# The End.
@@ -0,0 +1,282 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+"""Optional local state store shared by the solace_* modules."""
+
+import traceback
+import logging
+import json
+import hashlib
+import hmac
+import os
+import time
+import threading
+import atexit
+HAS_IMPORT_ERROR = False
+IMPORT_ERR_TRACEBACK = None
+try:
+    import sqlite3
+except ImportError:
+    HAS_IMPORT_ERROR = True
+    IMPORT_ERR_TRACEBACK = traceback.format_exc()
+
+################################################################################################
+# configuration
+#
+# ANSIBLE_SOLACE_STATE_STORE: path to the sqlite file. not set or empty: store is disabled.
+# ANSIBLE_SOLACE_STATE_STORE_MARKER_TTL: seconds a broker config marker is trusted without
+#   asking the broker again. default: 0, i.e. the marker is checked by every task.
+# ANSIBLE_SOLACE_STATE_STORE_SEMP_VERSION_TTL: seconds a broker's SEMP version is trusted without
+#   asking the broker again. default: 3600.
+
+STATE_STORE_PATH = os.getenv('ANSIBLE_SOLACE_STATE_STORE')
+_markerTtlEnvVal = os.getenv('ANSIBLE_SOLACE_STATE_STORE_MARKER_TTL')
+STATE_STORE_MARKER_TTL = 0
+if _markerTtlEnvVal is not None and _markerTtlEnvVal != '':
+    try:
+        STATE_STORE_MARKER_TTL = float(_markerTtlEnvVal)
+    except ValueError:
+        raise ValueError("failed: invalid value for env var: 'ANSIBLE_SOLACE_STATE_STORE_MARKER_TTL={}'. use a number of seconds instead.".format(_markerTtlEnvVal))
+
+_sempVersionTtlEnvVal = os.getenv('ANSIBLE_SOLACE_STATE_STORE_SEMP_VERSION_TTL')
+STATE_STORE_SEMP_VERSION_TTL = 3600
+if _sempVersionTtlEnvVal is not None and _sempVersionTtlEnvVal != '':
+    try:
+        STATE_STORE_SEMP_VERSION_TTL = float(_sempVersionTtlEnvVal)
+    except ValueError:
+        raise ValueError("failed: invalid value for env var: 'ANSIBLE_SOLACE_STATE_STORE_SEMP_VERSION_TTL={}'. use a number of seconds instead.".format(_sempVersionTtlEnvVal))
+
+# seconds to wait for a lock held by a parallel ansible fork
+_SQLITE_TIMEOUT = 30
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS markers (
+        broker TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        marker TEXT NOT NULL,
+        checked_at REAL NOT NULL,
+        PRIMARY KEY (broker, scope))''',
+    '''CREATE TABLE IF NOT EXISTS objects (
+        broker TEXT NOT NULL,
+        scope TEXT NOT NULL,
+        uri TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        applied_at REAL NOT NULL,
+        response TEXT,
+        PRIMARY KEY (broker, uri))''',
+    '''CREATE INDEX IF NOT EXISTS objects_scope ON objects (broker, scope)''',
+    '''CREATE TABLE IF NOT EXISTS broker_info (
+        broker TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (broker, key))''',
+    '''CREATE TABLE IF NOT EXISTS fingerprints (
+        broker TEXT NOT NULL,
+        uri TEXT NOT NULL,
+        key TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        applied_at REAL NOT NULL,
+        PRIMARY KEY (broker, uri, key))''',
+    '''CREATE TABLE IF NOT EXISTS meta (
+        key TEXT NOT NULL PRIMARY KEY,
+        value TEXT NOT NULL)'''
+]
+
+
+# columns added after a store file may have been created: (table, column, type)
+_MIGRATIONS = [
+    ('objects', 'response', 'TEXT')
+]
+
+
+def is_enabled():
+    return (not HAS_IMPORT_ERROR) and STATE_STORE_PATH is not None and STATE_STORE_PATH != ''
+
+
+def get_broker_id(solace_config):
+    # one broker can be reached through several virtual routers / proxies
+    broker_id = solace_config.vmr_url
+    if solace_config.x_broker:
+        broker_id += '#' + solace_config.x_broker
+    return broker_id
+
+
+def compute_digest(data):
+    # canonical json: key order and whitespace must not change the digest
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class SolaceStateStore(object):
+    """The state store: one sqlite connection, shared by all tasks of a process.
+
+    Tasks of a bulk operation run in worker threads, so every statement runs under one lock.
+    """
+
+    def __init__(self, path, marker_ttl=0):
+        self.path = path
+        self.marker_ttl = float(marker_ttl)
+        self._conn = None
+        self._salt = None
+        self._lock = threading.RLock()
+        return
+
+    def _connect(self):
+        if self._conn is None:
+            store_dir = os.path.dirname(os.path.abspath(self.path))
+            if not os.path.isdir(store_dir):
+                os.makedirs(store_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=_SQLITE_TIMEOUT, isolation_level=None, check_same_thread=False)
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            for table, column, column_type in _MIGRATIONS:
+                columns = [row[1] for row in self._conn.execute('PRAGMA table_info({})'.format(table))]
+                if column not in columns:
+                    self._conn.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(table, column, column_type))
+        return self._conn
+
+    def _execute(self, stmt, params=()):
+        with self._lock:
+            self._connect().execute(stmt, params)
+
+    def _fetchone(self, stmt, params=()):
+        with self._lock:
+            return self._connect().execute(stmt, params).fetchone()
+
+    def _fetchall(self, stmt, params=()):
+        with self._lock:
+            return self._connect().execute(stmt, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_marker(self, broker, scope):
+        row = self._fetchone(
+            'SELECT marker, checked_at FROM markers WHERE broker=? AND scope=?', (broker, scope))
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
+    def set_marker(self, broker, scope, marker):
+        self._execute(
+            'INSERT OR REPLACE INTO markers (broker, scope, marker, checked_at) VALUES (?, ?, ?, ?)',
+            (broker, scope, marker, time.time()))
+
+    def is_marker_fresh(self, checked_at):
+        if checked_at is None or self.marker_ttl <= 0:
+            return False
+        return (time.time() - checked_at) < self.marker_ttl
+
+    def invalidate(self, broker, scope):
+        logging.debug("state store: invalidating broker='%s', scope='%s'", broker, scope)
+        self._execute('DELETE FROM objects WHERE broker=? AND scope=?', (broker, scope))
+
+    def get_digest(self, broker, uri):
+        digest, _response = self.get_object(broker, uri)
+        return digest
+
+    def get_object(self, broker, uri):
+        # returns (digest, response), (None, None) if not stored
+        row = self._fetchone(
+            'SELECT digest, response FROM objects WHERE broker=? AND uri=?', (broker, uri))
+        if row is None:
+            return None, None
+        return row[0], (json.loads(row[1]) if row[1] is not None else None)
+
+    def set_digest(self, broker, scope, uri, digest, response=None):
+        # response: the module's response for the object, returned by the fast path
+        self._execute(
+            'INSERT OR REPLACE INTO objects (broker, scope, uri, digest, applied_at, response) VALUES (?, ?, ?, ?, ?, ?)',
+            (broker, scope, uri, digest, time.time(), json.dumps(response, default=str) if response is not None else None))
+
+    def delete_digest(self, broker, uri):
+        self._execute('DELETE FROM objects WHERE broker=? AND uri=?', (broker, uri))
+
+    def get_broker_info(self, broker, key, ttl):
+        # returns None if not stored or older than ttl seconds
+        row = self._fetchone(
+            'SELECT value, updated_at FROM broker_info WHERE broker=? AND key=?', (broker, key))
+        if row is None or (time.time() - row[1]) >= ttl:
+            return None
+        return row[0]
+
+    def set_broker_info(self, broker, key, value):
+        self._execute(
+            'INSERT OR REPLACE INTO broker_info (broker, key, value, updated_at) VALUES (?, ?, ?, ?)',
+            (broker, key, value, time.time()))
+
+    # fingerprints of write-only values, e.g. passwords, which the broker never returns.
+    # only a salted hmac of the value is stored, never the value itself.
+
+    def _get_salt(self):
+        if self._salt is None:
+            # a parallel fork may create the salt first: first one wins
+            self._execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('fingerprint_salt', ?)", (os.urandom(32).hex(),))
+            row = self._fetchone("SELECT value FROM meta WHERE key='fingerprint_salt'")
+            self._salt = bytes.fromhex(row[0])
+        return self._salt
+
+    def compute_fingerprint(self, value):
+        canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+        return hmac.new(self._get_salt(), canonical.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def get_fingerprints(self, broker, uri):
+        rows = self._fetchall(
+            'SELECT key, fingerprint FROM fingerprints WHERE broker=? AND uri=?', (broker, uri))
+        return dict(rows)
+
+    def set_fingerprints(self, broker, uri, values):
+        now = time.time()
+        rows = [(broker, uri, key, self.compute_fingerprint(value), now) for key, value in values.items()]
+        with self._lock:
+            self._connect().executemany(
+                'INSERT OR REPLACE INTO fingerprints (broker, uri, key, fingerprint, applied_at) VALUES (?, ?, ?, ?, ?)', rows)
+
+    def delete_fingerprints(self, broker, uri):
+        self._execute('DELETE FROM fingerprints WHERE broker=? AND uri=?', (broker, uri))
+
+
+_STATE_STORE = None
+_STATE_STORE_LOCK = threading.Lock()
+
+
+def get_state_store():
+    # one store per process: bulk operations create thousands of tasks
+    global _STATE_STORE
+    if not is_enabled():
+        return None
+    with _STATE_STORE_LOCK:
+        if _STATE_STORE is None:
+            _STATE_STORE = SolaceStateStore(STATE_STORE_PATH, STATE_STORE_MARKER_TTL)
+            atexit.register(_STATE_STORE.close)
+    return _STATE_STORE
+
+###
+# The End.
@@ -0,0 +1,217 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+"""Local topic matching: which subscriptions / topic exceptions match a topic.
+
+SMF syntax: levels separated by '/'. '*' as a whole level matches exactly one level,
+'abc*' at the end of a level matches any level starting with 'abc', '>' as the last level
+matches one or more levels. '*' anywhere else and '>' not as the last level are literals.
+MQTT topic filters are translated to SMF: '+' -> '*', 'a/#' -> 'a' & 'a/>'.
+"""
+
+SYNTAX_SMF = 'smf'
+SYNTAX_MQTT = 'mqtt'
+
+# max number of topics whose matches are cached per trie
+MATCH_CACHE_SIZE = 100000
+
+
+def mqtt_to_smf(topic_filter):
+    """Returns the SMF subscriptions equivalent to an MQTT topic filter, e.g. 'a/+/#' -> ['a/*', 'a/*/>']."""
+    levels = topic_filter.split('/')
+    smf_levels = ['*' if level == '+' else level for level in levels]
+    if levels[-1] != '#':
+        return ['/'.join(smf_levels)]
+    if len(levels) == 1:
+        return ['>']
+    # '#' also matches the parent level
+    parent = '/'.join(smf_levels[:-1])
+    return [parent, parent + '/>']
+
+
+def to_smf(subscription, syntax=SYNTAX_SMF):
+    if syntax == SYNTAX_SMF:
+        return [subscription]
+    if syntax == SYNTAX_MQTT:
+        return mqtt_to_smf(subscription)
+    raise ValueError("unknown topic syntax: '{}'. valid: {}, {}".format(syntax, SYNTAX_SMF, SYNTAX_MQTT))
+
+
+class _Node(object):
+    __slots__ = ('children', 'star', 'prefixes', 'gt_values', 'values')
+
+    def __init__(self):
+        self.children = {}
+        # child for a '*' level
+        self.star = None
+        # prefix -> child, for 'abc*' levels
+        self.prefixes = {}
+        # values of subscriptions ending with '>' at this node
+        self.gt_values = []
+        # values of subscriptions ending at this node
+        self.values = []
+
+
+class SolaceTopicTrie(object):
+    """Trie of SMF subscriptions, each with a value, e.g. the queue or topic exception it came from.
+
+    Usage:
+        trie = SolaceTopicTrie()
+        trie.add('orders/*/created', 'q-orders')
+        trie.add('orders/#', 'mqtt-session-1', syntax='mqtt')
+        trie.match('orders/eu/created')  # ['q-orders', 'mqtt-session-1']
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+        self._cache = {}
+
+    def __len__(self):
+        return self._size
+
+    def add(self, subscription, value, syntax=SYNTAX_SMF):
+        for smf_subscription in to_smf(subscription, syntax):
+            self._add(smf_subscription, value)
+        self._cache.clear()
+
+    def _add(self, subscription, value):
+        node = self._root
+        levels = subscription.split('/')
+        last = len(levels) - 1
+        for i, level in enumerate(levels):
+            if i == last and level == '>':
+                node.gt_values.append(value)
+                self._size += 1
+                return
+            if level == '*':
+                if node.star is None:
+                    node.star = _Node()
+                node = node.star
+            elif level.endswith('*'):
+                node = node.prefixes.setdefault(level[:-1], _Node())
+            else:
+                child = node.children.get(level)
+                if child is None:
+                    child = node.children[level] = _Node()
+                node = child
+        node.values.append(value)
+        self._size += 1
+
+    def match(self, topic):
+        """Returns the values of all subscriptions matching the topic, a list, may contain duplicates if added twice."""
+        cached = self._cache.get(topic)
+        if cached is not None:
+            return cached
+        levels = topic.split('/')
+        n = len(levels)
+        result = []
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            if i == n:
+                result.extend(node.values)
+                continue
+            # '>' matches the remaining levels, at least one is left
+            result.extend(node.gt_values)
+            level = levels[i]
+            child = node.children.get(level)
+            if child is not None:
+                stack.append((child, i + 1))
+            if node.star is not None:
+                stack.append((node.star, i + 1))
+            for prefix, child in node.prefixes.items():
+                if level.startswith(prefix):
+                    stack.append((child, i + 1))
+        if len(self._cache) >= MATCH_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[topic] = result
+        return result
+
+    def matches(self, topic):
+        return len(self.match(topic)) > 0
+
+    def covering(self, subscription):
+        """Returns the values of all subscriptions covering an SMF subscription, incl. itself if added.
+
+        a subscription covers another if it matches every topic the other one matches, e.g. 'a/>' covers 'a/b/*'.
+        """
+        levels = subscription.split('/')
+        n = len(levels)
+        result = []
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            if i == n:
+                result.extend(node.values)
+                continue
+            level = levels[i]
+            # only '>' covers '>'. otherwise '>' covers the remaining levels, at least one is left
+            result.extend(node.gt_values)
+            if i == n - 1 and level == '>':
+                continue
+            if level == '*':
+                if node.star is not None:
+                    stack.append((node.star, i + 1))
+                continue
+            # literal or 'prefix*' level: covered by the same literal, '*' & shorter or equal prefixes
+            if not level.endswith('*'):
+                child = node.children.get(level)
+                if child is not None:
+                    stack.append((child, i + 1))
+            if node.star is not None:
+                stack.append((node.star, i + 1))
+            level_prefix = level[:-1] if level.endswith('*') else level
+            for prefix, child in node.prefixes.items():
+                if level_prefix.startswith(prefix):
+                    stack.append((child, i + 1))
+        return result
+
+
+def find_redundant_subscriptions(subscriptions):
+    """Returns a dict: redundant subscription -> a subscription covering it.
+
+    all others form the minimal covering set: they match the same topics as all subscriptions together.
+    """
+    trie = SolaceTopicTrie()
+    for subscription in subscriptions:
+        trie.add(subscription, subscription)
+    covered_by = dict()
+    for subscription in subscriptions:
+        covering = [other for other in trie.covering(subscription) if other != subscription]
+        # of two subscriptions covering each other, the smaller one is kept
+        covering = [other for other in covering if subscription not in trie.covering(other) or other < subscription]
+        if covering:
+            covered_by[subscription] = covering
+    # covering is transitive: each redundant subscription is also covered by one that is kept
+    redundant = dict()
+    for subscription, covering in covered_by.items():
+        kept = [other for other in covering if other not in covered_by]
+        redundant[subscription] = min(kept, key=lambda other: (len(other), other))
+    return redundant
+
+###
+# The End.
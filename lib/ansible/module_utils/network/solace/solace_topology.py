@@ -0,0 +1,266 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+"""Multi-broker topologies: bridges between two brokers & dmr clusters meshed across many brokers.
+
+Each broker gets its own plan of the objects of its side: bridge, remote vpn, remote subscriptions & trusted common names,
+or dmr cluster, links, link remote addresses & link trusted common names. The plans of all brokers run concurrently,
+each in dependency order. Then the links are awaited on all brokers, see solace_monitor.SolaceMonitorWaiter.
+A side refers to the other side by its router name, e.g. 'v:broker-b' as the remote vpn location, read with SEMP v1
+unless given.
+"""
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_plan as sp
+import ansible.module_utils.network.solace.solace_monitor as sm
+import traceback
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+HAS_IMPORT_ERROR = False
+IMPORT_ERR_TRACEBACK = None
+try:
+    import requests
+except ImportError:
+    HAS_IMPORT_ERROR = True
+    IMPORT_ERR_TRACEBACK = traceback.format_exc()
+
+DEFAULT_MAX_WORKERS = 10
+DEFAULT_WAIT_TIMEOUT = 120
+
+# a topology is meant to come up: enabled unless the settings say otherwise
+BRIDGE_DEFAULTS = {'enabled': True}
+BRIDGE_REMOTE_VPN_DEFAULTS = {'enabled': True}
+DMR_CLUSTER_LINK_DEFAULTS = {'enabled': True}
+
+# monitor attributes awaited per link
+BRIDGE_REMOTE_VPN_UP = {'up': True}
+DMR_CLUSTER_LINK_UP = {'up': True}
+
+def get_router_name(solace_config):
+    """Returns (ok, the broker's router name or the error), read with SEMP v1."""
+    try:
+        ok, resp = sc.make_sempv1_post_request(solace_config, "<rpc><show><router-name></router-name></show></rpc>")
+    except (sc.AnsibleError, requests.exceptions.RequestException) as e:
+        return False, str(e)
+    if not ok:
+        return False, resp
+    return True, resp['rpc-reply']['rpc']['show']['router-name']['router-name']
+
+
+def _items(items):
+    # plain strings are names, e.g. remote subscription topics
+    return [item if isinstance(item, dict) else dict(name=item) for item in (items or [])]
+
+
+class SolaceTopologyBroker(object):
+
+    def __init__(self, name, params, check_mode=False):
+        self.name = name
+        # stands in for the calling module in so.create_object_task()
+        self.module = so.SolaceTaskModule('solace_topology', params, check_mode)
+        self.solace_config = su.SolaceConfig(
+            vmr_host=params['host'],
+            vmr_port=params['port'],
+            vmr_auth=(params['username'], params['password']),
+            vmr_secure=params['secure_connection'],
+            vmr_timeout=params['timeout'],
+            x_broker=params['x_broker']
+        )
+        self.plan = sp.SolacePlan()
+        self.router_name = None
+        # (monitor path, expected attributes, label) of the links awaited on this broker
+        self.waits = []
+
+
+class SolaceTopology(object):
+    """Builds & applies the per broker plans of bridges & dmr clusters.
+
+    Usage:
+        topology = SolaceTopology(brokers, bridges, dmr_clusters)
+        topology.build()
+        results = topology.apply()
+        converged, waiters = topology.wait(timeout)
+    """
+
+    def __init__(self, brokers, bridges=None, dmr_clusters=None, state='present', max_workers=DEFAULT_MAX_WORKERS):
+        # brokers: OrderedDict name -> SolaceTopologyBroker
+        self.brokers = brokers
+        self.bridges = bridges or []
+        self.dmr_clusters = dmr_clusters or []
+        self.state = state
+        self.max_workers = max_workers
+        self.failures = []
+
+    def _get_broker(self, name, context):
+        if name not in self.brokers:
+            raise ValueError("{}: unknown broker '{}'. brokers: {}".format(context, name, ', '.join(self.brokers)))
+        return self.brokers[name]
+
+    def _validate(self):
+        for bridge in self.bridges:
+            endpoints = bridge.get('endpoints') or []
+            if len(endpoints) != 2:
+                raise ValueError("bridge '{}': exactly 2 endpoints required, got: {}".format(bridge['name'], len(endpoints)))
+            for endpoint in endpoints:
+                self._get_broker(endpoint['broker'], "bridge '{}'".format(bridge['name']))
+            if (endpoints[0]['broker'], endpoints[0]['msg_vpn']) == (endpoints[1]['broker'], endpoints[1]['msg_vpn']):
+                raise ValueError("bridge '{}': both endpoints are the same msg vpn".format(bridge['name']))
+        for cluster in self.dmr_clusters:
+            nodes = cluster.get('nodes') or []
+            if len(nodes) < 2:
+                raise ValueError("dmr cluster '{}': at least 2 nodes required, got: {}".format(cluster['name'], len(nodes)))
+            names = [node['broker'] for node in nodes]
+            if len(set(names)) != len(names):
+                raise ValueError("dmr cluster '{}': a broker is listed more than once".format(cluster['name']))
+            for node in nodes:
+                self._get_broker(node['broker'], "dmr cluster '{}'".format(cluster['name']))
+                if self.state == 'present' and not node.get('remote_address'):
+                    raise ValueError("dmr cluster '{}': missing remote_address of node '{}'".format(cluster['name'], node['broker']))
+
+    def _required_router_names(self):
+        names = set()
+        if self.state != 'present':
+            return names
+        for bridge in self.bridges:
+            for endpoint in bridge['endpoints']:
+                if not endpoint.get('remote_vpn_location'):
+                    # the location of this side's remote vpn is the other side's router
+                    names.update(e['broker'] for e in bridge['endpoints'] if e is not endpoint)
+        for cluster in self.dmr_clusters:
+            names.update(node['broker'] for node in cluster['nodes'] if not node.get('node_name'))
+        return names
+
+    def resolve_router_names(self):
+        names = [name for name in self.brokers if name in self._required_router_names()]
+        if not names:
+            return
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            resolved = list(executor.map(lambda name: get_router_name(self.brokers[name].solace_config), names))
+        for name, (ok, resp) in zip(names, resolved):
+            if ok:
+                self.brokers[name].router_name = resp
+            else:
+                self.failures.append(dict(broker=name, operation='get router name', error=resp))
+
+    def _add_bridge_side(self, bridge, endpoint, remote):
+        broker = self.brokers[endpoint['broker']]
+        bridge_type = so.get_object_type('bridge')
+        args = dict(msg_vpn=endpoint['msg_vpn'], virtual_router=bridge.get('virtual_router') or 'auto')
+        if self.state != 'present':
+            broker.plan.add_node(sp.SolacePlanNode(bridge_type, args, bridge['name']))
+            return
+        settings = su.merge_dicts(BRIDGE_DEFAULTS, bridge.get('settings'), endpoint.get('settings'))
+        bridge_node = broker.plan.add_node(sp.SolacePlanNode(bridge_type, args, bridge['name'], settings))
+        child_args = bridge_type.derive_child_args(args, bridge['name'])
+        location = endpoint.get('remote_vpn_location') or 'v:' + self.brokers[remote['broker']].router_name
+        remote_vpn_args = dict(child_args, remote_vpn_location=location, remote_vpn_interface=endpoint.get('remote_vpn_interface'))
+        remote_vpn_settings = su.merge_dicts(BRIDGE_REMOTE_VPN_DEFAULTS, bridge.get('remote_vpn_settings'), endpoint.get('remote_vpn_settings'))
+        remote_vpn_type = so.get_object_type('bridge_remote_vpn')
+        broker.plan.add_node(sp.SolacePlanNode(remote_vpn_type, remote_vpn_args, remote['msg_vpn'], remote_vpn_settings), bridge_node)
+        for type_name, key in [('bridge_remote_subscription', 'remote_subscriptions'), ('bridge_tls_cn', 'tls_trusted_common_names')]:
+            for item in _items(bridge.get(key)) + _items(endpoint.get(key)):
+                broker.plan.add_node(sp.SolacePlanNode(so.get_object_type(type_name), child_args, item['name'], item.get('settings')), bridge_node)
+        broker.waits.append((sm.get_monitor_path(remote_vpn_type, remote_vpn_args, remote['msg_vpn']), BRIDGE_REMOTE_VPN_UP,
+                             "bridge {}: {} -> {}".format(bridge['name'], endpoint['broker'], remote['broker'])))
+
+    def _add_dmr_node(self, cluster, node):
+        broker = self.brokers[node['broker']]
+        cluster_type = so.get_object_type('dmr_cluster')
+        if self.state != 'present':
+            broker.plan.add_node(sp.SolacePlanNode(cluster_type, {}, cluster['name']))
+            return
+        settings = su.merge_dicts(cluster_type.defaults, cluster.get('settings'), node.get('settings'))
+        cluster_node = broker.plan.add_node(sp.SolacePlanNode(cluster_type, {}, cluster['name'], settings))
+        link_args = cluster_type.derive_child_args({}, cluster['name'])
+        link_type = so.get_object_type('dmr_cluster_link')
+        for remote in cluster['nodes']:
+            if remote is node:
+                continue
+            remote_node_name = remote.get('node_name') or self.brokers[remote['broker']].router_name
+            link_settings = su.merge_dicts(DMR_CLUSTER_LINK_DEFAULTS, cluster.get('link_settings'), node.get('link_settings'))
+            link_node = broker.plan.add_node(sp.SolacePlanNode(link_type, link_args, remote_node_name, link_settings), cluster_node)
+            child_args = link_type.derive_child_args(link_args, remote_node_name)
+            broker.plan.add_node(sp.SolacePlanNode(so.get_object_type('dmr_cluster_link_remote_address'), child_args,
+                                                   remote['remote_address']), link_node)
+            for item in _items(cluster.get('link_trusted_common_names')):
+                broker.plan.add_node(sp.SolacePlanNode(so.get_object_type('dmr_cluster_link_trusted_cn'), child_args,
+                                                       item['name'], item.get('settings')), link_node)
+            broker.waits.append((sm.get_monitor_path(link_type, link_args, remote_node_name), DMR_CLUSTER_LINK_UP,
+                                 "dmr cluster {}: {} -> {}".format(cluster['name'], node['broker'], remote['broker'])))
+
+    def build(self):
+        """Validates the topology & builds the plans. returns False if a router name could not be read, see self.failures."""
+        self._validate()
+        self.resolve_router_names()
+        if self.failures:
+            return False
+        for bridge in self.bridges:
+            first, second = bridge['endpoints']
+            self._add_bridge_side(bridge, first, second)
+            self._add_bridge_side(bridge, second, first)
+        for cluster in self.dmr_clusters:
+            for node in cluster['nodes']:
+                self._add_dmr_node(cluster, node)
+        return True
+
+    def _apply_broker(self, broker):
+        def apply_node(node):
+            task = so.create_object_task(broker.module, node.object_type, node.args, node.name, node.settings, self.state)
+            return task.do_task()
+        logging.debug("topology: applying %d object(s) on broker '%s'", len(broker.plan.nodes), broker.name)
+        return broker.plan.execute(apply_node, self.max_workers, reverse=(self.state == 'absent'))
+
+    def apply(self):
+        """Applies the plans of all brokers concurrently. returns OrderedDict broker name -> plan results."""
+        brokers = [broker for broker in self.brokers.values() if broker.plan.nodes]
+        if not brokers:
+            return OrderedDict()
+        with ThreadPoolExecutor(max_workers=len(brokers)) as executor:
+            results = list(executor.map(self._apply_broker, brokers))
+        return OrderedDict((broker.name, result) for broker, result in zip(brokers, results))
+
+    def wait(self, timeout):
+        """Awaits the links on all brokers concurrently, against one deadline. returns (converged, list of (broker name, waiter))."""
+        waiters = []
+        for broker in self.brokers.values():
+            if not broker.waits:
+                continue
+            waiter = sm.SolaceMonitorWaiter(broker.solace_config, timeout)
+            for path_array, attributes, label in broker.waits:
+                waiter.add(path_array, attributes, label=label)
+            waiters.append((broker.name, waiter))
+        if not waiters:
+            return True, waiters
+        with ThreadPoolExecutor(max_workers=len(waiters)) as executor:
+            converged = list(executor.map(lambda item: item[1].run(), waiters))
+        return all(converged), waiters
+
+###
+# The End.
@@ -33,6 +33,9 @@ import logging
 import json
 import time
 import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_state as ss
+import ansible.module_utils.network.solace.solace_journal as sj
+import ansible.module_utils.network.solace.solace_aggregate as sg
 HAS_IMPORT_ERROR = False
 IMPORT_ERR_TRACEBACK = None
 try:
@@ -52,10 +55,23 @@ DEFAULT_WHITELIST_KEYS = ['password']
 SOLACE_CLOUD_API_SERVICES_BASE_PATH = 'https://api.solace.cloud/api/v0/services'
 SOLACE_CLOUD_REQUESTS = 'requests'
 SOLACE_CLOUD_CLIENT_PROFILE_REQUESTS = 'clientProfileRequests'
+# long running Solace Cloud requests: status polled every DELAY seconds, at most RETRIES times
+SOLACE_CLOUD_REQUEST_POLL_RETRIES = 12
+SOLACE_CLOUD_REQUEST_POLL_DELAY = 5
+SOLACE_CLOUD_CLIENT_PROFILE_DEFAULTS = {
+    'allowTransactedSessionsEnabled': False,
+    'allowBridgeConnectionsEnabled': False,
+    'allowGuaranteedEndpointCreateEnabled': False,
+    'allowSharedSubscriptionsEnabled': False,
+    'allowGuaranteedMsgSendEnabled': False,
+    'allowGuaranteedMsgReceiveEnabled': False,
+    'elidingEnabled': False
+}
 
 """ Standard resources """
 SEMP_V2_CONFIG = '/SEMP/v2/config'
 SEMP_V2_MONITOR = '/SEMP/v2/monitor'
+SEMP_V2_ACTION = '/SEMP/v2/action'
 
 """ VPN level reources """
 
@@ -144,6 +160,15 @@ class SolaceTask:
             vmr_sempVersion=self.module.params.get('semp_version', ''),
             solace_cloud_config=solace_cloud_config
         )
+        # ansible_connection=httpapi: broker url & credentials come from the connection
+        socket_path = getattr(self.module, '_socket_path', None)
+        if socket_path and solace_cloud_config is None:
+            self.solace_config.vmr_url = sc.use_persistent_connection(socket_path)
+        self.state_store = ss.get_state_store()
+        # optional solace_journal.SolaceJournal of a bulk operation, set by the calling module
+        self.journal = None
+        if hasattr(self, 'SEMP_VERSION_KEY_LOOKUP'):
+            self.resolve_semp_version_keys()
         return
 
     def do_task(self):
@@ -161,6 +186,21 @@ class SolaceTask:
             # jinja treats everything as a string, so cast ints and floats
             settings = sc.type_conversion(settings, is_broker_solace_cloud(self.solace_config))
 
+        state_store_digest = None
+        if self.state_store is not None or self.journal is not None:
+            state_store_digest = ss.compute_digest(dict(state=self.module.params['state'], settings=settings))
+        # resumed bulk operation: skip the objects it already completed, no request at all
+        if self.journal is not None and self.journal.is_completed(ss.get_broker_id(self.solace_config), self.get_object_uri(), state_store_digest):
+            return result
+        # fast path: skip the broker if the same state & settings were applied last time
+        # and the broker has not reported a config change since.
+        # the response is the one of the run that applied them.
+        if self.state_store is not None:
+            unchanged, response = self._is_state_store_unchanged(state_store_digest)
+            if unchanged:
+                result['response'] = response
+                return result
+
         ok, resp = self.get_func(self.solace_config, *(self.get_args() + [self.lookup_item()]))
 
         if not ok:
@@ -168,8 +208,8 @@ class SolaceTask:
         # else response was good
         current_configuration = resp
         # whitelist of configuration items that are not returned by GET
-        whitelist = DEFAULT_WHITELIST_KEYS
-        whitelist.extend(self.get_whitelist_keys())
+        # note: copy, many tasks may run in one process
+        whitelist = DEFAULT_WHITELIST_KEYS + self.get_whitelist_keys()
         required_together_keys_list = self.get_required_together_keys()
 
         if self.lookup_item() in current_configuration:
@@ -188,6 +228,9 @@ class SolaceTask:
                     bad_keys = [item for item in bad_keys if item not in whitelist]
                     # removed keys
                     removed_keys = [item for item in settings if item in whitelist]
+                    if self.state_store is not None:
+                        # write-only values applied last time are not sent again
+                        removed_keys = self._get_changed_write_only_keys(settings, removed_keys)
                     # fail if any unexpected settings found
                     if len(bad_keys):
                         msg = "invalid key(s) found in 'settings'"
@@ -254,8 +297,94 @@ class SolaceTask:
                         self.module.fail_json(msg=resp, **result)
                 result['changed'] = True
 
+        if self.state_store is not None and not self.module.check_mode:
+            self._update_write_only_fingerprints(settings, whitelist)
+            self._update_state_store(state_store_digest, result['changed'], result['response'])
+
+        if self.journal is not None and not self.module.check_mode:
+            self._update_journal(state_store_digest, result)
+
         return result
 
+    def _update_journal(self, digest, result):
+        if not result['changed']:
+            operation = sj.OPERATION_UNCHANGED
+        elif self.module.params['state'] == 'absent':
+            operation = sj.OPERATION_DELETED
+        elif 'delta' in result:
+            operation = sj.OPERATION_UPDATED
+        else:
+            operation = sj.OPERATION_CREATED
+        self.journal.record(ss.get_broker_id(self.solace_config), self.get_object_uri(), operation, digest)
+
+    def _get_changed_write_only_keys(self, settings, write_only_keys):
+        fingerprints = self.state_store.get_fingerprints(ss.get_broker_id(self.solace_config), self.get_object_uri())
+        return [key for key in write_only_keys
+                if fingerprints.get(key) != self.state_store.compute_fingerprint(settings[key])]
+
+    def _update_write_only_fingerprints(self, settings, whitelist):
+        broker = ss.get_broker_id(self.solace_config)
+        uri = self.get_object_uri()
+        if self.module.params['state'] == 'absent':
+            self.state_store.delete_fingerprints(broker, uri)
+            return
+        write_only_settings = {key: settings[key] for key in (settings or {}) if key in whitelist}
+        if write_only_settings:
+            self.state_store.set_fingerprints(broker, uri, write_only_settings)
+
+    def get_object_uri(self):
+        # identifies the object in the state store
+        return '/'.join([self.module._name] + [str(arg) for arg in self.get_args()] + [str(self.lookup_item())])
+
+    def get_config_marker_scope(self):
+        # the config marker is the msg vpn's config-sync key. it changes with every config change in the vpn.
+        # modules managing objects outside of the vpn must override and return None.
+        if is_broker_solace_cloud(self.solace_config):
+            return None
+        return self.module.params.get('msg_vpn', None)
+
+    def get_config_marker(self, scope):
+        # GET /SEMP/v2/monitor/msgVpns/{msgVpnName}?select=configSyncLocalKey
+        path_array = [SEMP_V2_MONITOR, MSG_VPNS, scope]
+        ok, resp = make_get_request(self.solace_config, path_array, query='select=configSyncLocalKey')
+        if not ok or not isinstance(resp, dict):
+            logging.debug("state store: unable to retrieve config marker for scope='%s': %s", scope, str(resp))
+            return None
+        return resp.get('configSyncLocalKey', None)
+
+    def _is_state_store_unchanged(self, digest):
+        # returns (unchanged, the stored response)
+        scope = self.get_config_marker_scope()
+        if scope is None:
+            return False, None
+        broker = ss.get_broker_id(self.solace_config)
+        stored_marker, checked_at = self.state_store.get_marker(broker, scope)
+        if not self.state_store.is_marker_fresh(checked_at):
+            marker = self.get_config_marker(scope)
+            if marker is None:
+                return False, None
+            if marker != stored_marker:
+                self.state_store.invalidate(broker, scope)
+            self.state_store.set_marker(broker, scope, marker)
+        stored_digest, response = self.state_store.get_object(broker, self.get_object_uri())
+        # entries of older versions have no response: take the slow path once
+        return (stored_digest == digest and response is not None), response
+
+    def _update_state_store(self, digest, changed, response):
+        scope = self.get_config_marker_scope()
+        if scope is None:
+            return
+        broker = ss.get_broker_id(self.solace_config)
+        if changed:
+            # the new marker cannot tell our change from an out-of-band change made since the
+            # marker was checked: drop the other objects' digests, they are re-checked next time.
+            self.state_store.invalidate(broker, scope)
+            marker = self.get_config_marker(scope)
+            if marker is None:
+                return
+            self.state_store.set_marker(broker, scope, marker)
+        self.state_store.set_digest(broker, scope, self.get_object_uri(), digest, response)
+
     def get_func(self, solace_config, *args):
         return
 
@@ -281,6 +410,13 @@ class SolaceTask:
         raise AnsibleError("argument 'semp_version' not supported by module: {}. implement 'lookup_semp_version()' in module.".format(self.module._name))
 
     def get_semp_version_key(self, lookup_dict, lookup_vmr_semp_version, lookup_key):
+        version_lookup_dict = self.get_semp_version_lookup_dict(lookup_dict, lookup_vmr_semp_version)
+        if lookup_key not in version_lookup_dict:
+            raise ValueError("lookup_key: '{}' not found in lookup_dict for semp_version '{}': {}".format(lookup_key, lookup_vmr_semp_version, list(version_lookup_dict.keys())))
+        return version_lookup_dict[lookup_key]
+
+    def get_semp_version_lookup_dict(self, lookup_dict, lookup_vmr_semp_version):
+        # the entry of lookup_dict for the version key of lookup_vmr_semp_version, see lookup_semp_version()
         try:
             v = float(lookup_vmr_semp_version)
         except ValueError:
@@ -288,13 +424,30 @@ class SolaceTask:
         ok, version_key = self.lookup_semp_version(v)
         if not ok:
             raise ValueError("unsupported semp_version: '{}'".format(lookup_vmr_semp_version))
-
         if version_key not in lookup_dict:
-            raise ValueError("version_key: '{}' not found in lookup_dict: {}".format(version_key, json.dumps(lookup_dict)))
-        version_lookup_dict = lookup_dict[version_key]
-        if lookup_key not in version_lookup_dict:
-            raise ValueError("lookup_key: '{}' not found in lookup_dict['{}']: '{}'".format(lookup_key, version_key, json.dumps(version_lookup_dict)))
-        return version_lookup_dict[lookup_key]
+            raise ValueError("version_key: '{}' not found in lookup_dict: {}".format(version_key, list(lookup_dict.keys())))
+        return lookup_dict[version_key]
+
+    def get_semp_version(self):
+        # the module's semp_version argument or the broker's version, see get_broker_semp_version()
+        if not self.solace_config.vmr_sempVersion:
+            ok, resp = get_broker_semp_version(self.solace_config, self.state_store)
+            if not ok:
+                self.module.fail_json(msg="failed to retrieve the broker's SEMP version: {}".format(resp), rc=1, changed=False, response=resp)
+            self.solace_config.vmr_sempVersion = resp
+        return self.solace_config.vmr_sempVersion
+
+    def resolve_semp_version_keys(self):
+        """Resolves the module's SEMP_VERSION_KEY_LOOKUP for the broker's version once.
+
+        sets self.semp_version_keys: the version's entry of SEMP_VERSION_KEY_LOOKUP, e.g. the resource names & key attributes.
+        """
+        semp_version = self.get_semp_version()
+        try:
+            self.semp_version_keys = self.get_semp_version_lookup_dict(self.SEMP_VERSION_KEY_LOOKUP, semp_version)
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), rc=1, changed=False)
+        return
 
     def get_whitelist_keys(self):
         if hasattr(self, 'WHITELIST_KEYS'):
@@ -309,19 +462,22 @@ class SolaceTask:
     def get_list_default_query_params(self):
         return 'count=100'
 
-    def execute_get_list(self, path_array):
+    def compose_get_list_query(self):
 
         query = self.get_list_default_query_params()
         if query is None:
             query = ''
 
-        query_params = self.module.params['query_params']
+        query_params = self.module.params['query_params'] or dict()
+        select = query_params.get('select')
+        if self.is_list_count_only():
+            # only counted: the narrowest projection, an attribute every object has or the one counted by
+            count_by = self.module.params.get('count_by')
+            select = [count_by.split('.')[0] if count_by else self.get_list_count_select()]
+        if select:
+            query += ('&' if query != '' else '')
+            query += "select=" + ','.join(select)
         if query_params:
-            if ("select" in query_params
-                    and query_params['select'] is not None
-                    and len(query_params['select']) > 0):
-                query += ('&' if query != '' else '')
-                query += "select=" + ','.join(query_params['select'])
             if ("where" in query_params
                     and query_params['where'] is not None
                     and len(query_params['where']) > 0):
@@ -330,24 +486,37 @@ class SolaceTask:
                     where_array.append(where_elem.replace('/', '%2F'))
                 query += ('&' if query != '' else '')
                 query += "where=" + ','.join(where_array)
+        return query
+
+    def is_list_count_only(self):
+        return bool(self.module.params.get('count_only') or self.module.params.get('count_by'))
 
-        api_path = SEMP_V2_CONFIG
+    def get_list_count_select(self):
+        # attribute selected in count mode. all msg vpn objects have it, override for other objects.
+        return 'msgVpnName'
+
+    def get_list_api_path(self):
         if self.module.params['api'] == 'monitor':
-            api_path = SEMP_V2_MONITOR
-        path_array = [api_path] + path_array
+            return SEMP_V2_MONITOR
+        return SEMP_V2_CONFIG
+
+    def iter_get_list_pages(self, path_array):
+        # yields (ok, data) per page: data is the page's list of objects or the error
+
+        query = self.compose_get_list_query()
+
+        path_array = [self.get_list_api_path()] + path_array
 
         path = compose_path(path_array)
 
         url = self.solace_config.vmr_url + path + ("?" + query if query is not None else '')
 
-        result_list = []
-
         hasNextPage = True
 
         while hasNextPage:
 
             try:
-                resp = requests.get(
+                resp = sc.get_http_session().get(
                             url,
                             json=None,
                             auth=self.solace_config.vmr_auth,
@@ -360,14 +529,15 @@ class SolaceTask:
                     sc.log_http_roundtrip(resp)
 
                 if resp.status_code != 200:
-                    return False, parse_bad_response(resp)
+                    yield False, parse_bad_response(resp)
+                    return
                 else:
                     body = resp.json()
-                    if "data" in body.keys():
-                        result_list.extend(body['data'])
+                    yield True, body.get('data', [])
 
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                return False, str(e)
+                yield False, str(e)
+                return
 
             if "meta" not in body:
                 hasNextPage = False
@@ -378,6 +548,26 @@ class SolaceTask:
             else:
                 url = body["meta"]["paging"]["nextPageUri"]
 
+    def execute_get_list(self, path_array):
+        # with top_n / group_by / count_only, the pages are aggregated as they arrive and only the aggregate is returned
+        try:
+            aggregation = sg.create_list_aggregation(self.module.params.get('top_n'), self.module.params.get('group_by'),
+                                                     self.module.params.get('count_only'), self.module.params.get('count_by'))
+        except ValueError as e:
+            return False, str(e)
+
+        result_list = []
+
+        for ok, data in self.iter_get_list_pages(path_array):
+            if not ok:
+                return False, data
+            if aggregation is not None:
+                aggregation.add_page(data)
+            else:
+                result_list.extend(data)
+
+        if aggregation is not None:
+            return True, aggregation.result()
         return True, result_list
 
 ###
@@ -398,6 +588,22 @@ def arg_spec_broker():
     )
 
 
+def arg_spec_broker_list_item():
+    """arg_spec_broker() as the options of an item of a list of brokers, e.g. password stays no_log.
+
+    no defaults: options not given are None and taken from the module's options, see get_broker_list_item_options().
+    """
+    arg_spec = arg_spec_broker()
+    for option in arg_spec.values():
+        option.pop('default', None)
+    return arg_spec
+
+
+def get_broker_list_item_options(broker, params):
+    # the broker options of an item of a list of brokers, the ones not given taken from the module's params
+    return {key: broker[key] if broker.get(key) is not None else params[key] for key in arg_spec_broker()}
+
+
 def arg_spec_solace_cloud_config():
     return dict(
         solace_cloud_api_token=dict(type='str', required=False, no_log=True, default=None),
@@ -425,7 +631,13 @@ def arg_spec_settings():
 
 def arg_spec_semp_version():
     return dict(
-        semp_version=dict(type='str', required=True)
+        semp_version=dict(type='str', required=False, default=None)
+    )
+
+
+def arg_spec_journal():
+    return dict(
+        journal=dict(type='str', required=False, default=None)
     )
 
 
@@ -449,7 +661,7 @@ def arg_spec_crud():
 
 
 def arg_spec_get_list():
-    return dict(
+    arg_spec = dict(
         api=dict(type='str', default='config', choices=['config', 'monitor']),
         query_params=dict(type='dict',
                           required=False,
@@ -459,9 +671,11 @@ def arg_spec_get_list():
                           )
                           )
     )
+    arg_spec.update(arg_spec_get_list_aggregation())
+    return arg_spec
 
 def arg_spec_get_list_monitor():
-    return dict(
+    arg_spec = dict(
         query_params=dict(type='dict',
                           required=False,
                           options=dict(
@@ -470,6 +684,32 @@ def arg_spec_get_list_monitor():
                           )
                           )
     )
+    arg_spec.update(arg_spec_get_list_aggregation())
+    return arg_spec
+
+
+def arg_spec_get_list_aggregation():
+    return dict(
+        top_n=dict(type='dict',
+                   required=False,
+                   default=None,
+                   options=dict(
+                     n=dict(type='int', required=True),
+                     by=dict(type='str', required=True),
+                     order=dict(type='str', default='desc', choices=['desc', 'asc'])
+                   )
+                   ),
+        group_by=dict(type='dict',
+                      required=False,
+                      default=None,
+                      options=dict(
+                        by=dict(type='list', required=True, elements='str'),
+                        sum=dict(type='list', default=[], elements='str')
+                      )
+                      ),
+        count_only=dict(type='bool', default=False),
+        count_by=dict(type='str', required=False, default=None)
+    )
 
 
 def merge_dicts(*argv):
@@ -510,12 +750,19 @@ def _handle_get_configuration_not_found_errors(resp):
 
 def get_configuration(solace_config, path_array, key):
     ok, resp = make_get_request(solace_config, path_array)
+    return parse_get_configuration_response(solace_config, ok, resp, key)
+
+
+def parse_get_configuration_response(solace_config, ok, resp, key):
+    # returns (ok, configuration): {key value: object} if found, empty dict if not found
     if ok:
         return True, _build_config_dict(resp, key)
     elif is_broker_solace_cloud(solace_config):
         # check if status code was 404: not found
         # returned by Solace Cloud API
-        if (type(resp) is not dict and resp.status_code == 404):
+        # with a body, the response is parsed into a dict, see parse_bad_response()
+        if ((type(resp) is not dict and resp.status_code == 404)
+                or (type(resp) is dict and resp.get('status_code') == 404)):
             return True, dict()
     else:
         # response contains 1 dict if lookup_item/key is found
@@ -534,21 +781,64 @@ def get_configuration(solace_config, path_array, key):
 
 # request/response handling
 
-def _wait_solace_cloud_request_completed(solace_config, request_resp):
+def get_solace_cloud_request_id(request_resp):
+    # the id of a long running request, from the 202 response
+    return json.loads(request_resp.text)['data']['id']
+
+
+def get_solace_cloud_request_status_path(service_id, request_id):
     # GET https://api.solace.cloud/api/v0/services/{paste-your-serviceId-here}/requests/{{requestId}}
-    request_resp_body = json.loads(request_resp.text)
-    request_id = request_resp_body['data']['id']
-    path_array = [SOLACE_CLOUD_API_SERVICES_BASE_PATH, solace_config.solace_cloud_config['service_id'], 'requests', request_id]
+    return [SOLACE_CLOUD_API_SERVICES_BASE_PATH, service_id, SOLACE_CLOUD_REQUESTS, request_id]
+
+
+def parse_solace_cloud_request_status(resp_body):
+    # returns (completed, ok, the request's body or the error)
+    if resp_body['data']['adminProgress'] == 'completed':
+        return True, True, resp_body
+    ok, err = scu.parse_resp_body_for_errs(resp_body)
+    if not ok:
+        return True, False, err
+    return False, True, resp_body
+
+
+def compose_solace_cloud_client_profile_body(operation, client_profile_name, settings=None, current_settings=None):
+    """Returns the body of a Solace Cloud clientProfileRequests POST.
+
+    operation: create, update or delete.
+    create: the defaults, overridden by settings.
+    update: the flat current settings, overridden by the delta settings; Solace Cloud only accepts complete profiles.
+    """
+    mandatory = {
+        'clientProfileName': client_profile_name
+    }
+    if operation == 'create':
+        data = merge_dicts(SOLACE_CLOUD_CLIENT_PROFILE_DEFAULTS, mandatory, settings)
+    elif operation == 'update':
+        current_settings = dict(current_settings or {})
+        # inconsistency in Solace Cloud API:
+        # elidingEnabled:
+        #   create: must be provided as boolean (true or false)
+        #   get: returns it as null if it was false
+        #   update: must be provided as true or false
+        if current_settings.get('elidingEnabled', False) is None:
+            current_settings['elidingEnabled'] = False
+        data = merge_dicts(current_settings, mandatory, settings)
+    else:
+        data = mandatory
+    return compose_solace_cloud_body(operation, 'clientProfile', data)
+
+
+def _wait_solace_cloud_request_completed(solace_config, request_resp):
+    request_id = get_solace_cloud_request_id(request_resp)
+    path_array = get_solace_cloud_request_status_path(solace_config.solace_cloud_config['service_id'], request_id)
     url = compose_path(path_array)
     auth = BearerAuth(solace_config.solace_cloud_config['api_token'])
     is_completed = False
     try_count = 0
-    retries = 12
-    delay = 5  # seconds
 
-    while not is_completed and try_count < retries:
+    while not is_completed and try_count < SOLACE_CLOUD_REQUEST_POLL_RETRIES:
         try:
-            resp = requests.get(
+            resp = sc.get_http_session().get(
                         url,
                         json=None,
                         auth=auth,
@@ -564,18 +854,13 @@ def _wait_solace_cloud_request_completed(solace_config, request_resp):
             raise AnsibleError("Solace Cloud: GET request status error: {}".format(str(e)))
 
         if resp.text:
-            resp_body = json.loads(resp.text)
-            is_completed = (resp_body['data']['adminProgress'] == 'completed')
+            is_completed, ok, resp_body = parse_solace_cloud_request_status(json.loads(resp.text))
             if is_completed:
-                return True, resp_body
-            else:
-                ok, err = scu.parse_resp_body_for_errs(resp_body)
-                if not ok:
-                    return False, err
+                return ok, resp_body
         else:
             raise AnsibleError("Solace Cloud: GET request status error: no body found in response")
         try_count += 1
-        time.sleep(delay)
+        time.sleep(SOLACE_CLOUD_REQUEST_POLL_DELAY)
     # never gets here
     return True, None
 
@@ -648,6 +933,84 @@ def compose_solace_cloud_body(operation, type, data):
     }
 
 
+# broker id -> SEMP version, memoized per module process
+_SEMP_VERSIONS = dict()
+
+_SEMP_VERSION_INFO_KEY = 'about/api:sempVersion'
+
+
+def get_broker_semp_version(solace_config, state_store=None):
+    """Returns (ok, semp version) of the broker, e.g. (True, '2.17').
+
+    asks the broker (GET about/api) once per process. with a state store, the version is also kept there
+    for ss.STATE_STORE_SEMP_VERSION_TTL seconds and shared with the other tasks of the play.
+    """
+    broker_id = ss.get_broker_id(solace_config)
+    if broker_id in _SEMP_VERSIONS:
+        return True, _SEMP_VERSIONS[broker_id]
+    if state_store is not None:
+        semp_version = state_store.get_broker_info(broker_id, _SEMP_VERSION_INFO_KEY, ss.STATE_STORE_SEMP_VERSION_TTL)
+        if semp_version is not None:
+            _SEMP_VERSIONS[broker_id] = semp_version
+            return True, semp_version
+    ok, resp = make_get_request(solace_config, [SEMP_V2_CONFIG, 'about', 'api'])
+    if not ok:
+        return False, resp
+    semp_version = resp.get('sempVersion') if isinstance(resp, dict) else None
+    if not semp_version:
+        return False, "sempVersion not found in response: {}".format(resp)
+    _SEMP_VERSIONS[broker_id] = semp_version
+    if state_store is not None:
+        state_store.set_broker_info(broker_id, _SEMP_VERSION_INFO_KEY, semp_version)
+    return True, semp_version
+
+
+# (broker id, vpn, client id, virtual router) -> name of the MQTT session's magic queue, per module process
+_MQTT_MAGIC_QUEUES = dict()
+# (broker id, vpn, queue name) of the magic queues with no-shutdown applied, per module process
+_MQTT_MAGIC_QUEUES_ENABLED = set()
+
+
+def get_mqtt_magic_queue(solace_config, vpn, client_id, virtual_router):
+    """Returns (ok, name of the MQTT session's magic queue or the error).
+
+    reads the queue name from the session's monitor object. falls back to the SEMP v1 queue search
+    for brokers whose monitor object has no queueName.
+    """
+    key = (ss.get_broker_id(solace_config), vpn, client_id, virtual_router)
+    if key in _MQTT_MAGIC_QUEUES:
+        return True, _MQTT_MAGIC_QUEUES[key]
+    # GET /msgVpns/{msgVpnName}/mqttSessions/{mqttSessionClientId},{mqttSessionVirtualRouter}?select=queueName
+    path_array = [SEMP_V2_MONITOR, MSG_VPNS, vpn, MQTT_SESSIONS, ','.join([client_id, virtual_router])]
+    ok, resp = make_get_request(solace_config, path_array, query='select=queueName')
+    queue_name = resp.get('queueName') if ok and isinstance(resp, dict) else None
+    if not queue_name:
+        ok, queue_name = sc.search_sempv1_mqtt_magic_queue(solace_config, vpn, client_id)
+        if not ok:
+            return False, queue_name
+    _MQTT_MAGIC_QUEUES[key] = queue_name
+    return True, queue_name
+
+
+def ensure_mqtt_magic_queue_enabled(solace_config, vpn, client_id, virtual_router):
+    """Ensures the MQTT session's magic queue is ON/ON, once per session & module process.
+
+    not remembered across processes: the session & its magic queue may be recreated or shut down in between.
+    returns (ok, queue name or the error).
+    """
+    ok, queue_name = get_mqtt_magic_queue(solace_config, vpn, client_id, virtual_router)
+    if not ok:
+        return False, queue_name
+    key = (ss.get_broker_id(solace_config), vpn, queue_name)
+    if key in _MQTT_MAGIC_QUEUES_ENABLED:
+        return True, queue_name
+    # depending on Broker version, no-shutdown is allowed or not.
+    # here: ignore error
+    sc.execute_sempv1_queue_no_shutdown(solace_config, vpn, queue_name)
+    _MQTT_MAGIC_QUEUES_ENABLED.add(key)
+    return True, queue_name
+
+
 def is_broker_solace_cloud(solace_config):
     if solace_config.solace_cloud_config is None:
         return False
@@ -664,9 +1027,11 @@ if not HAS_IMPORT_ERROR:
             return r
 
 
-def _make_request(func, solace_config, path_array, json=None):
+def _make_request(func, solace_config, path_array, json=None, query=None):
 
     path = compose_path(path_array)
+    if query:
+        path += '?' + query
 
     try:
         if(is_broker_solace_cloud(solace_config)):
@@ -692,20 +1057,20 @@ def _make_request(func, solace_config, path_array, json=None):
         return False, str(e)
 
 
-def make_get_request(solace_config, path_array):
-    return _make_request(requests.get, solace_config, path_array)
+def make_get_request(solace_config, path_array, query=None):
+    return _make_request(sc.get_http_session().get, solace_config, path_array, query=query)
 
 
 def make_post_request(solace_config, path_array, json=None):
-    return _make_request(requests.post, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().post, solace_config, path_array, json)
 
 
 def make_delete_request(solace_config, path_array, json=None):
-    return _make_request(requests.delete, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().delete, solace_config, path_array, json)
 
 
 def make_patch_request(solace_config, path_array, json=None):
-    return _make_request(requests.patch, solace_config, path_array, json)
+    return _make_request(sc.get_http_session().patch, solace_config, path_array, json)
 
 ###
 # The End.
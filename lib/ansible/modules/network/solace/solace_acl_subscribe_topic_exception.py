@@ -73,9 +73,6 @@ author:
 
 EXAMPLES = '''
 
-    - name: Get Solace Facts
-      solace_get_facts:
-
     - name: Create ACL Profile
       solace_acl_profile:
         name: "test_ansible_solace"
@@ -87,14 +84,12 @@ EXAMPLES = '''
 
     - name: Add Subscribe Topic Exceptions to ACL Profile
       solace_acl_subscribe_topic_exception:
-        semp_version: "{{ ansible_facts.solace.about.api.sempVersion }}"
         acl_profile_name: "test_ansible_solace"
         name: "test/ansible/solace"
         state: present
 
     - name: Delete Subscribe Topic Exceptions from ACL Profile
       solace_acl_subscribe_topic_exception:
-        semp_version: "{{ ansible_facts.solace.about.api.sempVersion }}"
         acl_profile_name: "test_ansible_solace"
         name: "test/ansible/solace"
         state: absent
@@ -145,8 +140,8 @@ class SolaceACLSubscribeTopicExceptionTask(su.SolaceTask):
     def get_func(self, solace_config, vpn, acl_profile_name, topic_syntax, lookup_item_value):
         # vmr_sempVersion <= "2.13" : GET /msgVpns/{msgVpnName}/aclProfiles/{aclProfileName}/subscribeExceptions/{topicSyntax},{subscribeExceptionTopic}
         # vmr_sempVersion >= "2.14": GET /msgVpns/{msgVpnName}/aclProfiles/{aclProfileName}/subscribeTopicExceptions/{subscribeTopicExceptionSyntax},{subscribeTopicException}
-        uri_subscr_ex = self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_URI_SUBSCR_EX)
-        lookup_item_key = self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_LOOKUP_ITEM_KEY)
+        uri_subscr_ex = self.semp_version_keys[self.KEY_URI_SUBSCR_EX]
+        lookup_item_key = self.semp_version_keys[self.KEY_LOOKUP_ITEM_KEY]
 
         ex_uri = ','.join([topic_syntax, lookup_item_value])
         path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, vpn, su.ACL_PROFILES, acl_profile_name, uri_subscr_ex, ex_uri]
@@ -158,13 +153,13 @@ class SolaceACLSubscribeTopicExceptionTask(su.SolaceTask):
         defaults = {
             'msgVpnName': vpn,
             'aclProfileName': acl_profile_name,
-            self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_TOPIC_SYNTAX_KEY): topic_syntax
+            self.semp_version_keys[self.KEY_TOPIC_SYNTAX_KEY]: topic_syntax
         }
         mandatory = {
-            self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_LOOKUP_ITEM_KEY): subscribe_topic_exception
+            self.semp_version_keys[self.KEY_LOOKUP_ITEM_KEY]: subscribe_topic_exception
         }
         data = su.merge_dicts(defaults, mandatory, settings)
-        uri_subscr_ex = self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_URI_SUBSCR_EX)
+        uri_subscr_ex = self.semp_version_keys[self.KEY_URI_SUBSCR_EX]
         path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, vpn, su.ACL_PROFILES, acl_profile_name, uri_subscr_ex]
         return su.make_post_request(solace_config, path_array, data)
 
@@ -172,7 +167,7 @@ class SolaceACLSubscribeTopicExceptionTask(su.SolaceTask):
         # vmr_sempVersion: <=2.13 : DELETE /msgVpns/{msgVpnName}/aclProfiles/{aclProfileName}/subscribeExceptions/{topicSyntax},{subscribeExceptionTopic}
         # vmr_sempVersion: >=2.14: DELETE /msgVpns/{msgVpnName}/aclProfiles/{aclProfileName}/subscribeTopicExceptions/{subscribeTopicExceptionSyntax},{subscribeTopicException}
         ex_uri = ",".join([topic_syntax, lookup_item_value])
-        uri_subscr_ex = self.get_semp_version_key(self.SEMP_VERSION_KEY_LOOKUP, solace_config.vmr_sempVersion, self.KEY_URI_SUBSCR_EX)
+        uri_subscr_ex = self.semp_version_keys[self.KEY_URI_SUBSCR_EX]
         path_array = [su.SEMP_V2_CONFIG, su.MSG_VPNS, vpn, su.ACL_PROFILES, acl_profile_name, uri_subscr_ex, ex_uri]
         return su.make_delete_request(solace_config, path_array)
 
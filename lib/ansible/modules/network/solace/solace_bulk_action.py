@@ -0,0 +1,213 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_action as sx
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_bulk_action
+
+short_description: Execute a SEMP v2 action on all objects matching a where filter, e.g. disconnect clients.
+
+description:
+- "Lists the target objects of a msg vpn from the monitor API, with a select projection of their keys only, filtered by 'where'."
+- "Executes the action on each target concurrently, with at most max_workers requests in flight and at most 'rate' requests per second."
+- "The actions of a page of targets start while the next page is listed."
+- "Returns the result per target."
+
+notes:
+- "Reference Action: U(https://docs.solace.com/API-Developer-Online-Ref-Documentation/swagger-ui/action/index.html)."
+- "Check mode lists the targets without executing the action."
+- "Without 'where', the action is executed on all objects of the resource."
+- "Not supported: Solace Cloud API."
+
+options:
+  resource:
+    description: The resource of the msg vpn the targets are listed from.
+    type: str
+    required: true
+    choices:
+      - clients
+      - mqtt_sessions
+      - queues
+      - topic_endpoints
+      - bridges
+  action:
+    description:
+      - "The action executed on each target."
+      - "clients, bridges: disconnect, clearStats, clearEvent. mqtt_sessions: clearStats. queues, topic_endpoints: clearStats, deleteMsgs."
+    type: str
+    required: true
+    choices:
+      - disconnect
+      - clearStats
+      - clearEvent
+      - deleteMsgs
+  where:
+    description: "Where conditions of the monitor list, e.g. 'clientUsername==app1'. See the SEMP documentation of the where parameter."
+    type: list
+    required: false
+  include_system_objects:
+    description: Include objects created by the broker, i.e. with names starting with '#'.
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of action requests in flight.
+    type: int
+    default: 20
+  rate:
+    description: Max number of action requests per second. Not set, no limit.
+    type: float
+    required: false
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+
+seealso:
+- module: solace_get_vpn_clients
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Disconnect all clients of client username app1
+  solace_bulk_action:
+    msg_vpn: orders
+    resource: clients
+    action: disconnect
+    where:
+      - "clientUsername==app1"
+    max_workers: 50
+    rate: 500
+  register: result
+
+- name: Clear the stats of all mqtt sessions of devices
+  solace_bulk_action:
+    msg_vpn: iot
+    resource: mqtt_sessions
+    action: clearStats
+    where:
+      - "mqttSessionClientId==device-*"
+'''
+
+RETURN = '''
+summary:
+    description: Number of targets, of succeeded & failed actions and of skipped system objects.
+    type: dict
+    returned: always
+    sample:
+        targets: 3000
+        succeeded: 2998
+        failed: 2
+        skipped: 1
+results:
+    description: The result per target. In check mode, the targets only.
+    type: list
+    returned: always
+    sample:
+        - name: client-1
+          ok: true
+        - name: client-2
+          ok: false
+          error: "not found"
+failures:
+    description: The failure to list the targets.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceBulkActionTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_bulk_action does not support the Solace Cloud API", **result)
+        try:
+            bulk_action = sx.SolaceBulkAction(self.solace_config, params['msg_vpn'], sx.ACTION_RESOURCES[params['resource']],
+                                              params['action'], params['where'], params['max_workers'], params['rate'],
+                                              params['include_system_objects'], self.module.check_mode)
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        summary, results = bulk_action.run()
+        result.update(summary=summary, results=results)
+        if not self.module.check_mode:
+            result['changed'] = summary['succeeded'] > 0
+        if bulk_action.failures:
+            result['failures'] = bulk_action.failures
+            self.module.fail_json(msg="failed to list the targets", **result)
+        if summary['failed'] > 0:
+            self.module.fail_json(msg="action failed for {} of {} target(s)".format(summary['failed'], summary['targets']), **result)
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        resource=dict(type='str', required=True, choices=list(sx.ACTION_RESOURCES)),
+        action=dict(type='str', required=True, choices=['disconnect', 'clearStats', 'clearEvent', 'deleteMsgs']),
+        where=dict(type='list', required=False, default=None),
+        include_system_objects=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=sx.DEFAULT_MAX_WORKERS),
+        rate=dict(type='float', required=False, default=None)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceBulkActionTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -137,15 +137,7 @@ class SolaceClientProfileTask(su.SolaceTask):
 
     LOOKUP_ITEM_KEY = 'clientProfileName'
 
-    SOLACE_CLOUD_DEFAULTS = {
-        'allowTransactedSessionsEnabled': False,
-        'allowBridgeConnectionsEnabled': False,
-        'allowGuaranteedEndpointCreateEnabled': False,
-        'allowSharedSubscriptionsEnabled': False,
-        'allowGuaranteedMsgSendEnabled': False,
-        'allowGuaranteedMsgReceiveEnabled': False,
-        'elidingEnabled': False
-    }
+    SOLACE_CLOUD_DEFAULTS = su.SOLACE_CLOUD_CLIENT_PROFILE_DEFAULTS
 
     def __init__(self, module):
         su.SolaceTask.__init__(self, module)
@@ -172,9 +164,9 @@ class SolaceClientProfileTask(su.SolaceTask):
         else:
             return self._get_func(solace_config, vpn, lookup_item_value)
 
-    def _create_func_solace_cloud(self, solace_config, client_profile_name, data):
+    def _create_func_solace_cloud(self, solace_config, client_profile_name, settings):
         # POST /{paste-your-serviceId-here}/requests/clientProfileRequests
-        body = su.compose_solace_cloud_body('create', 'clientProfile', data)
+        body = su.compose_solace_cloud_client_profile_body('create', client_profile_name, settings)
         path_array = [su.SOLACE_CLOUD_API_SERVICES_BASE_PATH,
                       solace_config.solace_cloud_config['service_id'],
                       su.SOLACE_CLOUD_REQUESTS,
@@ -187,13 +179,13 @@ class SolaceClientProfileTask(su.SolaceTask):
         return su.make_post_request(solace_config, path_array, data)
 
     def create_func(self, solace_config, vpn, client_profile_name, settings=None):
-        mandatory = {
-            self.LOOKUP_ITEM_KEY: client_profile_name,
-        }
-        data = su.merge_dicts(self.SOLACE_CLOUD_DEFAULTS, mandatory, settings)
         if(su.is_broker_solace_cloud(solace_config)):
-            return self._create_func_solace_cloud(solace_config, client_profile_name, data)
+            return self._create_func_solace_cloud(solace_config, client_profile_name, settings)
         else:
+            mandatory = {
+                self.LOOKUP_ITEM_KEY: client_profile_name,
+            }
+            data = su.merge_dicts(self.SOLACE_CLOUD_DEFAULTS, mandatory, settings)
             return self._create_func(solace_config, vpn, client_profile_name, data)
 
     def _update_func_solace_cloud(self, solace_config, lookup_item_value, delta_settings, current_settings):
@@ -210,20 +202,7 @@ class SolaceClientProfileTask(su.SolaceTask):
         else:
             curr_settings = current_settings[profile_names[0]]
 
-        # inconsistency in Solace Cloud API:
-        # elidingEnabled:
-        #   create: must be provided as boolean (true or false)
-        #   get: returns it as null if it was false
-        #   update: must be provided as true or false
-
-        if curr_settings and curr_settings['elidingEnabled'] is None:
-            curr_settings['elidingEnabled'] = False
-
-        mandatory = {
-            self.LOOKUP_ITEM_KEY: lookup_item_value,
-        }
-        data = su.merge_dicts(curr_settings, mandatory, delta_settings)
-        body = su.compose_solace_cloud_body('update', 'clientProfile', data)
+        body = su.compose_solace_cloud_client_profile_body('update', lookup_item_value, delta_settings, curr_settings)
         path_array = [su.SOLACE_CLOUD_API_SERVICES_BASE_PATH,
                       solace_config.solace_cloud_config['service_id'],
                       su.SOLACE_CLOUD_REQUESTS,
@@ -243,10 +222,7 @@ class SolaceClientProfileTask(su.SolaceTask):
 
     def _delete_func_solace_cloud(self, solace_config, client_profile_name):
         # POST /{paste-your-serviceId-here}/requests/clientProfileRequests
-        data = {
-            self.LOOKUP_ITEM_KEY: client_profile_name,
-        }
-        body = su.compose_solace_cloud_body('delete', 'clientProfile', data)
+        body = su.compose_solace_cloud_client_profile_body('delete', client_profile_name)
         path_array = [su.SOLACE_CLOUD_API_SERVICES_BASE_PATH,
                       solace_config.solace_cloud_config['service_id'],
                       su.SOLACE_CLOUD_REQUESTS,
@@ -0,0 +1,325 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_async as sa
+import ansible.module_utils.network.solace.solace_reconcile as sr
+import asyncio
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_client_profiles
+
+short_description: Configure many Client Profiles in one task.
+
+description:
+- "Creates, updates or deletes a list of Client Profiles in an idempotent manner, like M(solace_client_profile) does for one."
+- "Solace Cloud: all create, update & delete requests are submitted first, then one shared poller awaits their completion.
+   The run time is that of the slowest request, not the sum of all requests."
+- "Solace Standalone Brokers: the SEMP requests are sent concurrently."
+
+notes:
+- "Supports Solace Cloud Brokers as well as Solace Standalone Brokers."
+- "Failed profiles fail the module, the others are still applied."
+- "Reference: U(https://docs.solace.com/API-Developer-Online-Ref-Documentation/swagger-ui/config/index.html#/clientProfile)."
+- "Reference: U(https://docs.solace.com/Solace-Cloud/ght_use_rest_api_client_profiles.htm)."
+
+options:
+  client_profiles:
+    description:
+      - "The client profiles: names or dicts with 'name' and optional 'settings'."
+      - "state=present: the profiles to create / update. state=absent: the profiles to delete."
+    type: list
+    required: true
+  settings:
+    description: Settings of the profiles without their own settings.
+    type: dict
+    required: false
+  solace_cloud_service_ids:
+    description:
+      - "Solace Cloud only. Applies the profiles to each of the services. Default: solace_cloud_service_id."
+      - "The services must be accessible with solace_cloud_api_token."
+    type: list
+    required: false
+  max_workers:
+    description: Max number of requests in flight.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.state
+- solace.solace_cloud_config
+
+seealso:
+- module: solace_client_profile
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Create / update client profiles in several Solace Cloud services
+  solace_client_profiles:
+    solace_cloud_api_token: "{{ solace_cloud_api_token }}"
+    solace_cloud_service_id: "{{ solace_cloud_service_ids[0] }}"
+    solace_cloud_service_ids: "{{ solace_cloud_service_ids }}"
+    settings:
+      allowGuaranteedMsgSendEnabled: true
+      allowGuaranteedMsgReceiveEnabled: true
+    client_profiles:
+      - cp_orders
+      - cp_returns
+      - name: cp_audit
+        settings:
+          allowGuaranteedMsgSendEnabled: false
+
+- name: Delete client profiles
+  solace_client_profiles:
+    msg_vpn: foo
+    client_profiles:
+      - cp_orders
+      - cp_returns
+    state: absent
+'''
+
+RETURN = '''
+summary:
+    description: Number of profiles per outcome. Counts each profile once per service.
+    type: dict
+    returned: always
+    sample:
+        profiles: 40
+        created: 12
+        updated: 3
+        deleted: 0
+        unchanged: 25
+        failed: 0
+changes:
+    description: The changed profiles with the operation & delta settings (if updated). In check mode, the profiles that would change.
+    type: list
+    returned: always
+    sample:
+        - name: cp_orders
+          service_id: abc123
+          operation: update
+          delta:
+            allowGuaranteedMsgSendEnabled: true
+failures:
+    description: The failed profiles with the operation & error.
+    type: list
+    returned: always
+'''
+
+OPERATION_CREATE = 'create'
+OPERATION_UPDATE = 'update'
+OPERATION_DELETE = 'delete'
+OPERATION_GET = 'get'
+
+# summary keys
+_OPERATION_OUTCOMES = {
+    OPERATION_CREATE: 'created',
+    OPERATION_UPDATE: 'updated',
+    OPERATION_DELETE: 'deleted'
+}
+
+
+class SolaceClientProfilesTask(su.SolaceTask):
+
+    LOOKUP_ITEM_KEY = 'clientProfileName'
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+        self.is_solace_cloud = su.is_broker_solace_cloud(self.solace_config)
+
+    def get_service_ids(self):
+        # standalone broker: one 'service' without id
+        if not self.is_solace_cloud:
+            return [None]
+        service_ids = self.module.params['solace_cloud_service_ids']
+        if not service_ids:
+            service_ids = [self.solace_config.solace_cloud_config['service_id']]
+        return list(dict.fromkeys(service_ids))
+
+    def _item_path(self, service_id, name):
+        if self.is_solace_cloud:
+            # GET /{paste-your-serviceId-here}/clientProfiles/{{clientProfileName}}
+            return [su.SOLACE_CLOUD_API_SERVICES_BASE_PATH, service_id, su.CLIENT_PROFILES, name]
+        # /msgVpns/{msgVpnName}/clientProfiles/{clientProfileName}
+        return [su.SEMP_V2_CONFIG, su.MSG_VPNS, self.module.params['msg_vpn'], su.CLIENT_PROFILES, name]
+
+    def _requests_path(self, service_id):
+        # POST /{paste-your-serviceId-here}/requests/clientProfileRequests
+        return [su.SOLACE_CLOUD_API_SERVICES_BASE_PATH, service_id, su.SOLACE_CLOUD_REQUESTS, su.SOLACE_CLOUD_CLIENT_PROFILE_REQUESTS]
+
+    async def _get(self, session, service_id, name):
+        ok, resp = await session.make_get_request(self._item_path(service_id, name))
+        ok, resp = su.parse_get_configuration_response(self.solace_config, ok, resp, self.LOOKUP_ITEM_KEY)
+        if not ok:
+            return False, resp
+        return True, resp.get(name)
+
+    def plan_profile(self, name, settings, current):
+        """Returns (operation or None, delta settings) or raises ValueError for invalid settings keys."""
+        if self.module.params['state'] == 'absent':
+            return (OPERATION_DELETE if current is not None else None), None
+        if current is None:
+            return OPERATION_CREATE, settings
+        if not settings:
+            return None, None
+        bad_keys = [key for key in settings if key not in current and key not in su.DEFAULT_WHITELIST_KEYS]
+        if bad_keys:
+            raise ValueError("invalid key(s) found in 'settings': {}".format(', '.join(bad_keys)))
+        delta = {key: value for key, value in settings.items() if key not in current or value != current[key]}
+        if not delta:
+            return None, None
+        return OPERATION_UPDATE, delta
+
+    async def _submit(self, session, service_id, name, operation, delta, current):
+        # returns (ok, the response, the Solace Cloud request id or None)
+        if self.is_solace_cloud:
+            body = su.compose_solace_cloud_client_profile_body(operation, name, delta, current)
+            ok, resp = await session.submit_solace_cloud_request(self._requests_path(service_id), body)
+            return ok, (resp if not ok else None), (resp if ok else None)
+        if operation == OPERATION_CREATE:
+            mandatory = {
+                self.LOOKUP_ITEM_KEY: name
+            }
+            data = su.merge_dicts(su.SOLACE_CLOUD_CLIENT_PROFILE_DEFAULTS, mandatory, delta)
+            ok, resp = await session.make_post_request(self._item_path(service_id, name)[:-1], data)
+        elif operation == OPERATION_UPDATE:
+            ok, resp = await session.make_patch_request(self._item_path(service_id, name), delta)
+        else:
+            ok, resp = await session.make_delete_request(self._item_path(service_id, name))
+        return ok, resp, None
+
+    async def _run(self, profiles):
+        service_ids = self.get_service_ids()
+        targets = [(service_id, name) for service_id in service_ids for name in profiles]
+        changes = []
+        failures = []
+        async with sa.SolaceAsyncSession(self.solace_config, self.module.params['max_workers']) as session:
+            # 1) current state of all profiles
+            currents = await asyncio.gather(*[self._get(session, service_id, name) for service_id, name in targets])
+            planned = []
+            for (service_id, name), (ok, current) in zip(targets, currents):
+                if not ok:
+                    failures.append(dict(name=name, service_id=service_id, operation=OPERATION_GET, error=current))
+                    continue
+                try:
+                    operation, delta = self.plan_profile(name, profiles[name], current)
+                except ValueError as e:
+                    failures.append(dict(name=name, service_id=service_id, operation=OPERATION_UPDATE, error=str(e)))
+                    continue
+                if operation is not None:
+                    planned.append((service_id, name, operation, delta, current))
+            if self.module.check_mode:
+                changes = [self._describe(service_id, name, operation, delta) for service_id, name, operation, delta, _current in planned]
+                return len(targets), changes, failures
+            # 2) submit all requests
+            submitted = await asyncio.gather(*[self._submit(session, *item) for item in planned])
+            # 3) await all long running Solace Cloud requests with one poller
+            request_ids = [(item[0], request_id) for item, (ok, resp, request_id) in zip(planned, submitted) if ok and request_id is not None]
+            outcomes = await session.await_solace_cloud_requests(request_ids) if request_ids else dict()
+
+        for (service_id, name, operation, delta, _current), (ok, resp, request_id) in zip(planned, submitted):
+            if ok and request_id is not None:
+                ok, resp = outcomes[(service_id, request_id)]
+            if ok:
+                changes.append(self._describe(service_id, name, operation, delta))
+            else:
+                failures.append(dict(self._describe(service_id, name, operation, None), error=resp))
+        return len(targets), changes, failures
+
+    def _describe(self, service_id, name, operation, delta):
+        description = dict(name=name, operation=operation)
+        if self.is_solace_cloud:
+            description['service_id'] = service_id
+        if operation == OPERATION_UPDATE and delta:
+            description['delta'] = delta
+        return description
+
+    def do_task(self):
+        params = self.module.params
+        try:
+            profiles = sr.normalize_members(params['client_profiles'], params['settings'], self.is_solace_cloud)
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), changed=False)
+
+        count, changes, failures = sa.run(self._run(profiles))
+
+        summary = dict(profiles=count, created=0, updated=0, deleted=0, unchanged=0, failed=len(failures))
+        for change in changes:
+            summary[_OPERATION_OUTCOMES[change['operation']]] += 1
+        summary['unchanged'] = count - len(changes) - len(failures)
+        result = dict(changed=len(changes) > 0, summary=summary, changes=changes, failures=failures)
+        if failures:
+            self.module.fail_json(msg="failed to apply {} client profile(s)".format(len(failures)), **result)
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        client_profiles=dict(type='list', required=True),
+        settings=dict(type='dict', required=False),
+        solace_cloud_service_ids=dict(type='list', required=False, default=None),
+        max_workers=dict(type='int', default=sr.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_state())
+    arg_spec.update(su.arg_spec_solace_cloud_config())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceClientProfilesTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,302 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_reconcile as sr
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_collection
+
+short_description: Reconcile the members of a collection, e.g. the subscriptions of a queue, with a desired set.
+
+description:
+- "Ensures a parent object's collection contains exactly the given members: missing members are added, all others removed."
+- "Reads the current members with one paged list call and adds / removes the difference concurrently,
+   instead of one task per member with its own GET & POST."
+- "Supported collections: acl profile publish & subscribe topic exceptions and client connect exceptions,
+   bridge remote subscriptions, mqtt session subscriptions, queue subscriptions."
+
+notes:
+- "Only the membership is reconciled. Settings are applied to added members, existing members are not updated.
+   Use the member's module to update one, e.g. M(solace_mqtt_session_subscription) to change the QoS."
+- "Failed members fail the module, the others are still applied."
+- "Not supported: Solace Cloud API."
+
+options:
+  type:
+    description: The type of the members.
+    type: str
+    required: true
+    choices:
+      - acl_publish_topic_exception
+      - acl_subscribe_topic_exception
+      - acl_client_connect_exception
+      - bridge_remote_subscription
+      - mqtt_session_subscription
+      - queue_subscription
+  members:
+    description:
+      - "The desired members: names or dicts with 'name' and optional 'settings'."
+      - "state=present: the members to ensure. state=absent: the members to remove."
+    type: list
+    required: true
+  settings:
+    description: Settings of added members without their own settings.
+    type: dict
+    required: false
+  exact:
+    description: "state=present only. If true, members not in 'members' are removed. If false, they are kept."
+    type: bool
+    default: true
+  acl_profile_name:
+    description: The ACL profile. Required for the acl_* types.
+    type: str
+  topic_syntax:
+    description: The topic syntax of the acl topic exceptions. Members with another syntax are left alone.
+    type: str
+    default: smf
+  bridge_name:
+    description: The bridge. Required for type bridge_remote_subscription.
+    type: str
+  mqtt_session_client_id:
+    description: The client id of the MQTT session. Required for type mqtt_session_subscription.
+    type: str
+    aliases: [client_id]
+  virtual_router:
+    description: "The virtual router of the bridge / the MQTT session. Default: bridge: auto, MQTT session: primary."
+    type: str
+  queue_name:
+    description: The queue. Required for type queue_subscription.
+    type: str
+  max_workers:
+    description: Max number of members added / removed concurrently.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.state
+- solace.semp_version
+
+seealso:
+- module: solace_acl_publish_topic_exception
+- module: solace_acl_subscribe_topic_exception
+- module: solace_acl_client_connect_exception
+- module: solace_bridge_remote_subscription
+- module: solace_mqtt_session_subscription
+- module: solace_queue_subscription
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Set the publish topic exceptions of an acl profile
+  solace_collection:
+    msg_vpn: foo
+    type: acl_publish_topic_exception
+    acl_profile_name: acl_orders
+    members: "{{ orders_publish_topics }}"
+
+- name: Add subscriptions to a queue, keep the existing ones
+  solace_collection:
+    msg_vpn: foo
+    type: queue_subscription
+    queue_name: q_orders
+    exact: false
+    members:
+      - orders/>
+      - returns/>
+
+- name: Set the subscriptions of an MQTT session
+  solace_collection:
+    msg_vpn: foo
+    type: mqtt_session_subscription
+    client_id: orders-app
+    settings:
+      subscriptionQos: 1
+    members:
+      - orders/+/created
+      - name: orders/+/audit
+        settings:
+          subscriptionQos: 0
+
+- name: Remove subscriptions from a bridge
+  solace_collection:
+    msg_vpn: foo
+    type: bridge_remote_subscription
+    bridge_name: bridge_orders
+    members:
+      - orders/>
+    state: absent
+'''
+
+RETURN = '''
+summary:
+    description: Number of members per outcome.
+    type: dict
+    returned: always
+    sample:
+        current: 3000
+        desired: 3010
+        added: 12
+        removed: 2
+        failed: 0
+added:
+    description: The added members. In check mode, the members that would be added.
+    type: list
+    returned: always
+removed:
+    description: The removed members. In check mode, the members that would be removed.
+    type: list
+    returned: always
+failures:
+    description: The failed members with the operation & error.
+    type: list
+    returned: always
+'''
+
+# type -> the type's parent args: (arg, module param, default)
+COLLECTION_ARGS = {
+    'acl_publish_topic_exception': [('acl_profile_name', 'acl_profile_name', None), ('topic_syntax', 'topic_syntax', None)],
+    'acl_subscribe_topic_exception': [('acl_profile_name', 'acl_profile_name', None), ('topic_syntax', 'topic_syntax', None)],
+    'acl_client_connect_exception': [('acl_profile_name', 'acl_profile_name', None)],
+    'bridge_remote_subscription': [('bridge_name', 'bridge_name', None), ('bridge_virtual_router', 'virtual_router', 'auto')],
+    'mqtt_session_subscription': [('mqtt_session_client_id', 'mqtt_session_client_id', None), ('virtual_router', 'virtual_router', 'primary')],
+    'queue_subscription': [('queue', 'queue_name', None)]
+}
+
+
+class SolaceCollectionTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def get_object_type(self):
+        collection_type = self.module.params['type']
+        if collection_type == 'acl_publish_topic_exception':
+            return so.get_acl_topic_exception_type('publish', self.get_semp_version())
+        if collection_type == 'acl_subscribe_topic_exception':
+            return so.get_acl_topic_exception_type('subscribe', self.get_semp_version())
+        return so.get_object_type(collection_type)
+
+    def get_collection_args(self):
+        params = self.module.params
+        args = dict(msg_vpn=params['msg_vpn'])
+        missing = []
+        for arg, param, default in COLLECTION_ARGS[params['type']]:
+            value = params[param] if params[param] is not None else default
+            if value is None:
+                missing.append(param)
+            args[arg] = value
+        if missing:
+            self.module.fail_json(msg="type={} requires: {}".format(params['type'], ', '.join(missing)), changed=False)
+        return args
+
+    def ensure_magic_queue(self, args, members, added):
+        # QoS 1 subscriptions: the session's magic queue must be ON/ON, see solace_mqtt_session_subscription
+        if not any((members[name] or {}).get('subscriptionQos') == 1 for name in added):
+            return True, None
+        return su.ensure_mqtt_magic_queue_enabled(self.solace_config, args['msg_vpn'], args['mqtt_session_client_id'],
+                                                  args['virtual_router'])
+
+    def do_task(self):
+        params = self.module.params
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_collection does not support the Solace Cloud API", changed=False)
+        args = self.get_collection_args()
+        try:
+            object_type = self.get_object_type()
+            members = sr.normalize_members(params['members'], params['settings'])
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), changed=False)
+
+        reconciler = sr.SolaceCollectionReconciler(self.solace_config, object_type, args, params['max_workers'])
+        ok, resp = reconciler.reconcile(members, params['state'], params['exact'], self.module.check_mode)
+        result = dict(changed=len(resp['added']) > 0 or len(resp['removed']) > 0)
+        result.update(resp)
+        if 'error' in resp:
+            self.module.fail_json(msg="failed to retrieve the current members", **result)
+        if object_type.name == 'mqtt_session_subscription' and not self.module.check_mode:
+            ok_mq, resp_mq = self.ensure_magic_queue(args, members, resp['added'])
+            if not ok_mq:
+                result['failures'].append(dict(operation='magic_queue', error=resp_mq))
+                ok = False
+        if not ok:
+            self.module.fail_json(msg="failed to reconcile {} member(s)".format(len(result['failures'])), **result)
+        return result
+
+
+def run_module():
+    module_args = dict(
+        type=dict(type='str', required=True, choices=list(COLLECTION_ARGS.keys())),
+        members=dict(type='list', required=True),
+        settings=dict(type='dict', required=False),
+        exact=dict(type='bool', default=True),
+        acl_profile_name=dict(type='str'),
+        topic_syntax=dict(type='str', default='smf'),
+        bridge_name=dict(type='str'),
+        mqtt_session_client_id=dict(type='str', aliases=['client_id']),
+        virtual_router=dict(type='str'),
+        queue_name=dict(type='str'),
+        max_workers=dict(type='int', default=sr.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_state())
+    arg_spec.update(su.arg_spec_semp_version())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceCollectionTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_export as se
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_config_export
+
+short_description: Export the configuration of a msg vpn into a file.
+
+description:
+- "Exports the msg vpn and its objects into a gzip compressed JSON-lines file: one line per object, in dependency order,
+   i.e. parents and referenced objects before the objects depending on them."
+- "Walks the vpn's object tree level by level with paged list calls, all collections of a level concurrently.
+   Objects are written as they arrive: the file is streamed, the export is not held in memory."
+- "The file is only replaced if all collections were read."
+- "Read only, never changes the broker."
+
+notes:
+- "Write-only values, e.g. passwords, are not exported: the broker never returns them."
+- "System objects, i.e. names starting with '#', are skipped unless include_system_objects is set."
+- "Not supported: Solace Cloud API."
+
+options:
+  path:
+    description: Path of the export file, e.g. 'exports/orders.jsonl.gz'. Missing directories are created.
+    type: str
+    required: true
+  object_types:
+    description:
+      - "The exported object types. A child type requires its parent type, e.g. queue_subscription requires queue."
+      - "Default: all objects of the msg vpn, see module_utils solace_export.DEFAULT_OBJECT_TYPES."
+    type: list
+    required: false
+  include_system_objects:
+    description: Export the system objects as well, e.g. '#acl-profile'.
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of requests in flight.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.semp_version
+
+seealso:
+- module: solace_drift
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Export the vpn
+  solace_config_export:
+    msg_vpn: orders
+    path: "exports/{{ inventory_hostname }}/orders.jsonl.gz"
+  register: result
+
+- name: Export the queues & their subscriptions only
+  solace_config_export:
+    msg_vpn: orders
+    path: exports/orders-queues.jsonl.gz
+    object_types:
+      - queue
+      - queue_subscription
+'''
+
+RETURN = '''
+path:
+    description: The path of the export file.
+    type: str
+    returned: success
+summary:
+    description: Number of exported objects, in total & per object type, and number of dependency levels.
+    type: dict
+    returned: always
+    sample:
+        objects: 20512
+        levels: 4
+        types:
+            client_profile: 3
+            queue: 5000
+            queue_subscription: 15000
+failures:
+    description: The failed reads.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceConfigExportTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_config_export does not support the Solace Cloud API", **result)
+        object_types = params['object_types'] or se.DEFAULT_OBJECT_TYPES
+        semp_version = None
+        if any(name in se.ACL_TOPIC_EXCEPTION_TYPES for name in object_types):
+            semp_version = self.get_semp_version()
+        try:
+            exporter = se.SolaceConfigExporter(self.solace_config, params['msg_vpn'], object_types, semp_version,
+                                               params['max_workers'], params['include_system_objects'])
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        path = None if self.module.check_mode else params['path']
+        summary, failures = exporter.export(path)
+        result['summary'] = summary
+        if failures:
+            result['failures'] = failures
+            self.module.fail_json(msg="failed to read {} collection(s)".format(len(failures)), **result)
+        result.update(changed=True, path=params['path'])
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        path=dict(type='str', required=True),
+        object_types=dict(type='list', required=False, default=None),
+        include_system_objects=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=se.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_semp_version())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceConfigExportTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_export as se
+import ansible.module_utils.network.solace.solace_import as si
+import ansible.module_utils.network.solace.solace_journal as sj
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_config_import
+
+short_description: Import / restore the configuration of a msg vpn from an export file.
+
+description:
+- "Applies an export file of M(solace_config_export) to a msg vpn, e.g. to rebuild a broker or to copy a vpn."
+- "Streams the file: objects are read in batches of one dependency level and each batch is applied concurrently
+   with the logic of the objects' modules, i.e. GET, then POST if missing or PATCH of the changed settings. Objects
+   whose parent failed are skipped."
+- "Idempotent: objects which match the file are not changed."
+
+notes:
+- "Write-only values, e.g. passwords, are not part of an export: set them with the objects' modules after the import."
+- "The objects' args are imported as exported except msg_vpn, which is replaced by the module's msg_vpn."
+- "Not supported: Solace Cloud API."
+
+options:
+  path:
+    description: Path of the export file.
+    type: str
+    required: true
+  manage_vpn:
+    description: "If true, the msg vpn itself is created / updated with the exported vpn settings first."
+    type: bool
+    default: false
+  object_types:
+    description: The imported object types. Default: all types of the file.
+    type: list
+    required: false
+  checkpoint:
+    description:
+      - "Path of a checkpoint file. Written after each batch and removed once the whole file is applied.
+         After a failure, the next run with the same checkpoint resumes at the first batch with a failure."
+      - "A checkpoint of another export file, broker or msg vpn is rejected."
+    type: str
+    required: false
+  max_workers:
+    description: Max number of objects applied concurrently.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.semp_version
+- solace.journal
+
+seealso:
+- module: solace_config_export
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Rebuild the vpn on the disaster recovery broker
+  solace_config_import:
+    host: broker-dr.example.com
+    msg_vpn: orders
+    manage_vpn: true
+    path: exports/orders.jsonl.gz
+    checkpoint: exports/orders.checkpoint.json
+    journal: exports/orders.journal
+    max_workers: 20
+'''
+
+RETURN = '''
+summary:
+    description: Number of objects per outcome, the number of dependency levels & the line the import resumed from.
+    type: dict
+    returned: always
+    sample:
+        objects: 20512
+        levels: 4
+        created: 20500
+        updated: 2
+        unchanged: 10
+        failed: 0
+        skipped: 0
+        resumed_from_line: 0
+failures:
+    description: The failed & skipped objects with the error.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceConfigImportTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_config_import does not support the Solace Cloud API", **result)
+        semp_version = None
+        if any(name in se.ACL_TOPIC_EXCEPTION_TYPES for name in (params['object_types'] or se.ACL_TOPIC_EXCEPTION_TYPES)):
+            semp_version = self.get_semp_version()
+        journal = sj.get_journal(params['journal'])
+        importer = si.SolaceConfigImporter(self.module, self.solace_config, params['msg_vpn'], params['object_types'],
+                                           params['manage_vpn'], semp_version, params['max_workers'], journal=journal)
+        checkpoint = None if self.module.check_mode else params['checkpoint']
+        try:
+            summary, failures = importer.import_file(params['path'], checkpoint)
+        except (IOError, ValueError) as e:
+            self.module.fail_json(msg=str(e), **result)
+        finally:
+            if journal is not None:
+                journal.close()
+        if journal is not None and not failures and not self.module.check_mode:
+            journal.remove()
+        result.update(changed=(summary['created'] + summary['updated']) > 0, summary=summary)
+        if failures:
+            result['failures'] = failures
+            msg = "failed to import {} object(s), skipped {} depending object(s)".format(summary['failed'], summary['skipped'])
+            self.module.fail_json(msg=msg, **result)
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        path=dict(type='str', required=True),
+        manage_vpn=dict(type='bool', default=False),
+        object_types=dict(type='list', required=False, default=None),
+        checkpoint=dict(type='str', required=False, default=None),
+        max_workers=dict(type='int', default=si.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_semp_version())
+    arg_spec.update(su.arg_spec_journal())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceConfigImportTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
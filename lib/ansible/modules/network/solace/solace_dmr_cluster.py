@@ -108,6 +108,10 @@ class SolaceDMRClusterTask(su.SolaceTask):
     def get_args(self):
         return []
 
+    def get_config_marker_scope(self):
+        # dmr clusters are not part of the msg vpn's config-sync key
+        return None
+
     def get_func(self, solace_config, lookup_item_value):
         # GET /dmrClusters/{dmrClusterName}
         path_array = [su.SEMP_V2_CONFIG, su.DMR_CLUSTERS, lookup_item_value]
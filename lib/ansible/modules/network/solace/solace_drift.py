@@ -0,0 +1,255 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_drift as sd
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_drift
+
+short_description: Detect the drift of a msg vpn from another broker's vpn or from a vpn spec.
+
+description:
+- "Compares a msg vpn with a reference: the msg vpn of another broker or a declarative vpn spec."
+- "Reads both sides with bulk list calls into trees with content digests per object & subtree (vpn, object types, objects, children)
+   and compares them top-down: equal subtrees are skipped, only mismatching ones are walked."
+- "Child collections, e.g. queue subscriptions, are only read for parents which exist on both sides."
+- "Read only, never changes the broker."
+
+notes:
+- "Write-only values, e.g. passwords, are not compared: the broker never returns them."
+- "Not supported: Solace Cloud API."
+
+options:
+  reference:
+    description:
+      - "The reference broker: dict with msg_vpn and the broker options, i.e. host, port, secure_connection, username,
+         password, timeout & x_broker. Options not given are taken from the module's options."
+      - "Mutually exclusive with spec."
+    type: dict
+    required: false
+  spec:
+    description:
+      - "The reference vpn spec, same format as the spec of M(solace_vpn_apply)."
+      - "Mutually exclusive with reference."
+    type: dict
+    required: false
+  exact:
+    description:
+      - "If true, objects & attributes which only exist in the msg vpn are reported as well."
+      - "If false, only the reference's objects & attributes are compared, e.g. the settings listed in a spec."
+      - "Default: true for a reference broker, false for a spec."
+    type: bool
+    required: false
+  object_types:
+    description:
+      - "The compared object types. Children are only compared with their parent type."
+      - "Default: the objects directly below the vpn plus their subscriptions, client connect exceptions,
+         rest consumers, queue bindings & bridge remote vpns."
+    type: list
+    required: false
+  ignore_keys:
+    description: Attributes which are not compared, e.g. attributes which differ between environments on purpose.
+    type: list
+    required: false
+  max_workers:
+    description: Max number of requests in flight per broker.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+
+seealso:
+- module: solace_vpn_apply
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Compare the vpn with the same vpn on the standby site
+  solace_drift:
+    msg_vpn: orders
+    reference:
+      host: broker-dr.example.com
+    ignore_keys:
+      - replicationEnabled
+  register: result
+
+- name: Compare the vpn with its spec
+  solace_drift:
+    msg_vpn: orders
+    spec: "{{ vpn_spec }}"
+  register: result
+
+- fail:
+    msg: "drift detected: {{ result.differences }}"
+  when: result.drift
+'''
+
+RETURN = '''
+drift:
+    description: True if any difference was found.
+    type: bool
+    returned: always
+summary:
+    description: Number of differences per status & of compared objects.
+    type: dict
+    returned: always
+    sample:
+        actual_objects: 1520
+        reference_objects: 1521
+        compared: 4
+        missing: 1
+        extra: 0
+        changed: 1
+differences:
+    description:
+      - "The differences. status: missing (only in the reference), extra (only in the msg vpn)
+         or changed (with the attributes' actual & expected values)."
+    type: list
+    returned: always
+    sample:
+        - type: queue
+          name: q_orders
+          msg_vpn: orders
+          status: changed
+          attributes:
+            maxMsgSpoolUsage:
+              actual: 1000
+              expected: 5000
+failures:
+    description: The failed reads.
+    type: list
+    returned: on failure
+'''
+
+class SolaceDriftTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def get_reference_config(self):
+        params = self.module.params
+        reference = params['reference']
+        options = su.get_broker_list_item_options(reference, params)
+        solace_config = su.SolaceConfig(
+            vmr_host=options['host'],
+            vmr_port=options['port'],
+            vmr_auth=(options['username'], options['password']),
+            vmr_secure=options['secure_connection'],
+            vmr_timeout=options['timeout'],
+            x_broker=options['x_broker']
+        )
+        return solace_config, reference.get('msg_vpn') or params['msg_vpn']
+
+    def do_task(self):
+        params = self.module.params
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_drift does not support the Solace Cloud API", changed=False)
+        if (params['reference'] is None) == (params['spec'] is None):
+            self.module.fail_json(msg="provide either 'reference' or 'spec'", changed=False)
+        object_types = params['object_types'] or sd.DEFAULT_OBJECT_TYPES
+        result = dict(changed=False, drift=False)
+
+        if params['reference'] is not None:
+            exact = params['exact'] if params['exact'] is not None else True
+            sides = [(self.solace_config, params['msg_vpn']), self.get_reference_config()]
+            (actual, expected), failures = sd.read_broker_trees(sides, object_types, params['ignore_keys'], params['max_workers'])
+        else:
+            exact = params['exact'] if params['exact'] is not None else False
+            try:
+                expected, spec_types = sd.build_spec_tree(params['msg_vpn'], params['spec'], params['ignore_keys'])
+            except ValueError as e:
+                self.module.fail_json(msg=str(e), **result)
+            if not params['object_types'] and not exact:
+                object_types = spec_types
+            actual, failures = sd.read_broker_tree_for_spec(self.solace_config, params['msg_vpn'], expected,
+                                                            object_types, params['ignore_keys'], params['max_workers'])
+        if failures:
+            result['failures'] = failures
+            self.module.fail_json(msg="failed to read {} collection(s)".format(len(failures)), **result)
+
+        comparison = sd.SolaceDriftComparison(object_types)
+        differences = comparison.compare(actual, expected, exact)
+        summary = dict(actual_objects=actual.root.count(), reference_objects=expected.root.count(), compared=comparison.compared,
+                       missing=0, extra=0, changed=0)
+        for difference in differences:
+            summary[difference['status']] += 1
+        result.update(drift=len(differences) > 0, summary=summary, differences=differences)
+        return result
+
+
+def arg_spec_reference():
+    arg_spec = su.arg_spec_broker_list_item()
+    arg_spec.update(msg_vpn=dict(type='str', required=False))
+    return arg_spec
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        reference=dict(type='dict', required=False, default=None, options=arg_spec_reference()),
+        spec=dict(type='dict', required=False, default=None),
+        exact=dict(type='bool', required=False, default=None),
+        object_types=dict(type='list', required=False, default=None),
+        ignore_keys=dict(type='list', required=False, default=None),
+        max_workers=dict(type='int', default=sd.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceDriftTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -238,7 +238,7 @@ def make_get_request(solace_config, path_array):
     path = su.compose_path(path_array)
 
     try:
-        resp = requests.get(
+        resp = sc.get_http_session().get(
                     solace_config.vmr_url + path,
                     json=None,
                     auth=solace_config.vmr_auth,
@@ -261,7 +261,7 @@ def make_sempv1_post_request(solace_config, xml_data):
         'Content-Type': 'application/xml',
         'x-broker-name': solace_config.x_broker
     }
-    resp = requests.post(
+    resp = sc.get_http_session().post(
                 solace_config.vmr_url + "/SEMP",
                 data=xml_data,
                 auth=solace_config.vmr_auth,
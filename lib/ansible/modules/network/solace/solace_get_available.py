@@ -34,11 +34,14 @@ import ansible.module_utils.network.solace.solace_utils as su
 import ansible.module_utils.network.solace.solace_common as sc
 from ansible.module_utils.basic import AnsibleModule
 import traceback
+import time
+from xml.parsers.expat import ExpatError
 
 HAS_IMPORT_ERROR = False
 IMPORT_ERR_TRACEBACK = None
 try:
     import requests
+    from ansible.errors import AnsibleError
 except ImportError:
     HAS_IMPORT_ERROR = True
     IMPORT_ERR_TRACEBACK = traceback.format_exc()
@@ -53,6 +56,30 @@ short_description: Check if broker/service is reachable and responsive.
 description: >
   Check if broker/service is reachable and responsive.
   Calls "GET /about" and sets "is_available=True/False".
+  With "wait_for_broker=true", polls until the broker is available or "wait_timeout" has passed.
+
+notes:
+- "wait_for_broker: polls in-process, starting every 0.1 seconds and backing off to every 2 seconds.
+   The interval starts over each time one more check passes, e.g. SEMP v2 is up but SEMP v1 isn't yet."
+- "The connection of the last probe is kept open in the module's connection pool."
+
+options:
+  wait_for_broker:
+    description: Poll until the broker is available or until wait_timeout.
+    type: bool
+    default: false
+  wait_timeout:
+    description: Max seconds to wait for the broker. Only used with wait_for_broker.
+    type: int
+    default: 300
+  check_semp_v1:
+    description: The broker is only available once SEMP v1 responds as well.
+    type: bool
+    default: false
+  check_config_sync:
+    description: The broker is only available once config-sync is up, if enabled. Implies check_semp_v1.
+    type: bool
+    default: false
 
 extends_documentation_fragment:
 - solace.broker
@@ -84,6 +111,14 @@ EXAMPLES = '''
       until: "_result.is_available"
       retries: 25 # 25 * 5 seconds
       delay: 5 # Every 5 seconds
+
+    - name: "Wait until broker, SEMP v1 & config-sync ready"
+      solace_get_available:
+        wait_for_broker: true
+        wait_timeout: 120
+        check_config_sync: true
+      register: _result
+      failed_when: not _result.is_available
 '''
 
 RETURN = '''
@@ -93,18 +128,30 @@ is_available:
 msg:
     description: The response from the HTTP call or error description.
     type: str
+wait:
+    description: "Outcome of wait_for_broker: seconds waited, number of probes & the last check failed, if any."
+    type: dict
+    returned: wait_for_broker
 
 samples:
 
     "is_available": false,
     "msg": "('Connection aborted.', RemoteDisconnected('Remote end closed connection without response'))",
-
+    "wait": {
+        "elapsed": 300.04,
+        "probes": 157,
+        "failed_check": "semp_v2"
+    }
 
 '''
 
 
 class SolaceGetAvailableTask(su.SolaceTask):
 
+    WAIT_MIN_INTERVAL = 0.1  # seconds
+    WAIT_MAX_INTERVAL = 2.0  # seconds
+    WAIT_BACKOFF = 1.5
+
     def __init__(self, module):
         sc.module_fail_on_import_error(module, HAS_IMPORT_ERROR, IMPORT_ERR_TRACEBACK)
         su.SolaceTask.__init__(self, module)
@@ -116,13 +163,82 @@ class SolaceGetAvailableTask(su.SolaceTask):
             return False, resp
         return True, resp
 
+    def get_semp_v1_available(self):
+        ok, resp = make_sempv1_request(self.solace_config, '<rpc><show><version/></show></rpc>')
+        if not ok:
+            return False, resp
+        try:
+            return True, resp['rpc-reply']['rpc']['show']
+        except (KeyError, TypeError):
+            # a starting broker may answer with an unexpected body: not available yet
+            return False, resp
+
+    def get_config_sync_available(self):
+        ok, resp = make_sempv1_request(self.solace_config, '<rpc><show><config-sync/></show></rpc>')
+        if not ok:
+            return False, resp
+        try:
+            status = resp['rpc-reply']['rpc']['show']['config-sync']['status']
+        except (KeyError, TypeError):
+            return False, resp
+        if not isinstance(status, dict):
+            return False, resp
+        # config-sync not enabled: nothing to wait for
+        if status.get('admin-status') != 'Enabled' or status.get('oper-status') == 'Up':
+            return True, status
+        return False, status
+
+    def get_checks(self):
+        checks = [('semp_v2', self.get_available)]
+        if self.module.params['check_semp_v1'] or self.module.params['check_config_sync']:
+            checks.append(('semp_v1', self.get_semp_v1_available))
+        if self.module.params['check_config_sync']:
+            checks.append(('config_sync', self.get_config_sync_available))
+        return checks
+
+    def run_checks(self, checks):
+        # returns: the name of the first check failed or None, the last response
+        resp = None
+        for name, check_func in checks:
+            ok, resp = check_func()
+            if not ok:
+                return name, resp
+        return None, resp
+
+    def wait_for_broker(self):
+        checks = self.get_checks()
+        check_names = [name for name, _ in checks]
+        timeout = self.solace_config.vmr_timeout
+        start = time.monotonic()
+        deadline = start + self.module.params['wait_timeout']
+        interval = self.WAIT_MIN_INTERVAL
+        probes = 0
+        last_failed_check = None
+        while True:
+            # don't let a hanging probe overrun the deadline
+            self.solace_config.vmr_timeout = max(min(timeout, deadline - time.monotonic()), self.WAIT_MIN_INTERVAL)
+            probes += 1
+            failed_check, resp = self.run_checks(checks)
+            now = time.monotonic()
+            if failed_check is None or now >= deadline:
+                break
+            if last_failed_check is not None and check_names.index(failed_check) > check_names.index(last_failed_check):
+                # progress: the broker is coming up, the next check is likely to pass soon
+                interval = self.WAIT_MIN_INTERVAL
+            last_failed_check = failed_check
+            time.sleep(min(interval, max(deadline - now, 0)))
+            interval = min(interval * self.WAIT_BACKOFF, self.WAIT_MAX_INTERVAL)
+        self.solace_config.vmr_timeout = timeout
+        wait = dict(elapsed=round(time.monotonic() - start, 2), probes=probes, failed_check=failed_check)
+        return (failed_check is None), resp, wait
+
 
 def make_get_request(solace_config, path_array):
 
     path = su.compose_path(path_array)
 
     try:
-        resp = requests.get(
+        resp = sc.get_http_session().get(
                     solace_config.vmr_url + path,
                     json=None,
                     auth=solace_config.vmr_auth,
@@ -140,8 +256,20 @@ def make_get_request(solace_config, path_array):
         return False, str(e)
 
 
+def make_sempv1_request(solace_config, xml_data):
+    try:
+        return sc.make_sempv1_post_request(solace_config, xml_data)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, AnsibleError, ExpatError) as e:
+        # AnsibleError: http status != 200, ExpatError: not xml, e.g. while the broker is starting up
+        return False, str(e)
+
+
 def run_module():
     module_args = dict(
+        wait_for_broker=dict(type='bool', default=False),
+        wait_timeout=dict(type='int', default=300),
+        check_semp_v1=dict(type='bool', default=False),
+        check_config_sync=dict(type='bool', default=False)
     )
     arg_spec = su.arg_spec_broker()
     arg_spec.update(module_args)
@@ -158,7 +286,11 @@ def run_module():
     )
 
     solace_task = SolaceGetAvailableTask(module)
-    ok, resp = solace_task.get_available()
+    if module.params['wait_for_broker']:
+        ok, resp, result['wait'] = solace_task.wait_for_broker()
+    else:
+        failed_check, resp = solace_task.run_checks(solace_task.get_checks())
+        ok = (failed_check is None)
     result['is_available'] = ok
     module.exit_json(msg=resp, **result)
 
@@ -51,8 +51,13 @@ options:
         required: true
         type: str
         examples: "#mqtt/*, #rdp/*"
+    limit:
+        description: Max number of queues to return. Stops paging through the broker's list once reached.
+        required: false
+        type: int
 notes:
 - Uses SEMP v1.
+- "The response is parsed incrementally, page by page."
 - "Reference: U(https://docs.solace.com/Configuring-and-Managing/Monitoring-Guaranteed-Messaging.htm#Viewing)."
 
 extends_documentation_fragment:
@@ -174,12 +179,13 @@ class SolaceGetMagicQueuesTask(su.SolaceTask):
             }
         }
         list_path_array = ['rpc-reply', 'rpc', 'show', 'queue', 'queues', 'queue']
-        return sc.execute_sempv1_get_list(self.solace_config, request, list_path_array)
+        return sc.execute_sempv1_get_list(self.solace_config, request, list_path_array, limit=self.module.params['limit'])
 
 
 def run_module():
     module_args = dict(
-        where_name=dict(type='str', required=True)
+        where_name=dict(type='str', required=True),
+        limit=dict(type='int', required=False, default=None)
     )
     arg_spec = su.arg_spec_broker()
     arg_spec.update(su.arg_spec_vpn())
@@ -0,0 +1,250 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_state as ss
+import ansible.module_utils.network.solace.solace_index as si
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_index_harvest
+
+short_description: Harvest the configuration of many brokers into a local index.
+
+description:
+- "Pulls the list endpoints of one or many brokers concurrently into a local sqlite index file."
+- "Query the index with M(solace_index_query): fleet-wide questions are answered locally,
+   e.g. which brokers have a queue named X or which client usernames use client profile Y."
+- "Incremental: a msg vpn is only harvested again if its config-sync key (configSyncLocalKey) changed since the last harvest."
+
+notes:
+- "Indexed object types: the msg vpns & the objects directly below them, e.g. queues, client usernames, client & acl profiles."
+- "Msg vpns removed from a broker are removed from the index if msg_vpns is not set, i.e. all vpns are harvested."
+- "Not supported: Solace Cloud API."
+
+options:
+  index:
+    description: Path of the index file. Default: env var ANSIBLE_SOLACE_INDEX.
+    type: str
+    required: false
+  broker_name:
+    description: Name of the broker in the index, e.g. the inventory_hostname. Default: the broker's url.
+    type: str
+    required: false
+  msg_vpns:
+    description: The msg vpns to harvest. Default: all msg vpns of the broker.
+    type: list
+    required: false
+  brokers:
+    description:
+      - "Harvests these brokers instead of the one given by host, port, etc., all concurrently."
+      - "Each broker is a dict with: name, msg_vpns and the broker options, i.e. host, port, secure_connection, username,
+         password, timeout & x_broker. Options not given are taken from the module's options."
+    type: list
+    elements: dict
+    required: false
+  object_types:
+    description: The object types to harvest. Default: all.
+    type: list
+    required: false
+    choices: [vpn, client_profile, acl_profile, client_username, queue, topic_endpoint, rdp, bridge, mqtt_session, dmr_bridge]
+  full_refresh:
+    description: If true, harvests all msg vpns, also those with an unchanged config-sync key.
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of requests in flight per broker.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+
+seealso:
+- module: solace_index_query
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Harvest all brokers of the inventory
+  hosts: all
+  gather_facts: no
+  tasks:
+    - name: Harvest the broker
+      solace_index_harvest:
+        host: "{{ sempv2_host }}"
+        port: "{{ sempv2_port }}"
+        username: "{{ sempv2_username }}"
+        password: "{{ sempv2_password }}"
+        broker_name: "{{ inventory_hostname }}"
+        index: ./fleet.index.db
+
+- name: Harvest a list of brokers from one task
+  solace_index_harvest:
+    index: ./fleet.index.db
+    username: admin
+    password: "{{ admin_password }}"
+    brokers:
+      - name: broker-eu-1
+        host: broker-eu-1.example.com
+      - name: broker-us-1
+        host: broker-us-1.example.com
+        msg_vpns:
+          - orders
+'''
+
+RETURN = '''
+summary:
+    description: Number of (broker, msg vpn, object type) harvests per status.
+    type: dict
+    returned: always
+    sample:
+        brokers: 2
+        msg_vpns: 5
+        harvested: 9
+        unchanged: 36
+        failed: 0
+brokers:
+    description: Per broker, the msg vpns with their number of object types per status.
+    type: list
+    returned: always
+failures:
+    description: The failed harvests with the broker, msg vpn, object type & error.
+    type: list
+    returned: always
+'''
+
+class SolaceIndexHarvestTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def get_brokers(self):
+        params = self.module.params
+        if not params['brokers']:
+            broker_id = params['broker_name'] or ss.get_broker_id(self.solace_config)
+            return [(broker_id, self.solace_config, params['msg_vpns'])]
+        brokers = []
+        for broker in params['brokers']:
+            options = su.get_broker_list_item_options(broker, params)
+            solace_config = su.SolaceConfig(
+                vmr_host=options['host'],
+                vmr_port=options['port'],
+                vmr_auth=(options['username'], options['password']),
+                vmr_secure=options['secure_connection'],
+                vmr_timeout=options['timeout'],
+                x_broker=options['x_broker']
+            )
+            broker_id = broker.get('name') or ss.get_broker_id(solace_config)
+            msg_vpns = broker.get('msg_vpns') if broker.get('msg_vpns') is not None else params['msg_vpns']
+            brokers.append((broker_id, solace_config, msg_vpns))
+        return brokers
+
+    def do_task(self):
+        params = self.module.params
+        sc.module_fail_on_import_error(self.module, si.HAS_IMPORT_ERROR, si.IMPORT_ERR_TRACEBACK)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_index_harvest does not support the Solace Cloud API", changed=False)
+        index_path = params['index'] or si.INDEX_PATH
+        if not index_path:
+            self.module.fail_json(msg="no index file: set 'index' or env var ANSIBLE_SOLACE_INDEX", changed=False)
+
+        index = si.get_index(index_path)
+        try:
+            harvester = si.SolaceIndexHarvester(index, self.get_brokers(), params['object_types'], params['max_workers'], params['full_refresh'])
+            broker_results = harvester.harvest()
+        finally:
+            index.close()
+
+        summary = dict(brokers=len(broker_results), msg_vpns=0, harvested=0, unchanged=0, failed=0)
+        failures = []
+        for broker_result in broker_results:
+            summary['msg_vpns'] += len(broker_result['msg_vpns'])
+            for counts in broker_result['msg_vpns'].values():
+                for status, count in counts.items():
+                    summary[status] += count
+            for failure in broker_result.pop('failures'):
+                failures.append(dict(failure, broker=broker_result['broker']))
+        # the index is local: changed reports whether it was updated
+        result = dict(changed=summary['harvested'] > 0, summary=summary, brokers=broker_results, failures=failures)
+        if failures:
+            self.module.fail_json(msg="failed to harvest {} item(s)".format(len(failures)), **result)
+        return result
+
+
+def arg_spec_brokers_item():
+    arg_spec = su.arg_spec_broker_list_item()
+    arg_spec.update(
+        name=dict(type='str', required=False),
+        msg_vpns=dict(type='list', required=False)
+    )
+    return arg_spec
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        index=dict(type='str', required=False, default=None),
+        broker_name=dict(type='str', required=False, default=None),
+        msg_vpns=dict(type='list', required=False, default=None),
+        brokers=dict(type='list', elements='dict', required=False, default=None, options=arg_spec_brokers_item()),
+        object_types=dict(type='list', required=False, default=None, choices=si.INDEX_OBJECT_TYPES),
+        full_refresh=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=si.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=False
+    )
+
+    solace_task = SolaceIndexHarvestTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_index as si
+import os
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_index_query
+
+short_description: Query the local configuration index of a broker fleet.
+
+description:
+- "Finds objects in the index harvested by M(solace_index_harvest). Runs locally, no broker is contacted."
+
+options:
+  index:
+    description: Path of the index file. Default: env var ANSIBLE_SOLACE_INDEX.
+    type: str
+    required: false
+  object_type:
+    description: The object type, e.g. queue or client_username.
+    type: str
+    required: false
+  name:
+    description: The object's name. Glob patterns allowed, e.g. 'orders*'.
+    type: str
+    required: false
+  msg_vpn:
+    description: The msg vpn. Glob patterns allowed.
+    type: str
+    required: false
+  broker:
+    description: The broker's name in the index. Glob patterns allowed.
+    type: str
+    required: false
+  where:
+    description: "Attribute values the objects must have, e.g. {clientProfileName: cp_orders}."
+    type: dict
+    required: false
+  select:
+    description: The attributes returned per object. Default: all.
+    type: list
+    required: false
+  limit:
+    description: Max number of objects returned.
+    type: int
+    required: false
+
+seealso:
+- module: solace_index_harvest
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Which brokers have a queue named q_orders?
+  solace_index_query:
+    index: ./fleet.index.db
+    object_type: queue
+    name: q_orders
+  register: result
+
+- name: Which client usernames use client profile cp_orders?
+  solace_index_query:
+    index: ./fleet.index.db
+    object_type: client_username
+    where:
+      clientProfileName: cp_orders
+    select:
+      - enabled
+'''
+
+RETURN = '''
+objects:
+    description: The matching objects.
+    type: list
+    returned: always
+    sample:
+        - broker: broker-eu-1
+          msg_vpn: orders
+          object_type: queue
+          name: q_orders
+          attributes:
+            queueName: q_orders
+            egressEnabled: true
+count:
+    description: The number of matching objects.
+    type: int
+    returned: always
+'''
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        index=dict(type='str', required=False, default=None),
+        object_type=dict(type='str', required=False, default=None),
+        name=dict(type='str', required=False, default=None),
+        msg_vpn=dict(type='str', required=False, default=None),
+        broker=dict(type='str', required=False, default=None),
+        where=dict(type='dict', required=False, default=None),
+        select=dict(type='list', required=False, default=None),
+        limit=dict(type='int', required=False, default=None)
+    )
+
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+    sc.module_fail_on_import_error(module, si.HAS_IMPORT_ERROR, si.IMPORT_ERR_TRACEBACK)
+    params = module.params
+    index_path = params['index'] or si.INDEX_PATH
+    if not index_path:
+        module.fail_json(msg="no index file: set 'index' or env var ANSIBLE_SOLACE_INDEX", changed=False)
+    if not os.path.isfile(index_path):
+        module.fail_json(msg="index file not found: '{}'. run solace_index_harvest first.".format(index_path), changed=False)
+
+    index = si.get_index(index_path)
+    try:
+        objects = index.query(params['object_type'], params['name'], params['msg_vpn'], params['broker'], params['where'], params['limit'])
+    finally:
+        index.close()
+    if params['select']:
+        for obj in objects:
+            obj['attributes'] = {key: obj['attributes'][key] for key in params['select'] if key in obj['attributes']}
+
+    module.exit_json(changed=False, objects=objects, count=len(objects))
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
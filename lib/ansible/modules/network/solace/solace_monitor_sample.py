@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_monitor as sm
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_monitor_sample
+
+short_description: Sample monitor API objects over time: rates & statistics.
+
+description:
+- "Polls a monitor list of a msg vpn at a fixed interval for a fixed duration, with a select projection of the sampled attributes only."
+- "Gauges, e.g. msgSpoolUsage: min, avg, max, p95, last value & slope (change per second)."
+- "Counters, e.g. spooledByteCount: the rate per second between two samples, summarized the same way."
+- "min, avg & max cover all samples. p95, slope & history cover the last history_size samples, kept in a ring buffer per object & attribute."
+- "Read only, never changes the broker."
+
+notes:
+- "Reference Monitor: U(https://docs.solace.com/API-Developer-Online-Ref-Documentation/swagger-ui/monitor/index.html)."
+- "Rates need at least 2 samples: set duration to at least one interval."
+- "Counter resets, e.g. after clearing the stats, are skipped."
+- "Not supported: Solace Cloud API."
+
+options:
+  resource:
+    description: The sampled monitor resource of the msg vpn.
+    type: str
+    default: queues
+    choices:
+      - vpn
+      - queues
+      - topic_endpoints
+      - clients
+      - bridges
+  gauges:
+    description:
+      - "Attributes sampled as they are."
+      - "Default: vpn: msgSpoolUsage, msgSpoolMsgCount. queues, topic_endpoints: msgSpoolUsage, bindCount."
+    type: list
+    required: false
+  counters:
+    description:
+      - "Attributes sampled as rates per second."
+      - "Default: vpn, clients: dataRxMsgCount, dataTxMsgCount, dataRxByteCount, dataTxByteCount. queues, topic_endpoints: spooledMsgCount, spooledByteCount.
+         bridges: dataRxMsgCount, dataTxMsgCount."
+    type: list
+    required: false
+  where:
+    description: "Where conditions of the list, e.g. 'queueName==orders*'. See the SEMP documentation of the where parameter."
+    type: list
+    required: false
+  interval:
+    description: Seconds between two samples.
+    type: float
+    default: 5
+  duration:
+    description: Seconds to sample for. 0 takes one sample.
+    type: float
+    default: 60
+  history_size:
+    description: Max number of samples kept per object & attribute for p95, slope & history.
+    type: int
+    default: 60
+  return_history:
+    description: Return the kept samples per object & attribute, as [seconds since the first sample, value].
+    type: bool
+    default: false
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+
+seealso:
+- module: solace_get_queues
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Sample the queue backlogs for 2 minutes
+  solace_monitor_sample:
+    msg_vpn: orders
+    resource: queues
+    where:
+      - "queueName==orders*"
+    interval: 10
+    duration: 120
+  register: result
+
+- name: Stop the rollout if a backlog is growing
+  fail:
+    msg: "backlog of {{ item.name }} grows by {{ item.gauges.msgSpoolUsage.slope }} bytes/s"
+  loop: "{{ result.objects }}"
+  when: item.gauges.msgSpoolUsage.slope is not none and item.gauges.msgSpoolUsage.slope > 0
+'''
+
+RETURN = '''
+samples:
+    description: Number of successful samples.
+    type: int
+    returned: always
+objects:
+    description: The sampled objects with the summaries of their gauges & rates.
+    type: list
+    returned: success
+    sample:
+        - name: orders-q
+          gauges:
+            msgSpoolUsage:
+              min: 0
+              avg: 10240.5
+              max: 20480
+              p95: 20480
+              last: 20480
+              slope: 170.7
+          rates:
+            spooledMsgCount:
+              min: 0.0
+              avg: 12.5
+              max: 25.0
+              p95: 25.0
+              last: 25.0
+              slope: 0.2
+failures:
+    description: The failed samples.
+    type: list
+    returned: if any sample failed
+'''
+
+
+class SolaceMonitorSampleTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_monitor_sample does not support the Solace Cloud API", **result)
+        try:
+            sampler = sm.SolaceMonitorSampler(self.solace_config, params['msg_vpn'], sm.MONITOR_RESOURCES[params['resource']],
+                                              params['gauges'], params['counters'], params['where'],
+                                              params['interval'], params['duration'], params['history_size'])
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        samples, failures = sampler.run()
+        result['samples'] = samples
+        if failures:
+            result['failures'] = failures
+        if samples == 0:
+            self.module.fail_json(msg="all samples failed", **result)
+        result['objects'] = sampler.summarize(params['return_history'])
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        resource=dict(type='str', default='queues', choices=list(sm.MONITOR_RESOURCES)),
+        gauges=dict(type='list', required=False, default=None),
+        counters=dict(type='list', required=False, default=None),
+        where=dict(type='list', required=False, default=None),
+        interval=dict(type='float', default=sm.DEFAULT_INTERVAL),
+        duration=dict(type='float', default=60),
+        history_size=dict(type='int', default=sm.DEFAULT_HISTORY_SIZE),
+        return_history=dict(type='bool', default=False)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceMonitorSampleTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
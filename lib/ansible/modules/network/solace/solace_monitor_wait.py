@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_monitor as sm
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_monitor_wait
+
+short_description: Wait until monitor objects have the expected attribute values, e.g. bridges are up.
+
+description:
+- "Polls the monitor API objects of the conditions until all of them have the expected attribute values, are absent or the timeout has passed."
+- "All objects are polled in-process, concurrently, against one deadline. Conditions on the same object are merged into one request
+   with a select of their attributes. Objects which converged are not polled again."
+- "The poll interval starts at 0.1 seconds, backs off to max_interval and starts over each time an object converges."
+- "Read only, never changes the broker."
+
+notes:
+- "Reference Monitor: U(https://docs.solace.com/API-Developer-Online-Ref-Documentation/swagger-ui/monitor/index.html)."
+- "An object not found yet is polled until it exists, unless expected absent."
+- "Not supported: Solace Cloud API."
+
+options:
+  conditions:
+    description: The awaited objects & their expected attribute values.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      type:
+        description: The object type, i.e. the module name without 'solace_', e.g. bridge, dmr_cluster_link or rdp_rest_consumer.
+        type: str
+        required: true
+      name:
+        description: Name of the object, as in the object's module.
+        type: str
+        required: true
+      args:
+        description:
+          - "The other args of the object's module, e.g. virtual_router of a bridge, dmr of a dmr_cluster_link or rdp_name of a rdp_rest_consumer."
+          - "msg_vpn defaults to the module's msg_vpn."
+        type: dict
+        default: {}
+      attributes:
+        description:
+          - "Expected attribute values, e.g. inboundOperationalState: ready. Nested attributes with dots."
+          - "Strings match numbers & booleans with the same json representation, e.g. 'true'."
+        type: dict
+        default: {}
+      state:
+        description: present waits until the object exists with the expected attribute values, absent until it is removed.
+        type: str
+        default: present
+        choices:
+          - present
+          - absent
+  timeout:
+    description: Max seconds to wait for all objects.
+    type: float
+    default: 120
+  max_interval:
+    description: Max seconds between two polls.
+    type: float
+    default: 5
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+
+seealso:
+- module: solace_get_bridges
+- module: solace_monitor_sample
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Wait until the bridge & the rest consumer are up
+  solace_monitor_wait:
+    msg_vpn: orders
+    conditions:
+      - type: bridge
+        name: orders-bridge
+        args:
+          virtual_router: auto
+        attributes:
+          inboundOperationalState: ready
+          outboundOperationalState: ready
+      - type: bridge_remote_vpn
+        name: orders
+        args:
+          bridge_name: orders-bridge
+          bridge_virtual_router: auto
+          remote_vpn_location: "v:broker-b"
+        attributes:
+          up: true
+      - type: rdp_rest_consumer
+        name: webhook
+        args:
+          rdp_name: orders-rdp
+        attributes:
+          up: true
+    timeout: 300
+
+- name: Wait until the dmr link is up
+  solace_monitor_wait:
+    msg_vpn: default
+    conditions:
+      - type: dmr_cluster_link
+        name: broker-b
+        args:
+          dmr: cluster-1
+        attributes:
+          up: true
+'''
+
+RETURN = '''
+converged:
+    description: True if all objects converged.
+    type: bool
+    returned: always
+wait:
+    description: Seconds waited, number of poll rounds & of requests.
+    type: dict
+    returned: always
+    sample:
+        elapsed: 12.4
+        rounds: 14
+        requests: 31
+objects:
+    description: Per object, the expected & last polled values and the seconds after which it converged.
+    type: list
+    returned: always
+    sample:
+        - object: "bridge: orders/auto/orders-bridge"
+          converged: true
+          converged_after: 8.3
+          expected:
+            inboundOperationalState: ready
+          last:
+            inboundOperationalState: ready
+'''
+
+
+class SolaceMonitorWaitTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def create_waiter(self):
+        params = self.module.params
+        waiter = sm.SolaceMonitorWaiter(self.solace_config, params['timeout'], params['max_interval'])
+        for condition in params['conditions']:
+            object_type = so.get_object_type(condition['type'])
+            args = dict(msg_vpn=params['msg_vpn'])
+            args.update((arg, default) for arg, default in object_type.item_args.items() if default is not so.REQUIRED)
+            args.update(condition['args'] or {})
+            missing = [arg for arg in object_type.args if arg not in args]
+            if missing:
+                raise ValueError("condition on {} '{}': missing args: {}".format(object_type.name, condition['name'], missing))
+            key = object_type.get_key(args, condition['name'])
+            label = "{}: {}".format(object_type.name, '/'.join(str(value) for value in key[1:]))
+            waiter.add(sm.get_monitor_path(object_type, args, condition['name']), condition['attributes'],
+                       condition['state'] == 'absent', label)
+        return waiter
+
+    def do_task(self):
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_monitor_wait does not support the Solace Cloud API", **result)
+        try:
+            waiter = self.create_waiter()
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        result['converged'] = waiter.run()
+        result['wait'] = dict(elapsed=waiter.elapsed, rounds=waiter.rounds, requests=waiter.requests)
+        result['objects'] = waiter.describe()
+        if not result['converged']:
+            pending = [target.label for target in waiter.targets.values() if not target.converged]
+            self.module.fail_json(msg="not converged after {} seconds: {}".format(waiter.elapsed, pending), **result)
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        conditions=dict(type='list', required=True, elements='dict',
+                        options=dict(
+                            type=dict(type='str', required=True),
+                            name=dict(type='str', required=True),
+                            args=dict(type='dict', default={}),
+                            attributes=dict(type='dict', default={}),
+                            state=dict(type='str', default='present', choices=['present', 'absent'])
+                        )),
+        timeout=dict(type='float', default=120),
+        max_interval=dict(type='float', default=sm.WAIT_MAX_INTERVAL)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceMonitorWaitTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
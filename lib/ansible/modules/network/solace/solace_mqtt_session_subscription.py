@@ -31,16 +31,7 @@ ANSIBLE_METADATA = {'metadata_version': '1.1',
                     'supported_by': 'community'}
 
 import ansible.module_utils.network.solace.solace_utils as su
-import ansible.module_utils.network.solace.solace_common as sc
 from ansible.module_utils.basic import AnsibleModule
-import traceback
-HAS_IMPORT_ERROR = False
-IMPORT_ERR_TRACEBACK = None
-try:
-    import xmltodict
-except ImportError:
-    HAS_IMPORT_ERROR = True
-    IMPORT_ERR_TRACEBACK = traceback.format_exc()
 
 DOCUMENTATION = '''
 ---
@@ -141,7 +132,6 @@ class SolaceMqttSessionSubscriptionTask(su.SolaceTask):
     LOOKUP_ITEM_KEY = 'subscriptionTopic'
 
     def __init__(self, module):
-        sc.module_fail_on_import_error(module, HAS_IMPORT_ERROR, IMPORT_ERR_TRACEBACK)
         su.SolaceTask.__init__(self, module)
 
     def get_args(self):
@@ -150,44 +140,6 @@ class SolaceMqttSessionSubscriptionTask(su.SolaceTask):
     def lookup_item(self):
         return self.module.params['name']
 
-    def get_magic_queue(self, where_name, vpn):
-        request = {
-            'rpc': {
-                'show': {
-                    'queue': {
-                        'name': where_name,
-                        'vpn-name': vpn,
-                    }
-                }
-            }
-        }
-        list_path_array = ['rpc-reply', 'rpc', 'show', 'queue', 'queues', 'queue']
-        return sc.execute_sempv1_get_list(self.solace_config, request, list_path_array)
-
-    def execute_queue_no_shutdown(self, queue_name, vpn):
-        request = {
-            'rpc': {
-                'message-spool': {
-                    'vpn-name': vpn,
-                    'queue': {
-                        'name': queue_name,
-                        'no': {
-                            'shutdown': {
-                                'full': None
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        xml_data = xmltodict.unparse(request)
-        ok, semp_resp = sc.make_sempv1_post_request(self.solace_config, xml_data)
-        if not ok:
-            resp = dict(request=xml_data, response=semp_resp)
-        else:
-            resp = semp_resp
-        return ok, resp
-
     def get_func(self, solace_config, vpn, client_id, virtual_router, lookup_item_value):
         # GET /msgVpns/{msgVpnName}/mqttSessions/{mqttSessionClientId},{mqttSessionVirtualRouter}/subscriptions/{subscriptionTopic}
         uri_ext = ','.join([client_id, virtual_router])
@@ -212,31 +164,10 @@ class SolaceMqttSessionSubscriptionTask(su.SolaceTask):
             return False, resp
         # QoS==1? ==> ensure magic queue is ON/ON
         if settings and settings['subscriptionQos'] == 1:
-            # search = "#mqtt/" + client_id + "/does-not-exist"
-            search = "#mqtt/" + client_id + "/*"
-            ok_gmq, resp_gmq = self.get_magic_queue(search, vpn)
-            if not ok_gmq:
-                resp['error'] = dict(
-                    msg="error retrieving magic queue: {}".format(search),
-                    details=resp_gmq
-                )
-                return False, resp
-            elif len(resp_gmq) != 1:
-                resp['error'] = dict(
-                    msg="could not find magic queue: {}".format(search)
-                )
+            ok_mq, resp_mq = su.ensure_mqtt_magic_queue_enabled(solace_config, vpn, client_id, virtual_router)
+            if not ok_mq:
+                resp['error'] = resp_mq
                 return False, resp
-            # make sure magic queue is ON/ON
-            # depending on Broker version, no-shutdown is allowed or not.
-            # here: ignore error
-            mq_name = resp_gmq[0]['name']
-            ok_no_shut, resp_no_shut = self.execute_queue_no_shutdown(mq_name, vpn)
-            # if not ok_no_shut:
-            #     resp['error'] = dict(
-            #         msg="error executing no-shutdown for magic queue: {}".format(mq_name),
-            #         details=resp_no_shut
-            #     )
-            #     return False, resp
         return True, resp
 
     def update_func(self, solace_config, vpn, client_id, virtual_router, lookup_item_value, settings=None):
@@ -0,0 +1,226 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_async as sa
+import ansible.module_utils.network.solace.solace_topic as st
+import asyncio
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_queue_subscription_compact
+
+short_description: Find and remove redundant queue subscriptions.
+
+description:
+- "Finds the subscriptions of a queue covered by another subscription of the same queue, e.g. 'a/b/c' & 'a/b/>' next to 'a/>'.
+   The remaining subscriptions are the minimal set attracting the same messages."
+- "Retrieves the subscriptions of all queues with concurrent list calls. Reports only, unless apply=true:
+   then the redundant subscriptions are removed concurrently."
+
+notes:
+- "Wildcards: '*', 'prefix*' & '>'. Shared subscriptions & #noexport prefixes are treated as literals."
+- "Not supported: Solace Cloud API."
+
+options:
+  queue_names:
+    description: "The queues. '*' for all queues of the vpn."
+    type: list
+    required: true
+  apply:
+    description: If true, removes the redundant subscriptions. If false, only reports them.
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of concurrent requests.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+
+seealso:
+- module: solace_queue_subscription
+- module: solace_collection
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Report redundant subscriptions of all queues
+  solace_queue_subscription_compact:
+    msg_vpn: foo
+    queue_names:
+      - "*"
+  register: result
+
+- name: Remove redundant subscriptions of a queue
+  solace_queue_subscription_compact:
+    msg_vpn: foo
+    queue_names:
+      - q_orders
+    apply: true
+'''
+
+RETURN = '''
+queues:
+    description: The queues with redundant subscriptions.
+    type: list
+    returned: success
+    sample:
+        - queue: q_orders
+          subscriptions: 3
+          minimal: 1
+          redundant:
+            - subscription: orders/eu/>
+              covered_by: orders/>
+            - subscription: orders/eu/created
+              covered_by: orders/>
+summary:
+    description: Number of queues & subscriptions.
+    type: dict
+    returned: success
+    sample:
+        queues: 10
+        subscriptions: 120
+        redundant: 2
+        removed: 0
+        failed: 0
+failures:
+    description: The subscriptions that could not be removed.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceQueueSubscriptionCompactTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+        self.object_type = so.get_object_type('queue_subscription')
+
+    def get_queue_args(self, queue_name):
+        return dict(msg_vpn=self.module.params['msg_vpn'], queue=queue_name)
+
+    async def remove_subscription(self, session, queue_name, subscription):
+        ok, resp = await session.make_delete_request(self.object_type.item_path(self.get_queue_args(queue_name), subscription))
+        return ok, dict(queue=queue_name, subscription=subscription, error=resp)
+
+    async def compact(self, apply):
+        params = self.module.params
+        async with sa.SolaceAsyncSession(self.solace_config, params['max_workers']) as session:
+            ok, queue_names = await sa.get_queue_names(session, params['msg_vpn'], params['queue_names'])
+            if not ok:
+                return False, dict(error=queue_names)
+            outcomes = await asyncio.gather(*[sa.get_queue_subscriptions(session, params['msg_vpn'], name) for name in queue_names])
+            errors = [resp for ok, resp in outcomes if not ok]
+            if errors:
+                return False, dict(error=errors)
+
+            queues = []
+            summary = dict(queues=len(queue_names), subscriptions=0, redundant=0, removed=0, failed=0)
+            removals = []
+            for queue_name, subscriptions in [resp for ok, resp in outcomes]:
+                summary['subscriptions'] += len(subscriptions)
+                redundant = st.find_redundant_subscriptions(subscriptions)
+                if not redundant:
+                    continue
+                summary['redundant'] += len(redundant)
+                queues.append(dict(
+                    queue=queue_name,
+                    subscriptions=len(subscriptions),
+                    minimal=len(subscriptions) - len(redundant),
+                    redundant=[dict(subscription=subscription, covered_by=redundant[subscription])
+                               for subscription in subscriptions if subscription in redundant]
+                ))
+                removals += [(queue_name, subscription) for subscription in redundant]
+            result = dict(queues=queues, summary=summary)
+            if not apply:
+                return True, result
+            outcomes = await asyncio.gather(*[self.remove_subscription(session, queue_name, subscription) for queue_name, subscription in removals])
+        failures = [resp for ok, resp in outcomes if not ok]
+        summary['failed'] = len(failures)
+        summary['removed'] = len(outcomes) - len(failures)
+        if failures:
+            result['failures'] = failures
+        return len(failures) == 0, result
+
+    def do_task(self):
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_queue_subscription_compact does not support the Solace Cloud API", **result)
+        apply = self.module.params['apply'] and not self.module.check_mode
+        ok, resp = sa.run(self.compact(apply))
+        if 'error' in resp:
+            self.module.fail_json(msg="failed to retrieve the queue subscriptions", **dict(result, **resp))
+        result.update(resp)
+        result['changed'] = self.module.params['apply'] and resp['summary']['redundant'] > 0
+        if not ok:
+            result['changed'] = resp['summary']['removed'] > 0
+            self.module.fail_json(msg="failed to remove {} subscription(s)".format(resp['summary']['failed']), **result)
+        return result
+
+
+def run_module():
+    module_args = dict(
+        queue_names=dict(type='list', required=True),
+        apply=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=10)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceQueueSubscriptionCompactTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
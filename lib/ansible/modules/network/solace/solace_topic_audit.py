@@ -0,0 +1,284 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_async as sa
+import ansible.module_utils.network.solace.solace_topic as st
+import asyncio
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_topic_audit
+
+short_description: Evaluate topics against ACL profiles and queue subscriptions locally.
+
+description:
+- "Answers for each topic: may a client with the ACL profile publish / subscribe to it, which topic exceptions match,
+   which queues attract it with which subscription."
+- "Retrieves the ACL profiles' default actions & topic exceptions and the queues' subscriptions once, with concurrent list calls,
+   and matches all topics locally in a topic trie. No broker call per topic."
+- "Wildcards: SMF '*', 'prefix*' & '>'. MQTT topic exceptions ('+', '#') are translated to SMF."
+
+notes:
+- "Topics are evaluated as published topics. Wildcards in a topic are matched literally, e.g. 'a/*' is matched by the exception 'a/*' and by 'a/>'."
+- "Exceptions with substitution variables only match if client_username / client_name are given."
+- "Not supported: Solace Cloud API, shared subscriptions, #noexport."
+
+options:
+  topics:
+    description: The topics to evaluate.
+    type: list
+    required: true
+  acl_profile_names:
+    description: The ACL profiles to evaluate the topics against.
+    type: list
+    default: []
+  queue_names:
+    description: "The queues whose subscriptions to evaluate the topics against. '*' for all queues of the vpn."
+    type: list
+    default: []
+  client_username:
+    description: Value of the substitution variable $client-username in topic exceptions.
+    type: str
+  client_name:
+    description: Value of the substitution variable $client-name in topic exceptions.
+    type: str
+  max_workers:
+    description: Max number of concurrent list calls.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.semp_version
+
+seealso:
+- module: solace_acl_profile
+- module: solace_collection
+- module: solace_get_queues
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Why can't the orders app publish?
+  solace_topic_audit:
+    msg_vpn: foo
+    acl_profile_names:
+      - acl_orders
+    queue_names:
+      - "*"
+    client_username: orders
+    topics:
+      - orders/eu/created
+      - orders/us/cancelled
+  register: result
+
+- debug:
+    msg: "{{ result.results }}"
+'''
+
+RETURN = '''
+results:
+    description: One per topic, in the order of 'topics'.
+    type: list
+    returned: success
+    sample:
+        - topic: orders/eu/created
+          acl_profiles:
+            acl_orders:
+              publish: allowed
+              publish_exceptions:
+                - orders/>
+              subscribe: denied
+              subscribe_exceptions: []
+          queues:
+            - queue: q_orders
+              subscription: orders/*/created
+summary:
+    description: Number of loaded rules & evaluated topics.
+    type: dict
+    returned: success
+    sample:
+        topics: 2
+        acl_profiles: 1
+        topic_exceptions: 120
+        queues: 35
+        queue_subscriptions: 410
+'''
+
+ALLOWED = 'allowed'
+DENIED = 'denied'
+DIRECTIONS = ['publish', 'subscribe']
+
+
+class SolaceTopicAuditTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def substitute(self, topic):
+        params = self.module.params
+        if params['client_username'] is not None:
+            topic = topic.replace('$client-username', params['client_username'])
+        if params['client_name'] is not None:
+            topic = topic.replace('$client-name', params['client_name'])
+        return topic
+
+    async def get_acl_profile(self, session, name, exception_types):
+        vpn = self.module.params['msg_vpn']
+        ok, resp = await session.make_get_request([su.SEMP_V2_CONFIG, su.MSG_VPNS, vpn, su.ACL_PROFILES, name])
+        if not ok:
+            return False, dict(acl_profile=name, error=resp)
+        profile = dict(name=name, default_actions=dict(), exceptions=dict())
+        args = dict(msg_vpn=vpn, acl_profile_name=name, topic_syntax=None)
+        for direction, object_type in exception_types.items():
+            profile['default_actions'][direction] = resp[direction + 'TopicDefaultAction']
+            syntax_key = [key for key, template in object_type.body.items() if template == '{topic_syntax}'][0]
+            ok, items = await session.execute_get_list(object_type.collection_path(args), 'count=100')
+            if not ok:
+                return False, dict(acl_profile=name, error=items)
+            profile['exceptions'][direction] = [(item[syntax_key], item[object_type.lookup_key]) for item in items]
+        return True, profile
+
+    async def load(self):
+        params = self.module.params
+        exception_types = dict()
+        if params['acl_profile_names']:
+            semp_version = self.get_semp_version()
+            exception_types = {direction: so.get_acl_topic_exception_type(direction, semp_version) for direction in DIRECTIONS}
+        async with sa.SolaceAsyncSession(self.solace_config, params['max_workers']) as session:
+            ok, queue_names = await sa.get_queue_names(session, params['msg_vpn'], params['queue_names'])
+            if not ok:
+                return False, queue_names
+            coros = [self.get_acl_profile(session, name, exception_types) for name in params['acl_profile_names']]
+            coros += [sa.get_queue_subscriptions(session, params['msg_vpn'], name) for name in queue_names]
+            outcomes = await asyncio.gather(*coros)
+        errors = [resp for ok, resp in outcomes if not ok]
+        if errors:
+            return False, errors
+        n_profiles = len(params['acl_profile_names'])
+        return True, ([resp for ok, resp in outcomes[:n_profiles]], [resp for ok, resp in outcomes[n_profiles:]])
+
+    def build_tries(self, profiles, queues):
+        acl_tries = dict()
+        for profile in profiles:
+            acl_tries[profile['name']] = dict()
+            for direction, exceptions in profile['exceptions'].items():
+                trie = st.SolaceTopicTrie()
+                for syntax, topic in exceptions:
+                    trie.add(self.substitute(topic), topic, syntax)
+                acl_tries[profile['name']][direction] = trie
+        queue_trie = st.SolaceTopicTrie()
+        for queue_name, subscriptions in queues:
+            for subscription in subscriptions:
+                queue_trie.add(subscription, (queue_name, subscription))
+        return acl_tries, queue_trie
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_topic_audit does not support the Solace Cloud API", **result)
+        try:
+            ok, resp = sa.run(self.load())
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        if not ok:
+            self.module.fail_json(msg="failed to retrieve the acl profiles / queue subscriptions", errors=resp, **result)
+        profiles, queues = resp
+        acl_tries, queue_trie = self.build_tries(profiles, queues)
+
+        results = []
+        for topic in params['topics']:
+            topic_result = dict(topic=topic, acl_profiles=dict())
+            for profile in profiles:
+                profile_result = dict()
+                for direction in DIRECTIONS:
+                    matches = acl_tries[profile['name']][direction].match(topic)
+                    # an exception reverses the default action
+                    allowed = (profile['default_actions'][direction] == 'allow') != (len(matches) > 0)
+                    profile_result[direction] = ALLOWED if allowed else DENIED
+                    profile_result[direction + '_exceptions'] = list(dict.fromkeys(matches))
+                topic_result['acl_profiles'][profile['name']] = profile_result
+            topic_result['queues'] = [dict(queue=queue_name, subscription=subscription) for queue_name, subscription in queue_trie.match(topic)]
+            results.append(topic_result)
+
+        result['results'] = results
+        result['summary'] = dict(
+            topics=len(params['topics']),
+            acl_profiles=len(profiles),
+            topic_exceptions=sum(len(exceptions) for profile in profiles for exceptions in profile['exceptions'].values()),
+            queues=len(queues),
+            queue_subscriptions=len(queue_trie)
+        )
+        return result
+
+
+def run_module():
+    module_args = dict(
+        topics=dict(type='list', required=True),
+        acl_profile_names=dict(type='list', default=[]),
+        queue_names=dict(type='list', default=[]),
+        client_username=dict(type='str', required=False),
+        client_name=dict(type='str', required=False),
+        max_workers=dict(type='int', default=10)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_semp_version())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceTopicAuditTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,306 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_common as sc
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_plan as sp
+import ansible.module_utils.network.solace.solace_topology as sy
+from ansible.module_utils.basic import AnsibleModule
+from collections import OrderedDict
+
+DOCUMENTATION = '''
+---
+module: solace_topology
+
+short_description: Provision bridges & dmr clusters across brokers, all sides concurrently.
+
+description:
+- "Provisions both sides of bridges and all nodes of dmr clusters from one description of the topology, then waits for the links to come up."
+- "Each broker's objects are applied in dependency order: bridge, remote vpn, remote subscriptions & trusted common names,
+   or dmr cluster, links, link remote addresses & link trusted common names. All brokers concurrently."
+- "A dmr cluster's nodes are fully meshed: each node gets a link to every other node."
+- "A side refers to the other side by its router name, read with SEMP v1 unless given:
+   the remote vpn location of a bridge defaults to 'v:<router name>', the remote node name of a dmr link to the router name."
+- "state=absent removes the bridges on both sides and the dmr clusters on all nodes, the broker removes their children."
+
+notes:
+- "Bridges, bridge remote vpns & dmr links are enabled unless their settings say otherwise."
+- "Awaited: bridge remote vpns & dmr links 'up'. See solace_monitor_wait for other conditions."
+- "Write-only settings, e.g. passwords, are applied on creation only, as in solace_bridge & solace_dmr_cluster_link."
+- "Not supported: Solace Cloud API."
+
+options:
+  brokers:
+    description:
+      - "The brokers of the topology, each a dict with: name and the broker options, i.e. host, port, secure_connection, username,
+         password, timeout & x_broker. Options not given are taken from the module's options."
+    type: list
+    elements: dict
+    required: true
+  bridges:
+    description:
+      - "Bridges, each with: name, virtual_router (default: auto), settings, remote_vpn_settings, remote_subscriptions, tls_trusted_common_names
+         & the 2 endpoints."
+      - "An endpoint is a dict with: broker, msg_vpn, optionally remote_vpn_location & remote_vpn_interface of its remote vpn, and
+         settings, remote_vpn_settings, remote_subscriptions & tls_trusted_common_names of its side, merged with the bridge's."
+      - "remote_subscriptions & tls_trusted_common_names: names or dicts with name & settings."
+    type: list
+    elements: dict
+    required: false
+  dmr_clusters:
+    description:
+      - "Dmr clusters, each with: name, settings, link_settings, link_trusted_common_names & the nodes."
+      - "A node is a dict with: broker, remote_address (how the other nodes reach it, e.g. 'broker-a:55555'), optionally node_name,
+         and settings & link_settings of its side, merged with the cluster's."
+    type: list
+    elements: dict
+    required: false
+  wait:
+    description: Wait for the bridge remote vpns & dmr links to come up. Only with state=present, not in check mode.
+    type: bool
+    default: true
+  wait_timeout:
+    description: Max seconds to wait for all links.
+    type: float
+    default: 120
+  max_workers:
+    description: Max number of objects applied concurrently per broker.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.state
+
+seealso:
+- module: solace_bridge
+- module: solace_dmr_cluster
+- module: solace_monitor_wait
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Bridge the orders vpns of two brokers
+  solace_topology:
+    username: admin
+    password: secret
+    brokers:
+      - name: broker-a
+        host: broker-a.example.com
+      - name: broker-b
+        host: broker-b.example.com
+    bridges:
+      - name: orders-bridge
+        settings:
+          remoteAuthenticationBasicClientUsername: orders-bridge
+          remoteAuthenticationBasicPassword: secret
+          remoteAuthenticationScheme: basic
+        remote_vpn_settings:
+          tlsEnabled: false
+          compressedDataEnabled: false
+        remote_subscriptions:
+          - name: "orders/>"
+            settings:
+              deliverAlwaysEnabled: true
+        endpoints:
+          - broker: broker-a
+            msg_vpn: orders
+            remote_vpn_settings:
+              queueBinding: orders-bridge-a
+          - broker: broker-b
+            msg_vpn: orders
+            remote_vpn_settings:
+              queueBinding: orders-bridge-b
+    wait_timeout: 300
+
+- name: Mesh a dmr cluster across three brokers
+  solace_topology:
+    brokers: "{{ dmr_brokers }}"
+    dmr_clusters:
+      - name: cluster-1
+        settings:
+          authenticationBasicPassword: secret
+        link_settings:
+          span: external
+          authenticationBasicPassword: secret
+        nodes:
+          - broker: broker-a
+            remote_address: "broker-a.example.com:55555"
+          - broker: broker-b
+            remote_address: "broker-b.example.com:55555"
+          - broker: broker-c
+            remote_address: "broker-c.example.com:55555"
+'''
+
+RETURN = '''
+summary:
+    description: Number of objects per broker & in total, and of changed, unchanged, failed & skipped objects.
+    type: dict
+    returned: always
+    sample:
+        brokers:
+          broker-a: 4
+          broker-b: 4
+        objects: 8
+        changed: 8
+        unchanged: 0
+        failed: 0
+        skipped: 0
+changes:
+    description: The changed objects, with the broker.
+    type: list
+    returned: always
+wait:
+    description: Per broker, the awaited links with their last polled state & the seconds after which they came up.
+    type: dict
+    returned: if waited
+failures:
+    description: The failed & skipped objects, the links not up and the router names not read.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceTopologyTask(su.SolaceTask):
+
+    def __init__(self, module):
+        sc.module_fail_on_import_error(module, sy.HAS_IMPORT_ERROR, sy.IMPORT_ERR_TRACEBACK)
+        su.SolaceTask.__init__(self, module)
+
+    def get_brokers(self):
+        params = self.module.params
+        brokers = OrderedDict()
+        for broker in params['brokers']:
+            if broker['name'] in brokers:
+                raise ValueError("duplicate broker name: '{}'".format(broker['name']))
+            options = su.get_broker_list_item_options(broker, params)
+            options['semp_version'] = None
+            brokers[broker['name']] = sy.SolaceTopologyBroker(broker['name'], options, self.module.check_mode)
+        return brokers
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False, summary=dict(), changes=[])
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_topology does not support the Solace Cloud API", **result)
+        try:
+            topology = sy.SolaceTopology(self.get_brokers(), params['bridges'], params['dmr_clusters'], params['state'], params['max_workers'])
+            built = topology.build()
+        except ValueError as e:
+            self.module.fail_json(msg="invalid topology: {}".format(str(e)), **result)
+        except KeyError as e:
+            self.module.fail_json(msg="invalid topology: missing key: {}".format(str(e)), **result)
+        if not built:
+            result['failures'] = topology.failures
+            self.module.fail_json(msg="failed to read the router name of {} broker(s)".format(len(topology.failures)), **result)
+
+        summary = dict(brokers=dict(), objects=0, changed=0, unchanged=0, failed=0, skipped=0)
+        failures = []
+        for broker_name, results in topology.apply().items():
+            plan = topology.brokers[broker_name].plan
+            summary['brokers'][broker_name] = len(plan.nodes)
+            summary['objects'] += len(plan.nodes)
+            for key, (status, task_result) in results.items():
+                node = plan.nodes[key]
+                if status == sp.STATUS_OK:
+                    if task_result['changed']:
+                        summary['changed'] += 1
+                        change = node.describe()
+                        change['broker'] = broker_name
+                        result['changes'].append(change)
+                    else:
+                        summary['unchanged'] += 1
+                else:
+                    summary[status] += 1
+                    failure = node.describe()
+                    failure.update(broker=broker_name, status=status, error=task_result)
+                    failures.append(failure)
+        result['summary'] = summary
+        result['changed'] = summary['changed'] > 0
+        if failures:
+            result['failures'] = failures
+            msg = "failed to apply {} object(s), skipped {} depending object(s)".format(summary['failed'], summary['skipped'])
+            self.module.fail_json(msg=msg, **result)
+
+        if params['wait'] and params['state'] == 'present' and not self.module.check_mode:
+            converged, waiters = topology.wait(params['wait_timeout'])
+            result['wait'] = dict((broker_name, dict(elapsed=waiter.elapsed, links=waiter.describe())) for broker_name, waiter in waiters)
+            if not converged:
+                result['failures'] = [dict(broker=broker_name, link=target.label, last=target.last, error=target.error)
+                                      for broker_name, waiter in waiters for target in waiter.targets.values() if not target.converged]
+                self.module.fail_json(msg="{} link(s) not up after {} seconds".format(len(result['failures']), params['wait_timeout']), **result)
+        return result
+
+
+def arg_spec_brokers_item():
+    arg_spec = su.arg_spec_broker_list_item()
+    arg_spec.update(
+        name=dict(type='str', required=True)
+    )
+    return arg_spec
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        brokers=dict(type='list', required=True, elements='dict', options=arg_spec_brokers_item()),
+        bridges=dict(type='list', required=False, default=None, elements='dict'),
+        dmr_clusters=dict(type='list', required=False, default=None, elements='dict'),
+        wait=dict(type='bool', default=True),
+        wait_timeout=dict(type='float', default=sy.DEFAULT_WAIT_TIMEOUT),
+        max_workers=dict(type='int', default=sy.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_state())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceTopologyTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
@@ -0,0 +1,254 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_objects as so
+import ansible.module_utils.network.solace.solace_plan as sp
+import ansible.module_utils.network.solace.solace_journal as sj
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_vpn_apply
+
+short_description: Apply a declarative spec of a message vpn's objects in dependency order.
+
+description:
+- "Applies all objects of a message vpn spec: creates, updates or removes them in an idempotent manner."
+- "Builds the dependency graph from the objects' parent keys and references and applies independent branches concurrently.
+   The run time is that of the critical path, not the sum of all objects."
+- "state=present applies parents before their children, state=absent removes children before their parents."
+- "Each object is handled exactly like the object's own module does, e.g. M(solace_queue) for queues."
+
+notes:
+- "References between objects create dependencies, e.g. a client username waits for its client & acl profile, an rdp queue binding for its queue."
+- "Objects referenced but not in the spec must exist already."
+- "Not supported: Solace Cloud API, mqtt session subscriptions & acl topic exceptions. Use the objects' modules."
+- "A failed object fails the module. Objects depending on it are skipped, independent branches are applied."
+
+options:
+  spec:
+    description:
+      - "The vpn spec. Lists of objects, each object has a 'name', optional 'settings' and its children's lists."
+      - "Top level keys: settings (the vpn's, requires manage_vpn), client_profiles, acl_profiles, client_usernames, queues, topic_endpoints,
+         rest_delivery_points, bridges, mqtt_sessions, dmr_bridges."
+      - "Children: acl_profiles.client_connect_exceptions, queues.subscriptions, rest_delivery_points.rest_consumers,
+         rest_delivery_points.rest_consumers.tls_trusted_common_names, rest_delivery_points.queue_bindings,
+         bridges.remote_vpns, bridges.remote_subscriptions, bridges.tls_trusted_common_names."
+      - "Extra item keys: bridges.virtual_router (default: auto), bridges.remote_vpns.remote_vpn_location (required),
+         bridges.remote_vpns.remote_vpn_interface, mqtt_sessions.virtual_router (default: primary)."
+      - "Items without settings can be given as the name only, e.g. queue subscriptions."
+    type: dict
+    required: true
+  manage_vpn:
+    description: "If true, the message vpn is part of the spec: created / updated first with spec.settings, removed last."
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of objects applied concurrently.
+    type: int
+    default: 10
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.state
+- solace.journal
+
+seealso:
+- module: solace_queue
+- module: solace_client_username
+- module: solace_rdp
+- module: solace_bridge
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Apply vpn spec
+  solace_vpn_apply:
+    msg_vpn: foo
+    max_workers: 20
+    spec:
+      client_profiles:
+        - name: cp_orders
+          settings:
+            allowGuaranteedMsgSendEnabled: true
+            allowGuaranteedMsgReceiveEnabled: true
+      acl_profiles:
+        - name: acl_orders
+          settings:
+            clientConnectDefaultAction: allow
+      client_usernames:
+        - name: orders
+          settings:
+            clientProfileName: cp_orders
+            aclProfileName: acl_orders
+            password: secret
+      queues:
+        - name: q_orders
+          settings:
+            egressEnabled: true
+            ingressEnabled: true
+          subscriptions:
+            - orders/>
+            - name: returns/>
+      rest_delivery_points:
+        - name: rdp_orders
+          settings:
+            enabled: true
+          rest_consumers:
+            - name: rc_orders
+              settings:
+                remoteHost: orders.example.com
+                remotePort: 443
+                tlsEnabled: true
+          queue_bindings:
+            - name: q_orders
+
+- name: Remove all objects in spec, children first
+  solace_vpn_apply:
+    msg_vpn: foo
+    spec: "{{ vpn_spec }}"
+    state: absent
+'''
+
+RETURN = '''
+summary:
+    description: Number of objects per outcome.
+    type: dict
+    returned: always
+    sample:
+        objects: 9
+        levels: 4
+        changed: 3
+        unchanged: 6
+        failed: 0
+        skipped: 0
+changes:
+    description: The changed objects with their delta settings (if updated).
+    type: list
+    returned: always
+failures:
+    description: The failed & skipped objects with the error.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceVpnApplyTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+        self.journal = sj.get_journal(module.params['journal'])
+
+    def apply_node(self, node):
+        task = so.create_object_task(self.module, node.object_type, node.args, node.name, node.settings, self.module.params['state'],
+                                     self.journal)
+        return task.do_task()
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False, summary=dict(), changes=[])
+        try:
+            plan = sp.build_vpn_plan(params['msg_vpn'], params['spec'], params['manage_vpn'])
+            levels = plan.get_levels()
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+
+        reverse = (params['state'] == 'absent')
+        results = plan.execute(self.apply_node, params['max_workers'], reverse=reverse)
+
+        summary = dict(objects=len(plan.nodes), levels=len(levels), changed=0, unchanged=0, failed=0, skipped=0)
+        failures = []
+        for key, (status, task_result) in results.items():
+            node = plan.nodes[key]
+            if status == sp.STATUS_OK:
+                if task_result['changed']:
+                    summary['changed'] += 1
+                    change = node.describe()
+                    if 'delta' in task_result:
+                        change['delta'] = task_result['delta']
+                    result['changes'].append(change)
+                else:
+                    summary['unchanged'] += 1
+            else:
+                summary[status] += 1
+                failure = node.describe()
+                failure.update(status=status, error=task_result)
+                failures.append(failure)
+        result['summary'] = summary
+        result['changed'] = summary['changed'] > 0
+        if self.journal is not None:
+            self.journal.close()
+            if not failures and not self.module.check_mode:
+                self.journal.remove()
+        if failures:
+            result['failures'] = failures
+            msg = "failed to apply {} object(s), skipped {} depending object(s)".format(summary['failed'], summary['skipped'])
+            self.module.fail_json(msg=msg, **result)
+        return result
+
+
+def run_module():
+    module_args = dict(
+        spec=dict(type='dict', required=True),
+        manage_vpn=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=sp.DEFAULT_MAX_WORKERS)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_state())
+    arg_spec.update(su.arg_spec_journal())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceVpnApplyTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
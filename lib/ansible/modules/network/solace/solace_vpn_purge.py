@@ -0,0 +1,226 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+ANSIBLE_METADATA = {'metadata_version': '1.1',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
+
+import ansible.module_utils.network.solace.solace_utils as su
+import ansible.module_utils.network.solace.solace_state as ss
+import ansible.module_utils.network.solace.solace_export as se
+import ansible.module_utils.network.solace.solace_purge as sz
+from ansible.module_utils.basic import AnsibleModule
+
+DOCUMENTATION = '''
+---
+module: solace_vpn_purge
+
+short_description: Delete the objects of a msg vpn selected by type & name pattern.
+
+description:
+- "Deletes all objects of the selected types whose names match the patterns, e.g. all queues 'test-*', in one task."
+- "The objects are listed with server-side where filters & a select projection of their keys only."
+- "Objects whose parent is deleted as well are pruned: the broker deletes them with their parent,
+   their collections are not even listed. E.g. the subscriptions of purged queues."
+- "The remaining deletes run in reverse dependency order, e.g. client usernames before the client profiles they reference,
+   concurrently with at most max_workers requests in flight."
+- "Nothing is deleted if any list call fails."
+
+notes:
+- "System objects, i.e. names starting with '#', are skipped unless include_system_objects is set. The 'default' client profile, acl profile
+   & client username are always skipped."
+- "Check mode lists the selected objects without deleting them."
+- "Not supported: Solace Cloud API."
+
+options:
+  objects:
+    description: The selected objects.
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      type:
+        description:
+          - "The object type, e.g. queue, client_username or queue_subscription."
+          - "All objects of the msg vpn, see module_utils solace_export.DEFAULT_OBJECT_TYPES."
+        type: str
+        required: true
+      names:
+        description: "Name patterns, '*' is a wildcard. One list call per pattern & parent."
+        type: list
+        elements: str
+        default: ['*']
+      where:
+        description: "Additional where conditions, e.g. 'accessType==exclusive'. See the SEMP documentation of the where parameter."
+        type: list
+        elements: str
+        default: []
+  include_system_objects:
+    description: Delete the system objects as well.
+    type: bool
+    default: false
+  max_workers:
+    description: Max number of requests in flight.
+    type: int
+    default: 20
+  return_objects:
+    description: Return the selected objects.
+    type: bool
+    default: false
+
+extends_documentation_fragment:
+- solace.broker
+- solace.vpn
+- solace.semp_version
+
+seealso:
+- module: solace_vpn_apply
+- module: solace_config_export
+
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+'''
+
+EXAMPLES = '''
+- name: Tear down the test objects of the ci vpn
+  solace_vpn_purge:
+    msg_vpn: ci
+    objects:
+      - type: client_username
+        names:
+          - "test-*"
+      - type: client_profile
+        names:
+          - "test-*"
+      - type: queue
+        names:
+          - "test-*"
+          - "tmp-*"
+      - type: queue_subscription
+        names:
+          - "test/>"
+    max_workers: 50
+'''
+
+RETURN = '''
+summary:
+    description: Number of selected, deleted & failed objects, of child collections pruned and of selected objects per type.
+    type: dict
+    returned: always
+    sample:
+        selected: 10002
+        deleted: 10002
+        failed: 0
+        pruned_collections: 5000
+        types:
+            client_username: 1
+            queue_subscription: 1
+            queue: 10000
+objects:
+    description: The selected objects, in deletion order.
+    type: list
+    returned: if return_objects
+failures:
+    description: The failed list calls & deletes.
+    type: list
+    returned: on failure
+'''
+
+
+class SolaceVpnPurgeTask(su.SolaceTask):
+
+    def __init__(self, module):
+        su.SolaceTask.__init__(self, module)
+
+    def do_task(self):
+        params = self.module.params
+        result = dict(changed=False)
+        if su.is_broker_solace_cloud(self.solace_config):
+            self.module.fail_json(msg="solace_vpn_purge does not support the Solace Cloud API", **result)
+        semp_version = None
+        if any(selector['type'] in se.ACL_TOPIC_EXCEPTION_TYPES for selector in params['objects']):
+            semp_version = self.get_semp_version()
+        try:
+            purger = sz.SolaceVpnPurger(self.solace_config, params['msg_vpn'], params['objects'], semp_version,
+                                        params['max_workers'], params['include_system_objects'], self.module.check_mode)
+        except ValueError as e:
+            self.module.fail_json(msg=str(e), **result)
+        summary, failures = purger.purge()
+        result['summary'] = summary
+        if params['return_objects']:
+            result['objects'] = purger.get_selected()
+        if summary['deleted'] > 0:
+            result['changed'] = True
+            if self.state_store is not None:
+                # the stored digests of the deleted objects & their children are stale
+                self.state_store.invalidate(ss.get_broker_id(self.solace_config), params['msg_vpn'])
+        if failures:
+            result['failures'] = failures
+            self.module.fail_json(msg="purge failed: {} failure(s)".format(len(failures)), **result)
+        if self.module.check_mode:
+            result['changed'] = summary['selected'] > 0
+        return result
+
+
+def run_module():
+    """Entrypoint to module."""
+    module_args = dict(
+        objects=dict(type='list', required=True, elements='dict',
+                     options=dict(
+                        type=dict(type='str', required=True),
+                        names=dict(type='list', default=['*'], elements='str'),
+                        where=dict(type='list', default=[], elements='str')
+                     )),
+        include_system_objects=dict(type='bool', default=False),
+        max_workers=dict(type='int', default=sz.DEFAULT_MAX_WORKERS),
+        return_objects=dict(type='bool', default=False)
+    )
+    arg_spec = su.arg_spec_broker()
+    arg_spec.update(su.arg_spec_vpn())
+    arg_spec.update(su.arg_spec_semp_version())
+    # module_args override standard arg_specs
+    arg_spec.update(module_args)
+
+    module = AnsibleModule(
+        argument_spec=arg_spec,
+        supports_check_mode=True
+    )
+
+    solace_task = SolaceVpnPurgeTask(module)
+    result = solace_task.do_task()
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
+
+###
+# The End.
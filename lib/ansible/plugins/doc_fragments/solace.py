@@ -136,8 +136,11 @@ options:
     SEMP_VERSION = r'''
 options:
   semp_version:
-    description: The Semp API version of the broker. See M(solace_get_facts) for info on how to retrieve the version from the broker.
-    required: true
+    description:
+      - The Semp API version of the broker. See M(solace_get_facts) for info on how to retrieve the version from the broker.
+      - If not set, the version is retrieved from the broker (about/api) once per broker and cached.
+    required: false
+    type: str
 '''
 
     STATE = r'''
@@ -152,6 +155,17 @@ options:
       - absent
 '''
 
+    JOURNAL = r'''
+options:
+  journal:
+    description:
+      - "Path of a journal file: records every object the task has completed, with the digest of its state & settings.
+         After a failure, the next run skips the completed objects without a request to the broker and resumes with the others."
+      - "Removed once the task has completed all objects. Objects whose settings changed since are applied again."
+    required: false
+    type: str
+'''
+
     GET_LIST = r'''
 description:
 - "Implements the config and monitor API."
@@ -183,6 +197,62 @@ options:
           type: list
           default: []
           elements: str
+  top_n:
+    description:
+      - "Returns only the n objects with the highest (desc) or lowest (asc) value of attribute 'by', e.g. the 20 deepest queues."
+      - "Evaluated page by page with a bounded heap: only the n objects are kept in memory. Objects without the attribute are not ranked."
+      - "With group_by: ranks the groups, 'by' is 'count' or one of group_by.sum."
+      - "Nested attributes with dots, e.g. 'eventMsgSpoolUsageThreshold.setPercent'."
+    required: false
+    type: dict
+    suboptions:
+        n:
+          description: Number of objects returned.
+          type: int
+          required: true
+        by:
+          description: The attribute to rank by.
+          type: str
+          required: true
+        order:
+          description: desc returns the highest values, asc the lowest.
+          type: str
+          default: desc
+          choices:
+            - desc
+            - asc
+  group_by:
+    description:
+      - "Returns one entry per distinct value of the 'by' attributes instead of the objects: the values, 'count' & the 'sum' of the 'sum' attributes,
+         ordered by count, e.g. the number of clients per client username."
+      - "Evaluated page by page: only the groups are kept in memory."
+    required: false
+    type: dict
+    suboptions:
+        by:
+          description: The attributes to group by.
+          type: list
+          elements: str
+          required: true
+        sum:
+          description: Numeric attributes summed per group.
+          type: list
+          elements: str
+          default: []
+  count_only:
+    description:
+      - "Returns only the number of objects: result_list is [{count: <number>}]."
+      - "Selects a single attribute (or count_by) instead of the objects' full settings and discards each page after counting it."
+      - "Cannot be combined with top_n or group_by."
+    required: false
+    type: bool
+    default: false
+  count_by:
+    description:
+      - "Breaks the count down by the values of this attribute: result_list has one entry {<count_by>: <value>, count: <number>} per value, ordered by count."
+      - "Implies count_only."
+    required: false
+    type: str
 '''
 
     GET_LIST_MONITOR = r'''
@@ -208,6 +278,62 @@ options:
           type: list
           default: []
           elements: str
+  top_n:
+    description:
+      - "Returns only the n objects with the highest (desc) or lowest (asc) value of attribute 'by', e.g. the 20 deepest queues."
+      - "Evaluated page by page with a bounded heap: only the n objects are kept in memory. Objects without the attribute are not ranked."
+      - "With group_by: ranks the groups, 'by' is 'count' or one of group_by.sum."
+      - "Nested attributes with dots, e.g. 'eventMsgSpoolUsageThreshold.setPercent'."
+    required: false
+    type: dict
+    suboptions:
+        n:
+          description: Number of objects returned.
+          type: int
+          required: true
+        by:
+          description: The attribute to rank by.
+          type: str
+          required: true
+        order:
+          description: desc returns the highest values, asc the lowest.
+          type: str
+          default: desc
+          choices:
+            - desc
+            - asc
+  group_by:
+    description:
+      - "Returns one entry per distinct value of the 'by' attributes instead of the objects: the values, 'count' & the 'sum' of the 'sum' attributes,
+         ordered by count, e.g. the number of clients per client username."
+      - "Evaluated page by page: only the groups are kept in memory."
+    required: false
+    type: dict
+    suboptions:
+        by:
+          description: The attributes to group by.
+          type: list
+          elements: str
+          required: true
+        sum:
+          description: Numeric attributes summed per group.
+          type: list
+          elements: str
+          default: []
+  count_only:
+    description:
+      - "Returns only the number of objects: result_list is [{count: <number>}]."
+      - "Selects a single attribute (or count_by) instead of the objects' full settings and discards each page after counting it."
+      - "Cannot be combined with top_n or group_by."
+    required: false
+    type: bool
+    default: false
+  count_by:
+    description:
+      - "Breaks the count down by the values of this attribute: result_list has one entry {<count_by>: <value>, count: <number>} per value, ordered by count."
+      - "Implies count_only."
+    required: false
+    type: str
 '''
 
 ###
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------------------------------
+# MIT License
+#
+# Copyright (c) 2020, Solace Corporation, Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ---------------------------------------------------------------------------------------------
+
+
+DOCUMENTATION = '''
+---
+author:
+  - Ricardo Gomez-Ulmke (ricardo.gomez-ulmke@solace.com)
+httpapi: solace
+short_description: HttpApi plugin for the SEMP API of Solace PubSub+ brokers.
+description:
+  - "Keeps one authenticated keep-alive http session per broker open for the whole play.
+     The solace_* modules send their SEMP v2 & SEMP v1 requests through it instead of opening their own connections."
+  - "Broker address & credentials come from the connection: ansible_host, ansible_httpapi_port, ansible_user, ansible_password,
+     ansible_httpapi_use_ssl, ansible_httpapi_validate_certs. The modules' host, port, secure_connection, username & password are not used."
+notes:
+  - "Solace Cloud API requests are not sent through the connection."
+  - "The connection handles one request at a time. Modules sending requests concurrently, e.g. solace_vpn_apply, are faster with a local connection."
+version_added: "2.9.10"
+'''
+
+EXAMPLES = '''
+# inventory
+all:
+  hosts:
+    broker-1:
+      ansible_host: broker-1.example.com
+      ansible_connection: httpapi
+      ansible_network_os: solace
+      ansible_httpapi_port: 8080
+      ansible_httpapi_use_ssl: false
+      ansible_user: admin
+      ansible_password: admin
+'''
+
+import traceback
+from ansible.plugins.httpapi import HttpApiBase
+HAS_IMPORT_ERROR = False
+IMPORT_ERR_TRACEBACK = None
+try:
+    import requests
+except ImportError:
+    HAS_IMPORT_ERROR = True
+    IMPORT_ERR_TRACEBACK = traceback.format_exc()
+
+
+class HttpApi(HttpApiBase):
+
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self._session = None
+
+    def _get_session(self):
+        if HAS_IMPORT_ERROR:
+            raise ImportError("httpapi solace: missing python module: requests\n{}".format(IMPORT_ERR_TRACEBACK))
+        if self._session is None:
+            session = requests.Session()
+            session.auth = (self.connection.get_option('remote_user'), self.connection.get_option('password'))
+            session.verify = self.connection.get_option('validate_certs')
+            self._session = session
+        return self._session
+
+    def get_broker_url(self):
+        use_ssl = self.connection.get_option('use_ssl')
+        port = self.connection.get_option('port') or (443 if use_ssl else 80)
+        return '{}://{}:{}'.format('https' if use_ssl else 'http', self.connection.get_option('host'), port)
+
+    def send_request(self, data, method='GET', path='/', headers=None, timeout=None):
+        """Sends one request to the broker, path: absolute path incl. query, e.g. /SEMP/v2/config/msgVpns?count=100.
+
+        returns the response as a dict, see solace_common.SolaceHttpResponse.
+        """
+        resp = self._get_session().request(
+            method,
+            self.get_broker_url() + path,
+            data=data,
+            headers=headers,
+            timeout=timeout
+        )
+        return dict(
+            status_code=resp.status_code,
+            reason=resp.reason,
+            url=resp.url,
+            headers=dict(resp.headers),
+            text=resp.text,
+            request=dict(
+                method=method,
+                url=resp.request.url,
+                headers=dict(resp.request.headers),
+                body=data
+            )
+        )
+
+    def logout(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+###
+# The End.
@@ -46,6 +46,10 @@ if [[ -z $ANSIBLE_MODULE_UTILS ]]; then COLON=""; else COLON=":"; fi
 export ANSIBLE_MODULE_UTILS="$ANSIBLE_SOLACE_HOME/ansible/module_utils$COLON$ANSIBLE_MODULE_UTILS"
 if [[ -z $ANSIBLE_LIBRARY ]]; then COLON=""; else COLON=":"; fi
 export ANSIBLE_LIBRARY="$ANSIBLE_SOLACE_HOME/ansible/modules$COLON$ANSIBLE_LIBRARY"
+if [[ -z $ANSIBLE_DOC_FRAGMENT_PLUGINS ]]; then COLON=""; else COLON=":"; fi
+export ANSIBLE_DOC_FRAGMENT_PLUGINS="$ANSIBLE_SOLACE_HOME/ansible/plugins/doc_fragments$COLON$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+if [[ -z $ANSIBLE_HTTPAPI_PLUGINS ]]; then COLON=""; else COLON=":"; fi
+export ANSIBLE_HTTPAPI_PLUGINS="$ANSIBLE_SOLACE_HOME/ansible/plugins/httpapi$COLON$ANSIBLE_HTTPAPI_PLUGINS"
 
 clear
 echo
@@ -53,6 +57,8 @@ echo "Prepending ansible-solace path to ansible env vars:"; echo
 echo "ANSIBLE_SOLACE_HOME=$ANSIBLE_SOLACE_HOME"
 echo "ANSIBLE_MODULE_UTILS=$ANSIBLE_MODULE_UTILS"
 echo "ANSIBLE_LIBRARY=$ANSIBLE_LIBRARY"
+echo "ANSIBLE_DOC_FRAGMENT_PLUGINS=$ANSIBLE_DOC_FRAGMENT_PLUGINS"
+echo "ANSIBLE_HTTPAPI_PLUGINS=$ANSIBLE_HTTPAPI_PLUGINS"
 echo
 
 ###
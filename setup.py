@@ -29,7 +29,7 @@ with open("pypi/README.md", "r") as fh:
 
 setuptools.setup(
     name="ansible-solace",
-    version="0.7.8",
+    version="0.8.0",
     author="Solace Corporation",
     author_email="ricardo.gomez-ulmke@solace.com",
     description="Ansible modules to configure Solace PubSub+ event brokers with SEMP.",
@@ -45,7 +45,8 @@ setuptools.setup(
     packages=[
         'ansible/module_utils/network/solace',
         'ansible/modules/network/solace',
-        'ansible/plugins/doc_fragments'
+        'ansible/plugins/doc_fragments',
+        'ansible/plugins/httpapi'
         ],
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -65,6 +65,7 @@ if [[ $AS_TEST_RUNNER_ENV == "dev" ]]; then
   export ANSIBLE_MODULE_UTILS="$AS_TEST_PROJECT_HOME/lib/ansible/module_utils"
   export ANSIBLE_LIBRARY="$AS_TEST_PROJECT_HOME/lib/ansible/modules"
   export ANSIBLE_DOC_FRAGMENT_PLUGINS="$AS_TEST_PROJECT_HOME/lib/ansible/plugins/doc_fragments"
+  export ANSIBLE_HTTPAPI_PLUGINS="$AS_TEST_PROJECT_HOME/lib/ansible/plugins/httpapi"
 fi
 
 
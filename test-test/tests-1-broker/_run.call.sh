@@ -46,6 +46,20 @@ ansibleSolaceTests=(
   "solace_get_client_profiles"
   "solace_acl_profile"
   "solace_client_profile"
+  "solace_client_profiles"
+  "solace_vpn_apply"
+  "solace_drift"
+  "solace_collection"
+  "solace_topic_audit"
+  "solace_queue_subscription_compact"
+  "solace_index"
+  "solace_httpapi"
+  "solace_config_export"
+  "solace_config_import"
+  "solace_monitor_sample"
+  "solace_bulk_action"
+  "solace_vpn_purge"
+  "solace_monitor_wait"
 )
 
 ##############################################################################################################################
@@ -35,6 +35,7 @@ cloudBrokerInventoryFile="$AS_TEST_HOME/lib/broker.inventories/cloud.broker.inve
 ansibleSolaceTests=(
   "solace_facts"
   "solace_bridges"
+  "solace_topology"
 )
 
 ##############################################################################################################################